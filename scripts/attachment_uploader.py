@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Streaming work item attachment uploader
+Uploads large files (logs, crash dumps, build outputs) to work items
+without loading them into memory. Files are memory-mapped and sent as
+memoryview blocks straight from the page cache, each block dropped from
+the process again once it is on the wire (a plain file reader is used
+where mmap is unavailable or disabled). Files above 130 MB go through the
+chunked attachment upload: POST ...attachments?uploadType=Chunked, then
+one PUT with a Content-Range header per chunk. Files upload in parallel,
+after which every work item gets all of its AttachedFile relations in a
+single PATCH, the PATCHes packed into $batch calls.
+
+Usage:
+    python3 scripts/attachment_uploader.py --item 1234 crash.dmp logs/*.log
+    python3 scripts/attachment_uploader.py --manifest attachments.yaml --workers 8 --chunk-mb 64
+
+Manifest (YAML or JSON), work item ID -> files or glob patterns:
+    1234: [crash.dmp, "logs/*.log"]
+    1240: [build/outputs/bundle/release/app-release.aab]
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from azure_devops_client import DEFAULT_POOL_SIZE, build_relations_patch
+from request_metrics import RequestMetrics
+from seed_spec import load_spec
+
+CHUNKED_THRESHOLD = 130 * 1024 * 1024   # single-request attachment upload limit
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024   # bytes per chunked-upload PUT
+BLOCK_SIZE = 4 * 1024 * 1024            # bytes handed to the socket at a time
+DEFAULT_WORKERS = 4
+MAX_BATCH_SIZE = 200
+
+class MappedFile:
+    """Read-only file opened for streaming; mmap-backed unless disabled or unsupported"""
+
+    def __init__(self, path, use_mmap=True):
+        self.path = path
+        self.use_mmap = use_mmap
+        self.file = None
+        self.map = None
+        self.size = 0
+
+    def __enter__(self):
+        self.file = open(self.path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        if self.use_mmap and self.size:
+            try:
+                self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    self.map.madvise(mmap.MADV_SEQUENTIAL)
+            except (OSError, ValueError):
+                self.map = None  # pipes, special files, ...
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # an aborted send still holds a block; released with it
+        self.file.close()
+
+    def range(self, start, end):
+        """Re-iterable upload body for bytes [start, end)"""
+        return FileRange(self, start, end)
+
+    def drop(self, offset, length):
+        """Release mapped pages that have been sent (they stay in the page cache)"""
+        if self.map is not None and hasattr(mmap, "MADV_DONTNEED"):
+            aligned = offset - offset % mmap.PAGESIZE
+            self.map.madvise(mmap.MADV_DONTNEED, aligned, length + offset - aligned)
+
+class FileRange:
+    """Upload body for a byte range of a MappedFile; iterating again restarts it (retries)"""
+
+    def __init__(self, source, start, end, block_size=BLOCK_SIZE):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.block_size = block_size
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        if self.source.map is None:
+            with open(self.source.path, "rb") as body:
+                body.seek(self.start)
+                remaining = len(self)
+                while remaining > 0:
+                    block = body.read(min(self.block_size, remaining))
+                    if not block:
+                        raise IOError(f"{self.source.path} shrank while uploading")
+                    remaining -= len(block)
+                    yield block
+            return
+        with memoryview(self.source.map) as view:
+            for offset in range(self.start, self.end, self.block_size):
+                length = min(self.block_size, self.end - offset)
+                block = view[offset:offset + length]
+                try:
+                    yield block
+                finally:
+                    block.release()
+                self.source.drop(offset, length)
+
+def upload_body(client, file_name, size, body_range, chunk_size=DEFAULT_CHUNK_SIZE, threshold=CHUNKED_THRESHOLD):
+    """Upload size bytes from body_range(start, end), chunked above threshold; returns the reference"""
+    if size <= threshold:
+        return client.upload_attachment(file_name, body_range(0, size))
+    reference = client.start_chunked_attachment(file_name)
+    for start in range(0, size, chunk_size):
+        client.upload_attachment_chunk(
+            reference["id"], file_name, body_range(start, min(size, start + chunk_size)), start, size
+        )
+    return reference
+
+def upload_file(client, path, chunk_size=DEFAULT_CHUNK_SIZE, threshold=CHUNKED_THRESHOLD, use_mmap=True):
+    """Stream one file to the attachments API; returns (reference, size)"""
+    with MappedFile(path, use_mmap) as source:
+        reference = upload_body(client, os.path.basename(path), source.size, source.range, chunk_size, threshold)
+        return reference, source.size
+
+def link_attachments(client, attached, batch_size=MAX_BATCH_SIZE):
+    """Add AttachedFile relations: one PATCH per work item, packed into $batch calls.
+
+    attached maps work item ID -> [(url, comment), ...]. Returns the number
+    of work items linked; uploads left unlinked are listed so they can be linked again.
+    """
+    entries = [(item_id, files) for item_id, files in attached.items() if files]
+    updates = [
+        {
+            "method": "PATCH",
+            "uri": f"/_apis/wit/workitems/{item_id}?api-version={client.api_version}",
+            "headers": {"Content-Type": "application/json-patch+json"},
+            "body": build_relations_patch([
+                {"rel": "AttachedFile", "url": url, "attributes": {"comment": comment}} for url, comment in files
+            ]),
+        }
+        for item_id, files in entries
+    ]
+    linked = 0
+    unlinked = []
+    for start in range(0, len(updates), batch_size):
+        chunk = updates[start:start + batch_size]
+        items = entries[start:start + batch_size]
+        try:
+            results = client.batch(chunk)
+        except Exception as e:
+            print(f"Error linking attachments to {len(chunk)} work items: {e}")
+            unlinked += items
+            continue
+        for (item_id, files), result in zip(items, results):
+            if result.get("code") == 200:
+                linked += 1
+            else:
+                print(f"Error linking attachments to work item {item_id}: HTTP {result.get('code')}")
+                unlinked.append((item_id, files))
+    if unlinked:
+        print(f"⚠️ Attachments uploaded but not linked to {len(unlinked)} work items:")
+        for item_id, files in unlinked:
+            for url, _ in files:
+                print(f"   work item {item_id}: {url}")
+    return linked
+
+def upload_attachments(client, files, workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=True):
+    """Upload (work item ID, path) pairs in parallel, then link them; returns (uploaded, bytes, linked)"""
+    print_lock = threading.Lock()
+
+    def upload(entry):
+        item_id, path = entry
+        try:
+            reference, size = upload_file(client, path, chunk_size, use_mmap=use_mmap)
+        except Exception as e:
+            with print_lock:
+                print(f"   ❌ {path}: {e}")
+            return item_id, None, 0
+        with print_lock:
+            print(f"   ✅ {path} ({size / 1e6:.1f} MB) -> work item {item_id}")
+        return item_id, (reference["url"], f"{os.path.basename(path)} ({size / 1e6:.1f} MB)"), size
+
+    attached = {}
+    uploaded = total_bytes = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for item_id, attachment, size in pool.map(upload, files):
+            if attachment:
+                attached.setdefault(item_id, []).append(attachment)
+                uploaded += 1
+                total_bytes += size
+    return uploaded, total_bytes, link_attachments(client, attached)
+
+def expand_files(patterns):
+    """Paths for files and glob patterns, in order, without duplicates"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream large files to work items as attachments")
+    parser.add_argument("files", nargs="*", help="files or glob patterns to attach to --item")
+    parser.add_argument("--item", type=int, help="work item ID the positional files are attached to")
+    parser.add_argument("--manifest", help="YAML/JSON mapping work item IDs to files or glob patterns")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="files uploaded in parallel")
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+                        help=f"chunk size for files over {CHUNKED_THRESHOLD // (1024 * 1024)} MB")
+    parser.add_argument("--no-mmap", action="store_true", help="read files in blocks instead of memory-mapping them")
+    parser.add_argument("--metrics", action="store_true", help="print per-request metrics at the end")
+    args = parser.parse_args(argv)
+    if args.files and args.item is None:
+        parser.error("--item is required with positional files")
+    if not args.files and not args.manifest:
+        parser.error("give --item with files, or --manifest")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = []
+    if args.manifest:
+        try:
+            manifest = load_spec(args.manifest)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"❌ Cannot read manifest: {e}")
+            return 1
+        for item_id, patterns in manifest.items():
+            files += [(int(item_id), path) for path in expand_files(patterns)]
+    files += [(args.item, path) for path in expand_files(args.files)]
+    missing = [path for _, path in files if not os.path.isfile(path)]
+    if missing:
+        print(f"❌ Files not found: {', '.join(missing)}")
+        return 1
+
+    import create_demo_project
+
+    metrics = RequestMetrics() if args.metrics else None
+    client = create_demo_project.configure_client(
+        max(DEFAULT_POOL_SIZE, args.workers), hooks=[metrics] if metrics else None
+    )
+    total = sum(os.path.getsize(path) for _, path in files)
+    print(f"📎 Uploading {len(files)} files ({total / 1e6:.1f} MB) to {client.project}, {args.workers} in parallel...")
+    started = time.monotonic()
+    uploaded, sent, linked = upload_attachments(
+        client, files, args.workers, args.chunk_mb * 1024 * 1024, not args.no_mmap
+    )
+    elapsed = time.monotonic() - started
+    print(f"✅ {uploaded}/{len(files)} files uploaded ({sent / 1e6:.1f} MB in {elapsed:.1f}s, "
+          f"{sent / 1e6 / max(elapsed, 1e-9):.1f} MB/s), {linked} work items linked")
+    if metrics:
+        metrics.print_summary()
+    linked_ok = linked == len({item_id for item_id, _ in files})
+    return 0 if uploaded == len(files) and linked_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Asyncio Azure DevOps client
+Async counterpart of azure_devops_client.py and the create_work_item /
+create_relation helpers, built on aiohttp. One event loop keeps thousands of
+requests in flight without a thread per request: a semaphore bounds the
+requests in flight, and a token bucket keeps the request rate inside the
+organization's throttling budget.
+
+Azure DevOps throttles per user on TSTUs (200 per sliding 5-minute window).
+How many TSTUs a request costs depends on the server, so the bucket is tuned
+in requests/second; whenever the server answers 429/503 with Retry-After (or
+reports X-RateLimit-Remaining: 0), the whole bucket pauses for that long.
+
+Instrumentation hooks receive the same events as the requests-based client.
+Phases come from aiohttp tracing; TLS is part of the connect phase here.
+
+Requirements:
+- pip install aiohttp
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from itertools import islice
+
+try:
+    import aiohttp
+except ImportError:
+    print("❌ aiohttp is not installed!")
+    print("Install it with: pip install aiohttp")
+    sys.exit(1)
+
+from azure_devops_client import (
+    DEFAULT_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    MAX_BACKOFF,
+    CREATE_RETRY_STATUSES,
+    RETRY_STATUSES,
+    auth_header,
+    build_patch_document,
+    retry_after_seconds,
+)
+from request_metrics import PHASES, request_event
+from seed_engine import defer_unresolved, dependency_levels, report_unresolved
+
+DEFAULT_CONCURRENCY = 32
+SEED_WINDOW = 10000  # streamed items scheduled per window
+
+class TokenBucket:
+    """Async token bucket allowing rate requests/second with bursts up to burst"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        """Stop handing out tokens for seconds (server asked us to back off)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def phase_trace_config():
+    """aiohttp TraceConfig recording phases into the request's trace context dict"""
+    def mark(name):
+        async def callback(session, context, params):
+            context.trace_request_ctx[name] = time.perf_counter()
+        return callback
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(mark("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(mark("dns_end"))
+    trace_config.on_connection_create_start.append(mark("connect_start"))
+    trace_config.on_connection_create_end.append(mark("connect_end"))
+    trace_config.on_request_headers_sent.append(mark("headers_sent"))
+    trace_config.on_request_end.append(mark("end"))
+    return trace_config
+
+def request_size(payload):
+    """Size of a JSON request body as sent"""
+    return len(json.dumps(payload).encode()) if payload is not None else 0
+
+def add_phases(phases, marks):
+    """Accumulate one attempt's trace marks into phase durations"""
+    def span(start, end):
+        return marks[end] - marks[start] if start in marks and end in marks else 0.0
+    dns = span("dns_start", "dns_end")
+    phases["dns"] += dns
+    phases["connect"] += max(0.0, span("connect_start", "connect_end") - dns)
+    phases["server"] += span("headers_sent", "end")
+
+class AsyncAzureDevOpsClient:
+    """aiohttp client for one organization/project; use with async with"""
+
+    def __init__(self, org_url, project, token, api_version="7.0",
+                 concurrency=DEFAULT_CONCURRENCY, rate=None, burst=None,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, hooks=None):
+        self.org_url = org_url.rstrip("/")
+        self.project = project
+        self.base_url = f"{self.org_url}/{project}"
+        self.api_version = api_version
+        self.token = token
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.hooks = list(hooks or [])
+        self.semaphore = None
+        self.session = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            headers=auth_header(self.token),
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[phase_trace_config()] if self.hooks else None,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    def backoff_delay(self, attempt):
+        delay = min(MAX_BACKOFF, self.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def request(self, method, url, json=None, content_type="application/json", idempotent=True):
+        """Send a request with retries and return the decoded JSON body.
+
+        With idempotent=False (creates) only 429s and connect errors are
+        retried, as in azure_devops_client.AzureDevOpsClient.request.
+        Raises aiohttp.ClientResponseError for a final non-2xx status.
+        """
+        retry_statuses = RETRY_STATUSES if idempotent else CREATE_RETRY_STATUSES
+        headers = {"Content-Type": content_type} if json is not None else {}
+        started = time.perf_counter()
+        phases = dict.fromkeys(PHASES, 0.0)
+        throttle = backoff = 0.0
+        attempt = 0
+        while True:
+            if self.bucket:
+                waited = time.perf_counter()
+                await self.bucket.acquire()
+                throttle += time.perf_counter() - waited
+            marks = {}
+            try:
+                async with self.semaphore:
+                    async with self.session.request(
+                        method, url, json=json, headers=headers, trace_request_ctx=marks
+                    ) as response:
+                        if response.status in retry_statuses and attempt < self.max_retries:
+                            delay = retry_after_seconds(response)
+                            if delay is not None and self.bucket:
+                                self.bucket.pause(delay)
+                            retry_in = delay if delay is not None else self.backoff_delay(attempt)
+                            if delay is not None or response.status == 429:
+                                throttle += retry_in
+                            else:
+                                backoff += retry_in
+                        else:
+                            if response.headers.get("X-RateLimit-Remaining") == "0" and self.bucket:
+                                self.bucket.pause(retry_after_seconds(response) or self.backoff)
+                            body = await response.read()
+                            if self.hooks:
+                                add_phases(phases, marks)
+                                self.emit(request_event(
+                                    method, url, response.status, time.perf_counter() - started,
+                                    request_size(json) * (attempt + 1), len(body), attempt, throttle, backoff, phases,
+                                ))
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+            except aiohttp.ClientConnectionError as error:
+                sent = not isinstance(error, aiohttp.ClientConnectorError)
+                if attempt >= self.max_retries or (sent and not idempotent):
+                    if self.hooks:
+                        add_phases(phases, marks)
+                        self.emit(request_event(method, url, None, time.perf_counter() - started, 0, 0,
+                                                attempt, throttle, backoff, phases, error))
+                    raise
+                retry_in = self.backoff_delay(attempt)
+                backoff += retry_in
+            add_phases(phases, marks)
+            await asyncio.sleep(retry_in)
+            attempt += 1
+
+    def emit(self, event):
+        """Pass an instrumentation event to every hook"""
+        for hook in self.hooks:
+            hook(event)
+
+    def work_item_url(self, item_id):
+        """API URL of a work item, as used in relation links"""
+        return f"{self.base_url}/_apis/wit/workitems/{item_id}"
+
+    async def create_work_item(self, wi_type, patch_document):
+        """Create a work item from a JSON-patch document and return it"""
+        url = f"{self.base_url}/_apis/wit/workitems/${wi_type}?api-version={self.api_version}"
+        return await self.request(
+            "PATCH", url, json=patch_document, content_type="application/json-patch+json", idempotent=False
+        )
+
+    async def batch(self, batch_requests):
+        """Send sub-requests through the $batch endpoint and return their results"""
+        url = f"{self.org_url}/_apis/wit/$batch?api-version={self.api_version}"
+        return (await self.request("POST", url, json=batch_requests, idempotent=False)).get("value", [])
+
+async def create_work_item(client, wi_type, title, description, fields=None, relations=None):
+    """Create a work item"""
+    patch_document = build_patch_document(title, description, fields, relations)
+
+    try:
+        return await client.create_work_item(wi_type, patch_document)
+    except Exception as e:
+        print(f"Error creating work item '{title}': {e}")
+        return None
+
+def create_relation(client, target_id, relation_type="System.Links.Related"):
+    """Create a relation object"""
+    return {
+        "rel": relation_type,
+        "url": client.work_item_url(target_id)
+    }
+
+def create_parent_relation(client, target_id):
+    """Create a parent relation"""
+    return create_relation(client, target_id, "System.Links.Hierarchy-Forward")
+
+def create_child_relation(client, target_id):
+    """Create a child relation"""
+    return create_relation(client, target_id, "System.Links.Hierarchy-Reverse")
+
+async def seed_items(client, items, journal=None, window=SEED_WINDOW, pending=None):
+    """Create seed items concurrently on the event loop.
+
+    Each item is a coroutine that waits only for the items it links to, so
+    concurrency is bounded by the client rather than by hierarchy depth.
+    Items are streamed in windows; links into earlier windows resolve from
+    the IDs created so far. Links whose target was not created are added to
+    pending (see seed_engine.defer_unresolved). Returns a dict mapping item
+    keys to created IDs.
+    """
+    deferred = [] if pending is None else pending
+    created = journal.created if journal else {}
+    items = iter(journal.remaining(items) if journal else items)
+    loop = asyncio.get_running_loop()
+
+    async def run(item, finished):
+        try:
+            for target_key, _ in item.get("links", ()):
+                if target_key in finished:
+                    await finished[target_key]
+            relations = [
+                create_relation(client, created[target_key], relation_type)
+                for target_key, relation_type in item.get("links", ())
+                if target_key in created
+            ] + list(item.get("relations", ()))
+            work_item = await create_work_item(
+                client, item["type"], item["title"], item.get("description"), item.get("fields"), relations or None
+            )
+            if work_item:
+                if journal:
+                    journal.record(item["key"], work_item["id"])
+                else:
+                    created[item["key"]] = work_item["id"]
+                defer_unresolved(item, created, deferred, journal)
+        finally:
+            finished[item["key"]].set_result(None)
+
+    while True:
+        chunk = list(islice(items, window))
+        if not chunk:
+            break
+        dependency_levels(chunk)  # reject link cycles instead of waiting forever
+        finished = {item["key"]: loop.create_future() for item in chunk}
+        await asyncio.gather(*(run(item, finished) for item in chunk))
+
+    if pending is None:
+        report_unresolved(deferred)
+    return created
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Shared Azure DevOps REST client
+One pooled requests.Session per organization with keep-alive connections,
+precomputed PAT auth headers and retry with exponential backoff. Throttling
+responses (429/503) honor the server's Retry-After header, so bulk seeding
+against a throttled Azure DevOps Server slows down instead of losing items.
+Creates and JSON-patch updates are not idempotent (a resent "add" duplicates
+a comment or relation): they are retried only on 429 and on connect errors,
+never after the server may already have applied them.
+An optional token bucket caps the request rate per client, e.g. per
+organization when several are seeded from one process tree.
+Instrumentation hooks (see request_metrics.py) receive one event per request.
+"""
+
+import base64
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from rate_limit import TokenBucket
+from request_metrics import TimedHTTPAdapter, request_event, start_phases
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5      # seconds, doubled per attempt
+MAX_BACKOFF = 60.0         # seconds
+DEFAULT_TIMEOUT = 30       # seconds
+RETRY_STATUSES = {429, 502, 503, 504}
+CREATE_RETRY_STATUSES = {429}  # rejected before processing; safe to resend a create
+WIQL_PAGE_SIZE = 20000     # server-side cap on WIQL results
+WORK_ITEMS_BATCH_SIZE = 200  # workitemsbatch limit per call
+
+def auth_header(token):
+    """Create Basic Auth header with PAT token"""
+    encoded = base64.b64encode(f":{token}".encode()).decode()
+    return {"Authorization": f"Basic {encoded}"}
+
+def connect_failed(error):
+    """True when a ConnectionError happened while connecting, before the request was sent"""
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectTimeout) or isinstance(reason, ConnectTimeoutError)
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header (seconds or HTTP date); None when absent"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def build_patch_document(title, description, fields=None, relations=None):
+    """Build the JSON-patch document for a new work item"""
+    patch_document = []
+
+    # Title
+    patch_document.append({
+        "op": "add",
+        "path": "/fields/System.Title",
+        "value": title
+    })
+
+    # Description
+    if description:
+        patch_document.append({
+            "op": "add",
+            "path": "/fields/System.Description",
+            "value": description
+        })
+
+    # Additional fields
+    if fields:
+        for field_path, field_value in fields.items():
+            patch_document.append({
+                "op": "add",
+                "path": f"/fields/{field_path}",
+                "value": field_value
+            })
+
+    # Relations (parent, child, related)
+    if relations:
+        for relation in relations:
+            patch_document.append({
+                "op": "add",
+                "path": "/relations/-",
+                "value": relation
+            })
+
+    return patch_document
+
+def build_relations_patch(relations):
+    """Build the JSON-patch document adding relations to an existing work item"""
+    return [{"op": "add", "path": "/relations/-", "value": relation} for relation in relations]
+
+class AzureDevOpsClient:
+    """Pooled, retrying client for one organization/project"""
+
+    def __init__(self, org_url, project, token, api_version="7.0",
+                 pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, hooks=None, rate=None, burst=None):
+        self.org_url = org_url.rstrip("/")
+        self.project = project
+        self.base_url = f"{self.org_url}/{project}"
+        self.api_version = api_version
+        self.token = token
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.hooks = list(hooks or [])
+        self.rate = rate
+        self.burst = burst
+        self.bucket = TokenBucket(rate, burst) if rate else None
+
+        self.session = requests.Session()
+        adapter_class = TimedHTTPAdapter if self.hooks else HTTPAdapter
+        adapter = adapter_class(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(auth_header(token))
+
+    def close(self):
+        self.session.close()
+
+    def backoff_delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (0-based)"""
+        if response is not None:
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                return retry_after
+        delay = min(MAX_BACKOFF, self.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def request(self, method, url, json=None, content_type="application/json", idempotent=True, **kwargs):
+        """Send a request, retrying throttled/unavailable responses and connection errors.
+
+        With idempotent=False (creates, patches) only 429s and connect errors are
+        retried: a dropped connection or gateway error after sending may
+        mean the server applied the request, and resending would duplicate it.
+        Returns the response; raises requests.HTTPError for a final non-2xx status.
+        """
+        retry_statuses = RETRY_STATUSES if idempotent else CREATE_RETRY_STATUSES
+        headers = dict(kwargs.pop("headers", None) or {})
+        if json is not None:
+            headers["Content-Type"] = content_type
+        kwargs.setdefault("timeout", self.timeout)
+
+        started = time.perf_counter()
+        phases = start_phases() if self.hooks else None
+        throttle = backoff = 0.0
+        bytes_sent = 0
+        attempt = 0
+        while True:
+            if self.bucket:
+                throttle += self.bucket.acquire()
+            try:
+                response = self.session.request(method, url, json=json, headers=headers, **kwargs)
+            except requests.ConnectionError as error:
+                if attempt >= self.max_retries or not (idempotent or connect_failed(error)):
+                    if self.hooks:
+                        self.emit(request_event(method, url, None, time.perf_counter() - started, bytes_sent,
+                                                0, attempt, throttle, backoff, phases, error))
+                    raise
+                delay = self.backoff_delay(attempt)
+                backoff += delay
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            bytes_sent += len(response.request.body or b"")
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                delay = self.backoff_delay(attempt, response)
+                if response.status_code == 429 or retry_after_seconds(response) is not None:
+                    throttle += delay
+                    if self.bucket:
+                        self.bucket.pause(delay)
+                else:
+                    backoff += delay
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.hooks:
+                self.emit(request_event(method, url, response.status_code, time.perf_counter() - started,
+                                        bytes_sent, len(response.content), attempt, throttle, backoff, phases))
+            response.raise_for_status()
+            return response
+
+    def emit(self, event):
+        """Pass an instrumentation event to every hook"""
+        for hook in self.hooks:
+            hook(event)
+
+    def work_item_url(self, item_id):
+        """API URL of a work item, as used in relation links"""
+        return f"{self.base_url}/_apis/wit/workitems/{item_id}"
+
+    def create_work_item(self, wi_type, patch_document):
+        """Create a work item from a JSON-patch document and return it"""
+        url = f"{self.base_url}/_apis/wit/workitems/${wi_type}?api-version={self.api_version}"
+        return self.request(
+            "PATCH", url, json=patch_document, content_type="application/json-patch+json", idempotent=False
+        ).json()
+
+    def update_work_item(self, item_id, patch_document):
+        """Apply a JSON-patch document to an existing work item and return it"""
+        url = f"{self.base_url}/_apis/wit/workitems/{item_id}?api-version={self.api_version}"
+        return self.request(
+            "PATCH", url, json=patch_document, content_type="application/json-patch+json", idempotent=False
+        ).json()
+
+    def batch(self, batch_requests):
+        """Send sub-requests through the $batch endpoint and return their results"""
+        url = f"{self.org_url}/_apis/wit/$batch?api-version={self.api_version}"
+        return self.request("POST", url, json=batch_requests, idempotent=False).json().get("value", [])
+
+    def query_ids(self, where, page_size=WIQL_PAGE_SIZE):
+        """Yield IDs of work items matching a WIQL WHERE clause.
+
+        Pages by ascending ID ([System.Id] > last) so results beyond the
+        20k WIQL cap are still returned.
+        """
+        url = f"{self.base_url}/_apis/wit/wiql?api-version={self.api_version}&$top={page_size}"
+        last_id = 0
+        while True:
+            query = (
+                f"SELECT [System.Id] FROM WorkItems WHERE ({where}) "
+                f"AND [System.Id] > {last_id} ORDER BY [System.Id]"
+            )
+            ids = [item["id"] for item in self.request("POST", url, json={"query": query}).json().get("workItems", [])]
+            yield from ids
+            if len(ids) < page_size:
+                return
+            last_id = ids[-1]
+
+    def get_work_items(self, ids, fields=None, expand=None, workers=1):
+        """Yield work items for ids, fetched in workitemsbatch chunks of 200.
+
+        expand ("relations", "all", ...) cannot be combined with fields. With
+        workers > 1 up to twice that many chunks are fetched ahead
+        concurrently; items are still yielded in the order of ids.
+        """
+        ids = iter(ids)
+        chunks = iter(lambda: list(islice(ids, WORK_ITEMS_BATCH_SIZE)), [])
+        if workers <= 1:
+            for chunk in chunks:
+                yield from self.get_work_items_chunk(chunk, fields, expand)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(self.get_work_items_chunk, chunk, fields, expand))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def get_work_items_chunk(self, ids, fields=None, expand=None):
+        """Return up to 200 work items in one workitemsbatch call"""
+        url = f"{self.base_url}/_apis/wit/workitemsbatch?api-version={self.api_version}"
+        body = {"ids": list(ids)}
+        if fields:
+            body["fields"] = list(fields)
+        if expand:
+            body["$expand"] = expand
+        return self.request("POST", url, json=body).json().get("value", [])
+
+    def upload_attachment(self, file_name, body):
+        """Upload an attachment and return its reference ({"id", "url"}).
+
+        body is bytes or a re-iterable object with len() (see
+        seed_payloads.py), which is streamed and restarted on retries.
+        """
+        url = f"{self.base_url}/_apis/wit/attachments?fileName={quote(file_name)}&api-version={self.api_version}"
+        return self.request("POST", url, data=body, headers={"Content-Type": "application/octet-stream"}).json()
+
+    def start_chunked_attachment(self, file_name):
+        """Start a chunked attachment upload (files over 130 MB); returns its reference ({"id", "url"})"""
+        url = (f"{self.base_url}/_apis/wit/attachments?fileName={quote(file_name)}"
+               f"&uploadType=Chunked&api-version={self.api_version}")
+        return self.request("POST", url, data=b"", headers={"Content-Type": "application/octet-stream"}).json()
+
+    def upload_attachment_chunk(self, attachment_id, file_name, body, start, total):
+        """Upload bytes [start, start + len(body)) of a chunked attachment of total bytes"""
+        url = (f"{self.base_url}/_apis/wit/attachments/{attachment_id}?fileName={quote(file_name)}"
+               f"&uploadType=Chunked&api-version={self.api_version}")
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Range": f"bytes {start}-{start + len(body) - 1}/{total}",
+        }
+        return self.request("PUT", url, data=body, headers=headers).json()
+
+    def get_classification_tree(self, group, depth=1):
+        """Return the Areas or Iterations classification node tree, depth levels deep"""
+        url = f"{self.base_url}/_apis/wit/classificationnodes/{group}?$depth={depth}&api-version={self.api_version}"
+        return self.request("GET", url).json()
+
+    def create_classification_node(self, group, parent_path, name, attributes=None):
+        """Create an area/iteration node under parent_path (relative to the root, "" for the root)"""
+        path = "/".join(quote(segment, safe="") for segment in parent_path.split("\\") if segment)
+        url = f"{self.base_url}/_apis/wit/classificationnodes/{group}/{path}".rstrip("/")
+        body = {"name": name}
+        if attributes:
+            body["attributes"] = attributes
+        return self.request("POST", f"{url}?api-version={self.api_version}", json=body, idempotent=False).json()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Seeding benchmark
+Compares sequential, concurrent and $batch work item creation wall time
+against the local Azure DevOps stand-in (devops_stub_server.py), plus the
+asyncio client's items/sec at several concurrency levels when aiohttp is
+installed. The stand-in runs in its own process: in-process, its handler
+threads (one per keep-alive connection) compete with the client for the GIL,
+and throughput fell as concurrency rose.
+
+Usage:
+    python3 scripts/benchmark_seeding.py --items 1000 --latency-ms 20 --batch-size 200 --workers 16 --async-concurrency 8,32,128
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import subprocess
+import sys
+import time
+
+STUB_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "devops_stub_server.py")
+
+def synthetic_items(count, fan_out=5):
+    """Build a parent-first Epic > Feature > PBI > Task hierarchy of count items"""
+    levels = ["Epic", "Feature", "Product Backlog Item", "Task"]
+    items = []
+
+    def add(depth, parent_key):
+        if len(items) >= count:
+            return
+        wi_type = levels[depth]
+        key = f"item{len(items)}"
+        item = {"key": key, "type": wi_type, "title": f"{wi_type} {len(items)}", "description": "Benchmark item"}
+        if parent_key:
+            item["links"] = [(parent_key, "System.Links.Hierarchy-Forward")]
+        items.append(item)
+        if depth + 1 < len(levels):
+            for _ in range(fan_out):
+                add(depth + 1, key)
+
+    while len(items) < count:
+        add(0, None)
+    return items
+
+def timed(function, *args):
+    """Run function with its output suppressed and return (result, seconds)"""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return result, time.perf_counter() - started
+
+def start_stub_process(latency_ms):
+    """Start devops_stub_server.py on a free port in a subprocess; returns (process, port)"""
+    process = subprocess.Popen(
+        [sys.executable, "-u", STUB_SERVER, "--port", "0", "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    match = re.search(r":(\d+)/", process.stdout.readline())
+    if not match:
+        process.kill()
+        raise RuntimeError("devops_stub_server.py did not start")
+    return process, int(match.group(1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Work item seeding benchmark")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--async-concurrency", default="8,32,128",
+                        help="comma separated in-flight limits for the asyncio client")
+    args = parser.parse_args()
+
+    stub, port = start_stub_process(args.latency_ms)
+    os.environ["AZURE_DEVOPS_ORG_URL"] = f"http://127.0.0.1:{port}/benchmark"
+    try:
+        import create_demo_project
+        create_demo_project.configure_client(pool_size=max(10, args.workers))
+
+        items = synthetic_items(args.items)
+        print(f"⏱️  Seeding {len(items)} items, {args.latency_ms:g} ms simulated latency")
+        print("-" * 60)
+
+        created, sequential = timed(create_demo_project.seed_sequential, items)
+        print(f"Sequential: {sequential:8.2f}s  {len(created) / sequential:10.1f} items/s")
+
+        created, parallel = timed(create_demo_project.seed_parallel, items, args.workers)
+        print(f"Parallel:   {parallel:8.2f}s  {len(created) / parallel:10.1f} items/s  ({args.workers} workers)")
+
+        created, batched = timed(create_demo_project.seed_batched, items, args.batch_size)
+        print(f"Batched:    {batched:8.2f}s  {len(created) / batched:10.1f} items/s  (batch size {args.batch_size})")
+
+        if importlib.util.find_spec("aiohttp"):
+            for concurrency in [int(value) for value in args.async_concurrency.split(",") if value]:
+                created, elapsed = timed(create_demo_project.seed_async, items, concurrency)
+                print(f"Async:      {elapsed:8.2f}s  {len(created) / elapsed:10.1f} items/s  ({concurrency} in flight)")
+        else:
+            print("Async:      skipped (pip install aiohttp)")
+
+        print("-" * 60)
+        print(f"📊 Speedup: parallel {sequential / parallel:.1f}x, batched {sequential / batched:.1f}x")
+    finally:
+        stub.terminate()
+        stub.wait()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
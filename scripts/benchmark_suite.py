@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with regression tracking
+Runs a matrix of seeding scenarios (dataset size x mode x workers/batch size)
+against the Azure DevOps stand-in (devops_stub_server.py) and of AAB uploads
+(bundle size x chunk size) through upload_to_play_store.publish_to_tracks
+against the Google Play stand-in (play_stub_server.py).
+
+Each scenario runs in its own subprocess against a fresh stand-in, so peak RSS
+is measured per scenario. Items/sec (or MB/s), p50/p99 request latency, peak
+RSS and request/response bytes are written to a JSON results file and compared
+with a stored baseline: throughput drops or latency/RSS growth beyond the
+threshold are reported as regressions and the exit code is 1.
+
+No baseline is committed: numbers depend on the machine, so record one on the
+machine that runs the comparison (--update-baseline) before the first check.
+Without a baseline the suite exits 1 instead of silently passing.
+
+Usage:
+    python3 scripts/benchmark_suite.py --profile quick --update-baseline   # once per machine
+    python3 scripts/benchmark_suite.py --profile quick
+    python3 scripts/benchmark_suite.py --profile full --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmark_seeding import synthetic_items, timed
+
+BASELINE_FILE = os.environ.get(
+    "BENCHMARK_BASELINE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+)
+RESULTS_FILE = "benchmark_results.json"
+REGRESSION_THRESHOLD = 0.15  # relative change that counts as a regression
+SEQUENTIAL_LIMIT = 10000     # larger datasets skip the sequential mode
+SCENARIO_TIMEOUT = 3600      # seconds per scenario subprocess
+PACKAGE_NAME = "com.example.benchmark"
+
+PROFILES = {
+    "quick": {"items": [100, 1000], "workers": [8, 32], "batch_sizes": [50, 200],
+              "bundle_mb": [8, 32], "chunk_mb": [8]},
+    "full": {"items": [100, 10000, 100000], "workers": [8, 32], "batch_sizes": [50, 200],
+             "bundle_mb": [32, 128, 512], "chunk_mb": [8, 32]},
+}
+
+# metric -> True when higher is better
+METRICS = {
+    "items_per_sec": True,
+    "mb_per_sec": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+class RequestRecorder:
+    """Thread-safe request latency and byte counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record(self, seconds, sent, received):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    def attach(self, session):
+        """Record every response of a requests.Session (retries included)"""
+        def on_response(response, *args, **kwargs):
+            body = response.request.body or b""
+            self.record(response.elapsed.total_seconds(), len(body), len(response.content))
+        session.hooks["response"].append(on_response)
+
+    def wrap(self, http):
+        """Record every request of an httplib2.Http used by googleapiclient"""
+        send = http.request
+
+        def request(uri, method="GET", body=None, headers=None, *args, **kwargs):
+            started = time.perf_counter()
+            response, content = send(uri, method, body, headers, *args, **kwargs)
+            if isinstance(body, (bytes, str)):
+                sent = len(body)
+            else:
+                sent = int({name.lower(): value for name, value in (headers or {}).items()}.get("content-length", 0))
+            self.record(time.perf_counter() - started, sent, len(content or b""))
+            return response, content
+
+        http.request = request
+        return http
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list; 0 when empty"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def build_scenarios(profile):
+    """Scenario dicts for a profile, each with a unique name"""
+    settings = PROFILES[profile]
+    scenarios = []
+    for count in settings["items"]:
+        if count <= SEQUENTIAL_LIMIT:
+            scenarios.append({"kind": "seed", "mode": "sequential", "items": count})
+        for workers in settings["workers"]:
+            scenarios.append({"kind": "seed", "mode": "parallel", "items": count, "workers": workers})
+        for batch_size in settings["batch_sizes"]:
+            scenarios.append({"kind": "seed", "mode": "batched", "items": count, "batch_size": batch_size})
+    for bundle_mb in settings["bundle_mb"]:
+        for chunk_mb in settings["chunk_mb"]:
+            scenarios.append({"kind": "upload", "bundle_mb": bundle_mb, "chunk_mb": chunk_mb})
+
+    for scenario in scenarios:
+        parameters = [f"{key}={value}" for key, value in scenario.items() if key not in ("kind", "mode")]
+        scenario["name"] = "/".join([scenario["kind"], scenario.get("mode", "publish")] + parameters)
+    return scenarios
+
+def run_seed_scenario(scenario, url):
+    """Seed synthetic items against the stand-in at url (runs in the child process)"""
+    os.environ["AZURE_DEVOPS_ORG_URL"] = url
+    import create_demo_project
+    create_demo_project.configure_client(pool_size=max(10, scenario.get("workers", 1)))
+    recorder = RequestRecorder()
+    recorder.attach(create_demo_project.get_client().session)
+
+    items = synthetic_items(scenario["items"])
+    if scenario["mode"] == "sequential":
+        created, seconds = timed(create_demo_project.seed_sequential, items)
+    elif scenario["mode"] == "parallel":
+        created, seconds = timed(create_demo_project.seed_parallel, items, scenario["workers"])
+    else:
+        created, seconds = timed(create_demo_project.seed_batched, items, scenario["batch_size"])
+
+    return dict(
+        recorder.summary(),
+        ok=len(created) == len(items),
+        seconds=round(seconds, 3),
+        items_per_sec=round(len(created) / seconds, 1),
+    )
+
+def run_upload_scenario(scenario, url):
+    """Publish a synthetic AAB to the Play stand-in at url (runs in the child process)"""
+    import upload_to_play_store
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.http import build_http
+
+    recorder = RequestRecorder()
+    with urllib.request.urlopen(f"{url}/discovery") as response:
+        document = json.load(response)
+    service = build_from_document(document, http=recorder.wrap(build_http()))
+
+    size = scenario["bundle_mb"] * 1024 * 1024
+    with tempfile.TemporaryDirectory() as workdir:
+        aab_file = os.path.join(workdir, "benchmark.aab")
+        with open(aab_file, "wb") as bundle:
+            bundle.truncate(size)
+        results, seconds = timed(
+            upload_to_play_store.publish_to_tracks, service, PACKAGE_NAME, aab_file,
+            ["alpha"], scenario["chunk_mb"] * 1024 * 1024, True,
+        )
+
+    return dict(
+        recorder.summary(),
+        ok=all(error is None for error in results.values()),
+        seconds=round(seconds, 3),
+        mb_per_sec=round(size / 1e6 / seconds, 2),
+    )
+
+def run_child(scenario, url):
+    runner = run_seed_scenario if scenario["kind"] == "seed" else run_upload_scenario
+    result = runner(scenario, url)
+    result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(result))
+    return 0
+
+def run_scenario(scenario, latency_ms, bandwidth_mbps):
+    """Start a fresh stand-in, run scenario in a subprocess and return its result"""
+    if scenario["kind"] == "seed":
+        from devops_stub_server import start_server
+        server = start_server(latency_ms=latency_ms)
+        url = f"http://127.0.0.1:{server.server_port}/benchmark"
+    else:
+        from play_stub_server import start_server
+        server = start_server(latency_ms=latency_ms, bandwidth_mbps=bandwidth_mbps)
+        url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-scenario", json.dumps(scenario), "--url", url],
+            capture_output=True, text=True, timeout=SCENARIO_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "error": f"timed out after {SCENARIO_TIMEOUT}s"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"ok": False, "error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+def format_result(result):
+    if "error" in result:
+        return f"❌ {result['error']}"
+    throughput = (f"{result['items_per_sec']:10.1f} items/s" if "items_per_sec" in result
+                  else f"{result['mb_per_sec']:10.2f} MB/s   ")
+    status = "" if result["ok"] else "  ⚠️ incomplete"
+    return (f"{throughput}  p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms"
+            f"  RSS {result['peak_rss_mb']:7.1f} MB  {result['requests']:7d} req{status}")
+
+def compare(results, baseline, threshold):
+    """Return (scenario, metric, baseline value, current value) for every regression"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or "error" in previous:
+            continue
+        if "error" in result:
+            regressions.append((name, "error", None, result["error"]))
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+def load_json(path):
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+def write_json(path, data):
+    with open(path, "w") as json_file:
+        json.dump(data, json_file, indent=2, sort_keys=True)
+        json_file.write("\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seeding and upload benchmark suite with regression tracking")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", choices=["seed", "upload"], help="run only one kind of scenario")
+    parser.add_argument("--latency-ms", type=float, default=5, help="simulated latency per request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="upload bandwidth cap (0 = unlimited)")
+    parser.add_argument("--output", default=RESULTS_FILE, help="results JSON file")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative change reported as a regression (0.15 = 15%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.run_scenario:
+        return run_child(json.loads(args.run_scenario), args.url)
+
+    scenarios = [scenario for scenario in build_scenarios(args.profile)
+                 if not args.only or scenario["kind"] == args.only]
+    print(f"⏱️  {len(scenarios)} scenarios ({args.profile} profile), {args.latency_ms:g} ms simulated latency")
+    print("-" * 100)
+
+    results = {}
+    for scenario in scenarios:
+        result = run_scenario(scenario, args.latency_ms, args.bandwidth_mbps)
+        results[scenario["name"]] = result
+        print(f"{scenario['name']:<45} {format_result(result)}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "profile": args.profile,
+        "latency_ms": args.latency_ms,
+        "bandwidth_mbps": args.bandwidth_mbps,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    write_json(args.output, report)
+    print("-" * 100)
+    print(f"💾 Results written to {args.output}")
+
+    if args.update_baseline:
+        baseline = load_json(args.baseline) or {}
+        baseline.update({key: value for key, value in report.items() if key != "results"})
+        baseline["results"] = dict(baseline.get("results", {}), **results)
+        write_json(args.baseline, baseline)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline)
+    if not baseline:
+        print(f"❌ No baseline at {args.baseline}; record one on this machine first:")
+        print(f"   python3 {sys.argv[0]} --profile {args.profile} --update-baseline")
+        return 1
+    if baseline.get("latency_ms") != args.latency_ms or baseline.get("bandwidth_mbps") != args.bandwidth_mbps:
+        print("⚠️ Baseline was recorded with different latency/bandwidth settings")
+
+    missing = [name for name in results if name not in baseline.get("results", {})]
+    if missing:
+        print(f"⚠️ {len(missing)} scenarios have no baseline yet (add them with --update-baseline): "
+              f"{', '.join(missing)}")
+
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if not regressions:
+        print(f"✅ No regressions against baseline (threshold {args.threshold:.0%})")
+        return 0
+    print(f"❌ {len(regressions)} regressions against baseline (threshold {args.threshold:.0%}):")
+    for name, metric, old, new in regressions:
+        print(f"   {name}: {metric} {old} -> {new}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Play yüklemesi öncesi AAB ön kontrolü
+AAB'nin SHA-256 özeti parça parça (belleğe almadan) hesaplanır ve
+versionCode, bundle içindeki protobuf formatındaki AndroidManifest.xml'den
+okunur. Yerel önbellek ve tek bir edits().bundles().list() çağrısıyla aynı
+bundle (veya aynı versionCode) sunucuda zaten varsa yükleme atlanır ve
+doğrudan track atamasına geçilir; commit hatasından sonra tekrar çalışan
+release job'ları yüzlerce MB'ı yeniden göndermez.
+
+Önbellek (varsayılan .play-upload-cache.json, PLAY_UPLOAD_CACHE ile
+değiştirilebilir) dosya yolu/boyut/mtime → SHA-256 ve paket → SHA-256 →
+versionCode eşlemelerini tutar.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import zipfile
+
+CACHE_FILE = os.environ.get("PLAY_UPLOAD_CACHE", ".play-upload-cache.json")
+HASH_BLOCK = 1024 * 1024
+MANIFEST_PATH = "base/manifest/AndroidManifest.xml"
+
+# aapt2 Resources.proto alan numaraları
+XML_NODE_ELEMENT = 1
+XML_ELEMENT_NAME, XML_ELEMENT_ATTRIBUTE = 3, 4
+XML_ATTRIBUTE_NAME, XML_ATTRIBUTE_VALUE, XML_ATTRIBUTE_COMPILED_ITEM = 2, 3, 6
+ITEM_PRIM = 7
+PRIM_INT_DECIMAL, PRIM_INT_HEXADECIMAL = 6, 7
+
+def file_sha256(path, block_size=HASH_BLOCK):
+    """Dosyanın SHA-256 özetini parça parça hesaplar"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_varint(data, position):
+    """position'daki varint'i okur; (değer, sonraki konum) döner"""
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+def proto_fields(data):
+    """Protobuf mesajının (alan numarası, değer) çiftleri; varint → int, length-delimited → bytes"""
+    position = 0
+    while position < len(data):
+        key, position = read_varint(data, position)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, position = read_varint(data, position)
+        elif wire_type == 2:
+            length, position = read_varint(data, position)
+            value = data[position:position + length]
+            position += length
+        elif wire_type == 1:
+            value = struct.unpack_from("<Q", data, position)[0]
+            position += 8
+        elif wire_type == 5:
+            value = struct.unpack_from("<I", data, position)[0]
+            position += 4
+        else:
+            raise ValueError(f"desteklenmeyen protobuf wire type: {wire_type}")
+        yield number, value
+
+def attribute_int(attribute):
+    """XmlAttribute'un derlenmiş tamsayı değeri, yoksa metin değeri"""
+    text = None
+    for number, value in proto_fields(attribute):
+        if number == XML_ATTRIBUTE_COMPILED_ITEM:
+            for item_field, item in proto_fields(value):
+                if item_field == ITEM_PRIM:
+                    for prim_field, prim in proto_fields(item):
+                        if prim_field in (PRIM_INT_DECIMAL, PRIM_INT_HEXADECIMAL):
+                            return prim
+        elif number == XML_ATTRIBUTE_VALUE:
+            text = value.decode("utf-8")
+    return int(text, 0) if text else None
+
+def read_version_code(aab_file):
+    """AAB'deki manifest'ten versionCode okur; okunamazsa None"""
+    try:
+        with zipfile.ZipFile(aab_file) as bundle:
+            manifest = bundle.read(MANIFEST_PATH)
+        for number, element in proto_fields(manifest):
+            if number != XML_NODE_ELEMENT:
+                continue
+            for element_field, attribute in proto_fields(element):
+                if element_field != XML_ELEMENT_ATTRIBUTE:
+                    continue
+                names = [value for field, value in proto_fields(attribute) if field == XML_ATTRIBUTE_NAME]
+                if names == [b"versionCode"]:
+                    return attribute_int(attribute)
+    except (OSError, KeyError, ValueError, IndexError, struct.error, zipfile.BadZipFile):
+        pass
+    return None
+
+class UploadCache:
+    """Dosya özetleri ve yüklenen bundle'ların yerel, thread-safe önbelleği"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path) as cache_file:
+                self.data = json.load(cache_file)
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault("hashes", {})
+        self.data.setdefault("uploads", {})
+
+    def save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as cache_file:
+            json.dump(self.data, cache_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def sha256(self, path):
+        """Dosyanın özeti; boyut ve mtime değişmediyse önbellekten"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+        with self.lock:
+            cached = self.data["hashes"].get(key)
+        if cached and cached["fingerprint"] == fingerprint:
+            return cached["sha256"]
+        digest = file_sha256(path)
+        with self.lock:
+            self.data["hashes"][key] = {"fingerprint": fingerprint, "sha256": digest}
+            self.save()
+        return digest
+
+    def version_code(self, package_name, sha256):
+        with self.lock:
+            return self.data["uploads"].get(package_name, {}).get(sha256)
+
+    def remember(self, package_name, sha256, version_code):
+        """Yüklenen bundle'ın versionCode'unu kaydeder"""
+        with self.lock:
+            self.data["uploads"].setdefault(package_name, {})[sha256] = version_code
+            self.save()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Süreç içinde paylaşılan önbellek (paralel yayınlar aynı dosyaya yazar)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = UploadCache()
+        return _cache
+
+def find_uploaded_bundle(service, package_name, edit_id, aab_file, cache, log=print):
+    """Bundle (veya versionCode'u) sunucuda varsa versionCode döner; yüklenmesi gerekiyorsa None.
+
+    Sunucudaki bundle listesi tek bir edits().bundles().list() çağrısıyla
+    alınır ve yerel özet, önbellekteki ve manifest'teki versionCode ile
+    karşılaştırılır.
+    """
+    sha256 = cache.sha256(aab_file)
+    local_version = read_version_code(aab_file)
+    cached_version = cache.version_code(package_name, sha256)
+    bundles = service.edits().bundles().list(editId=edit_id, packageName=package_name).execute().get("bundles", [])
+
+    for bundle in bundles:
+        if bundle.get("sha256") == sha256:
+            log(f"⏭️  Bu AAB sunucuda zaten var, yükleme atlanıyor. Version Code: {bundle['versionCode']}")
+            cache.remember(package_name, sha256, bundle["versionCode"])
+            return bundle["versionCode"]
+    server_versions = {bundle.get("versionCode") for bundle in bundles}
+    for version in (cached_version, local_version):
+        if version is not None and version in server_versions:
+            log(f"⏭️  Version Code {version} sunucuda zaten var, yükleme atlanıyor")
+            if version != cached_version:
+                log("⚠️ Sunucudaki bundle içeriği bu dosyadan farklı; mevcut bundle track'lere atanacak")
+            return version
+    if local_version is not None:
+        log(f"🔍 Ön kontrol: Version Code {local_version}, SHA-256 {sha256[:12]}…, sunucuda yok")
+    return None
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Live project churn generator
+Issues a steady stream of realistic edits against existing work items to
+load-test clients that poll for changes: field updates, state transitions,
+reassignments and comments (System.History), all as JSON-patch documents on
+the shared client of create_demo_project.py.
+
+The scheduler is open-loop: operations are dispatched at the target rate no
+matter how fast earlier ones complete, so a slow server shows up as growing
+latency instead of a silently lower rate. Latency is measured from each
+operation's scheduled time (queueing included) as well as from when it was
+sent. With --batch-size > 1 operations are packed into $batch calls.
+Edits are sent as non-idempotent requests: a 5xx or dropped connection is
+counted as a failed operation instead of being resent, which would
+duplicate comments and relation adds and inflate the measured rate.
+
+Usage:
+    python3 scripts/churn_generator.py --rate 20 --duration 300
+    python3 scripts/churn_generator.py --rate 200 --batch-size 20 --workers 16 \\
+        --users alice@contoso.com,bob@contoso.com --mix update=40,transition=30,comment=30
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+
+import create_demo_project
+from azure_devops_client import DEFAULT_POOL_SIZE
+from request_metrics import RequestMetrics
+
+DEFAULT_MIX = {"update": 40, "transition": 25, "reassign": 15, "comment": 20}
+REPORT_EVERY = 10.0  # seconds between progress lines
+MAX_BACKLOG = 10000  # scheduled but unfinished operations before new ones are dropped
+MAX_ERRORS_SHOWN = 5
+
+# Scrum process states per work item type, in workflow order; Done wraps back (reopen)
+STATE_FLOWS = {
+    "Epic": ["New", "In Progress", "Done"],
+    "Feature": ["New", "In Progress", "Done"],
+    "Product Backlog Item": ["New", "Approved", "Committed", "Done"],
+    "Bug": ["New", "Approved", "Committed", "Done"],
+    "Task": ["To Do", "In Progress", "Done"],
+    "Test Case": ["Design", "Ready", "Closed"],
+}
+
+def next_state(wi_type, state):
+    """Next state in the type's workflow; None when the type has no known workflow"""
+    flow = STATE_FLOWS.get(wi_type)
+    if not flow:
+        return None
+    index = flow.index(state) if state in flow else -1
+    return flow[(index + 1) % len(flow)]
+
+def load_targets(client, where, limit=None):
+    """Map work item ID -> {"type", "state"} for items matching a WIQL WHERE clause"""
+    ids = client.query_ids(where)
+    if limit:
+        ids = islice(ids, limit)
+    fields = ["System.Id", "System.WorkItemType", "System.State"]
+    return {
+        work_item["id"]: {
+            "type": work_item["fields"].get("System.WorkItemType"),
+            "state": work_item["fields"].get("System.State"),
+        }
+        for work_item in client.get_work_items(ids, fields, workers=4)
+    }
+
+def parse_mix(value):
+    """Parse "update=40,transition=25,..." into a weight dict"""
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation '{kind}' (choose from {', '.join(DEFAULT_MIX)})")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+class OperationSource:
+    """Draws random operations; tracks each item's state so transitions keep moving"""
+
+    def __init__(self, targets, mix, users, seed=None):
+        self.targets = targets
+        self.ids = list(targets)
+        self.users = users
+        self.random = random.Random(seed)
+        if not users:
+            mix = {kind: weight for kind, weight in mix.items() if kind != "reassign"}
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.count = 0
+
+    def next(self):
+        """Return (kind, work item ID, patch document)"""
+        self.count += 1
+        item_id = self.random.choice(self.ids)
+        target = self.targets[item_id]
+        kind = self.random.choices(self.kinds, self.weights)[0]
+
+        if kind == "transition":
+            state = next_state(target["type"], target["state"])
+            if state:
+                target["state"] = state  # optimistic: later transitions continue from here
+                return kind, item_id, [{"op": "add", "path": "/fields/System.State", "value": state}]
+            kind = "update"
+        if kind == "reassign":
+            return kind, item_id, [{"op": "add", "path": "/fields/System.AssignedTo", "value": self.random.choice(self.users)}]
+        if kind == "comment":
+            text = f"Churn comment {self.count} at {datetime.now(timezone.utc).isoformat(timespec='seconds')}"
+            return kind, item_id, [{"op": "add", "path": "/fields/System.History", "value": text}]
+
+        field = self.random.choice(["priority", "tags", "description"])
+        if field == "priority":
+            operation = {"path": "/fields/Microsoft.VSTS.Common.Priority", "value": self.random.randint(1, 4)}
+        elif field == "tags":
+            operation = {"path": "/fields/System.Tags", "value": f"churn; churn-{self.random.randint(1, 10)}"}
+        else:
+            operation = {"path": "/fields/System.Description", "value": f"Updated by churn operation {self.count}"}
+        return "update", item_id, [dict(operation, op="add")]
+
+class ChurnStats:
+    """Thread-safe per-kind counters and latency samples"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ok = {}
+        self.failed = {}
+        self.response = []  # seconds from scheduled time to completion
+        self.service = []   # seconds from send to completion
+        self.window = []    # response times since the last progress line
+        self.completed = 0
+        self.dropped = 0
+        self.errors = []
+
+    def record(self, kind, ok, response, service):
+        with self.lock:
+            counter = self.ok if ok else self.failed
+            counter[kind] = counter.get(kind, 0) + 1
+            self.response.append(response)
+            self.service.append(service)
+            self.window.append(response)
+            self.completed += 1
+
+    def error(self, message):
+        with self.lock:
+            if len(self.errors) < MAX_ERRORS_SHOWN:
+                self.errors.append(message)
+
+    def take_window(self):
+        with self.lock:
+            window, self.window = self.window, []
+            return window
+
+def percentile(values, fraction):
+    """Nearest-rank percentile in ms; 0 when empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1000
+
+def execute(client, operations, scheduled, stats):
+    """Send operations as one PATCH or one $batch call and record the outcome"""
+    sent = time.perf_counter()
+    try:
+        if len(operations) == 1:
+            _, item_id, patch_document = operations[0]
+            client.update_work_item(item_id, patch_document)  # not retried after a 5xx (idempotent=False)
+            results = [True]
+        else:
+            batch = [
+                {
+                    "method": "PATCH",
+                    "uri": f"/_apis/wit/workitems/{item_id}?api-version={client.api_version}",
+                    "headers": {"Content-Type": "application/json-patch+json"},
+                    "body": patch_document,
+                }
+                for _, item_id, patch_document in operations
+            ]
+            results = [result.get("code") == 200 for result in client.batch(batch)]
+            for (kind, item_id, _), ok in zip(operations, results):
+                if not ok:
+                    stats.error(f"{kind} on work item {item_id} failed")
+    except Exception as e:
+        results = [False] * len(operations)
+        stats.error(str(e))
+    done = time.perf_counter()
+    for (kind, _, _), ok in zip(operations, results):
+        stats.record(kind, ok, done - scheduled, done - sent)
+
+def run_churn(client, source, rate, duration, batch_size=1, workers=8, report_every=REPORT_EVERY):
+    """Dispatch operations at rate ops/second for duration seconds; returns (stats, elapsed)"""
+    stats = ChurnStats()
+    interval = batch_size / rate
+    started = time.perf_counter()
+    next_report = started + report_every
+    dispatched = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        tick = 0
+        while True:
+            scheduled = started + tick * interval
+            if scheduled - started >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            tick += 1
+
+            operations = [source.next() for _ in range(batch_size)]
+            if dispatched - stats.completed >= MAX_BACKLOG:
+                stats.dropped += len(operations)
+            else:
+                dispatched += len(operations)
+                pool.submit(execute, client, operations, scheduled, stats)
+
+            now = time.perf_counter()
+            if now >= next_report:
+                window = stats.take_window()
+                print(f"   {now - started:6.0f}s  {len(window) / report_every:8.1f} ops/s"
+                      f"  p50 {percentile(window, 0.5):7.1f} ms  p99 {percentile(window, 0.99):7.1f} ms"
+                      f"  backlog {dispatched - stats.completed}")
+                next_report += report_every
+
+    return stats, time.perf_counter() - started
+
+def print_summary(stats, rate, elapsed):
+    total = stats.completed
+    failed = sum(stats.failed.values())
+    print()
+    print("📊 Churn summary")
+    print(f"   Target rate:   {rate:.1f} ops/s")
+    print(f"   Achieved rate: {total / elapsed:.1f} ops/s ({total} ops in {elapsed:.1f}s, {failed} failed, {stats.dropped} dropped)")
+    for kind in sorted(set(stats.ok) | set(stats.failed)):
+        print(f"   {kind:<11} {stats.ok.get(kind, 0):8} ok  {stats.failed.get(kind, 0):6} failed")
+    for label, values in (("Response time", stats.response), ("Service time", stats.service)):
+        print(f"   {label + ':':<15} p50 {percentile(values, 0.5):7.1f} ms  p90 {percentile(values, 0.9):7.1f} ms"
+              f"  p99 {percentile(values, 0.99):7.1f} ms  max {percentile(values, 1.0):7.1f} ms")
+    for message in stats.errors:
+        print(f"   ❌ {message}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate live work item churn at a target rate")
+    parser.add_argument("--rate", type=float, default=10, help="target operations per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to generate load")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help=f"operations per request; >1 uses $batch (max {create_demo_project.MAX_BATCH_SIZE})")
+    parser.add_argument("--workers", type=int, default=8, help="requests in flight")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="operation weights, e.g. update=40,transition=25,reassign=15,comment=20")
+    parser.add_argument("--users", default="",
+                        help="comma separated identities for reassignments (reassign is skipped without them)")
+    parser.add_argument("--where", default="[System.TeamProject] = @project",
+                        help="WIQL WHERE clause selecting the work items to churn")
+    parser.add_argument("--limit", type=int, default=0, help="churn at most this many work items")
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible operation sequence")
+    parser.add_argument("--metrics", action="store_true", help="print per-request metrics at the end")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    batch_size = max(1, min(args.batch_size, create_demo_project.MAX_BATCH_SIZE))
+    metrics = RequestMetrics() if args.metrics else None
+    client = create_demo_project.configure_client(
+        max(DEFAULT_POOL_SIZE, args.workers), hooks=[metrics] if metrics else None
+    )
+
+    print("🌀 Azure DevOps churn generator")
+    print(f"Project: {client.project}")
+    targets = load_targets(client, args.where, args.limit or None)
+    if not targets:
+        print("❌ No work items matched; seed the project first")
+        return 1
+    users = [user.strip() for user in args.users.split(",") if user.strip()]
+    source = OperationSource(targets, args.mix, users, args.seed)
+
+    print(f"🎯 {len(targets)} work items, {args.rate:g} ops/s for {args.duration:g}s, "
+          f"{batch_size} ops per request, {args.workers} in flight")
+    stats, elapsed = run_churn(client, source, args.rate, args.duration, batch_size, args.workers)
+    print_summary(stats, args.rate, elapsed)
+    if metrics:
+        metrics.print_summary()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,88 +3,173 @@
 Azure DevOps Demo Project Creator
 Creates a comprehensive demo project with Epics, Features, PBIs, Tasks, Tests, and Bugs
 with proper relationships between work items.
+
+Usage:
+    python3 scripts/create_demo_project.py                  # one request per item
+    python3 scripts/create_demo_project.py --batch-size 200 # $batch endpoint
+    python3 scripts/create_demo_project.py --workers 16     # concurrent, per hierarchy level
+    python3 scripts/create_demo_project.py --spec scripts/seed_specs/large_backlog.yaml --batch-size 200
+    python3 scripts/create_demo_project.py --journal seed.jsonl  # rerun to resume after a failure
+    python3 scripts/create_demo_project.py --idempotent          # only create items missing on the server
+    python3 scripts/create_demo_project.py --async --workers 64 --rate 50  # asyncio + aiohttp, rate limited
+    python3 scripts/create_demo_project.py --workers 32 --deferred-links   # create unlinked, then link
+    python3 scripts/create_demo_project.py --workers 16 --metrics-jsonl requests.jsonl --metrics-prom seed.prom
+    python3 scripts/create_demo_project.py --targets tenants.yaml --batch-size 200 --rate 20  # many projects at once
 """
 
-import requests
-import base64
+import argparse
+import asyncio
+import os
 import json
 from datetime import datetime, timedelta
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from azure_devops_client import DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, AzureDevOpsClient, build_patch_document, build_relations_patch
+from request_metrics import RequestMetrics
+from seed_engine import defer_unresolved, dependency_levels, report_unresolved, seed_concurrent
+from seed_index import fetch_existing_hashes, skip_existing
+from seed_journal import SeedJournal
+from seed_paths import provision_classification
+from seed_payloads import DEFAULT_UPLOAD_WORKERS, add_revisions, build_payloads
+from seed_spec import estimate_count, generate_items, load_spec
 
 # Configuration
 ORGANIZATION = "hygieia-devops"
 PROJECT = "DevOps-Turkiye"
 TEAM = "DevOps-Turkiye Team"
-BASE_URL = f"https://dev.azure.com/{ORGANIZATION}/{PROJECT}"
+ORG_URL = os.environ.get("AZURE_DEVOPS_ORG_URL", f"https://dev.azure.com/{ORGANIZATION}")
+BASE_URL = f"{ORG_URL}/{PROJECT}"
 API_VERSION = "7.0"
 TOKEN = "AI9TJm5RCCifo7r0YeyoMAHZuXxuUS6vAQxQyVpRsklnr5C9wSx0JQQJ99BLACAAAAAAAAAAAAASAZDO1YxI"
+MAX_BATCH_SIZE = 200  # $batch endpoint limit per call
+PARALLEL_WINDOW = 10000  # streamed items scheduled per concurrent window
+SUMMARY_LIMIT = 50  # created items listed individually at the end of a run
+
+TYPE_ICONS = {
+    "Epic": "📦",
+    "Feature": "🔧",
+    "Product Backlog Item": "📋",
+    "Task": "📝",
+    "Test Case": "🧪",
+    "Bug": "🐛",
+}
 
-def get_auth_header():
-    """Create Basic Auth header with PAT token"""
-    credentials = f":{TOKEN}"
-    encoded = base64.b64encode(credentials.encode()).decode()
-    return {"Authorization": f"Basic {encoded}"}
+_client = None
 
-def get_headers():
-    """Get request headers"""
-    headers = get_auth_header()
-    headers["Content-Type"] = "application/json-patch+json"
-    return headers
+def get_client():
+    """Return the shared Azure DevOps client"""
+    global _client
+    if _client is None:
+        _client = AzureDevOpsClient(ORG_URL, PROJECT, TOKEN, API_VERSION)
+    return _client
+
+def configure_client(pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES, hooks=None,
+                     org_url=None, project=None, token=None, rate=None, burst=None):
+    """Replace the shared client with one using the given pool, retry, rate and instrumentation settings.
+
+    org_url, project and token default to the configuration above; set them
+    to seed into another organization or project.
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+    _client = AzureDevOpsClient(
+        org_url or ORG_URL, project or PROJECT, token or TOKEN, API_VERSION,
+        pool_size=pool_size, max_retries=max_retries, hooks=hooks, rate=rate, burst=burst
+    )
+    return _client
 
 def create_work_item(wi_type, title, description, fields=None, relations=None):
     """Create a work item"""
-    url = f"{BASE_URL}/_apis/wit/workitems/${wi_type}?api-version={API_VERSION}"
-    
-    patch_document = []
-    
-    # Title
-    patch_document.append({
-        "op": "add",
-        "path": "/fields/System.Title",
-        "value": title
-    })
-    
-    # Description
-    if description:
-        patch_document.append({
-            "op": "add",
-            "path": "/fields/System.Description",
-            "value": description
-        })
-    
-    # Additional fields
-    if fields:
-        for field_path, field_value in fields.items():
-            patch_document.append({
-                "op": "add",
-                "path": f"/fields/{field_path}",
-                "value": field_value
-            })
-    
-    # Relations (parent, child, related)
-    if relations:
-        for relation in relations:
-            patch_document.append({
-                "op": "add",
-                "path": "/relations/-",
-                "value": relation
-            })
-    
+    patch_document = build_patch_document(title, description, fields, relations)
+
     try:
-        response = requests.patch(url, headers=get_headers(), json=patch_document)
-        response.raise_for_status()
-        return response.json()
+        return get_client().create_work_item(wi_type, patch_document)
     except Exception as e:
         print(f"Error creating work item '{title}': {e}")
-        if hasattr(e.response, 'text'):
+        if getattr(e, 'response', None) is not None:
             print(f"Response: {e.response.text}")
         return None
 
+def create_work_items_batch(items, batch_size=MAX_BATCH_SIZE, journal=None, pending=None):
+    """Create work items through the $batch endpoint.
+
+    items is an iterable of dicts with key, type, title, description, fields
+    and links ([(target_key, relation_type), ...]) ordered parents first; it
+    is consumed one batch at a time. An item's optional relations list holds
+    ready-made relation objects (e.g. hyperlinks) added as they are. Every item in a batch gets a temporary
+    negative ID, so links to items in the same batch resolve server-side.
+    With a journal, recorded items are skipped and new ones are recorded.
+    Links whose target was not created are added to pending (see
+    seed_engine.defer_unresolved); without a pending list they are reported.
+    Returns a dict mapping item keys to created IDs.
+    """
+    deferred = [] if pending is None else pending
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    created = journal.created if journal else {}
+    items = iter(journal.remaining(items) if journal else items)
+
+    while True:
+        chunk = list(islice(items, batch_size))
+        if not chunk:
+            break
+        temp_ids = {item["key"]: -(index + 1) for index, item in enumerate(chunk)}
+
+        batch = []
+        for item in chunk:
+            relations = list(item.get("relations", ()))
+            for target_key, relation_type in item.get("links", ()):
+                target_id = created.get(target_key) or temp_ids.get(target_key)
+                if target_id:
+                    relations.append(create_relation(target_id, relation_type))
+
+            patch_document = build_patch_document(
+                item["title"], item.get("description"), item.get("fields"), relations
+            )
+            patch_document.insert(0, {"op": "add", "path": "/id", "value": temp_ids[item["key"]]})
+            batch.append({
+                "method": "PATCH",
+                "uri": f"/{get_client().project}/_apis/wit/workitems/${item['type']}?api-version={API_VERSION}",
+                "headers": {"Content-Type": "application/json-patch+json"},
+                "body": patch_document
+            })
+
+        try:
+            results = get_client().batch(batch)
+        except Exception as e:
+            print(f"Error creating batch of {len(chunk)} work items: {e}")
+            if getattr(e, 'response', None) is not None:
+                print(f"Response: {e.response.text}")
+            continue
+
+        succeeded = []
+        for item, result in zip(chunk, results):
+            body = result.get("body")
+            if isinstance(body, str):
+                body = json.loads(body)
+            if result.get("code") == 200 and body:
+                if journal:
+                    journal.record(item["key"], body["id"])
+                else:
+                    created[item["key"]] = body["id"]
+                succeeded.append(item)
+            else:
+                print(f"Error creating work item '{item['title']}': HTTP {result.get('code')}")
+        for item in succeeded:
+            defer_unresolved(item, created, deferred, journal)
+
+    if pending is None:
+        report_unresolved(deferred)
+    return created
+
 def create_relation(target_id, relation_type="System.Links.Related"):
     """Create a relation object"""
     return {
         "rel": relation_type,
-        "url": f"{BASE_URL}/_apis/wit/workitems/{target_id}"
+        "url": get_client().work_item_url(target_id)
     }
 
 def create_parent_relation(target_id):
@@ -95,212 +180,503 @@ def create_child_relation(target_id):
     """Create a child relation"""
     return create_relation(target_id, "System.Links.Hierarchy-Reverse")
 
-def main():
-    print("🚀 Azure DevOps Demo Project Creator")
-    print(f"Organization: {ORGANIZATION}")
-    print(f"Project: {PROJECT}")
-    print(f"Team: {TEAM}")
-    print()
-    
-    created_items = {}
-    
-    # 1. Create Epic 1: Mobile App Development
-    print("📦 Creating Epic 1: Mobile App Development...")
-    epic1 = create_work_item(
-        "Epic",
-        "Mobile Application Development Platform",
-        "Complete mobile application development platform for Azure DevOps integration",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        }
+def split_links(items, pending):
+    """Yield items without links, collecting (key, links) pairs in pending"""
+    for item in items:
+        if item.get("links"):
+            pending.append((item["key"], item["links"]))
+            item = dict(item, links=[])
+        yield item
+
+def apply_deferred_links(pending, created, batch_size=MAX_BATCH_SIZE, workers=8, journal=None):
+    """Add collected relations after all items exist.
+
+    Each source item gets one PATCH with all of its /relations/- operations;
+    the PATCHes are packed into $batch calls of batch_size sent by workers
+    threads. Items already linked according to the journal are skipped.
+    Links whose target still does not exist stay pending in the journal.
+    Returns the number of items linked.
+    """
+    updates = []
+    for key, links in pending:
+        if key not in created or (journal and key in journal.linked):
+            continue
+        if journal and key in journal.pending:
+            links = journal.pending[key]  # what an earlier partial pass left
+        missing = [(target_key, relation_type) for target_key, relation_type in links if target_key not in created]
+        relations = [
+            create_relation(created[target_key], relation_type)
+            for target_key, relation_type in links
+            if target_key in created
+        ]
+        if relations:
+            updates.append((key, created[key], build_relations_patch(relations), missing))
+
+    def send(chunk):
+        batch = [
+            {
+                "method": "PATCH",
+                "uri": f"/_apis/wit/workitems/{item_id}?api-version={API_VERSION}",
+                "headers": {"Content-Type": "application/json-patch+json"},
+                "body": patch_document
+            }
+            for _, item_id, patch_document, _ in chunk
+        ]
+        try:
+            results = get_client().batch(batch)
+        except Exception as e:
+            print(f"Error linking batch of {len(chunk)} work items: {e}")
+            return 0
+        linked = 0
+        for (key, item_id, _, missing), result in zip(chunk, results):
+            if result.get("code") == 200:
+                linked += 1
+                if journal and missing:
+                    journal.record_pending(key, missing)
+                elif journal:
+                    journal.record_linked(key)
+            else:
+                print(f"Error linking work item {item_id}: HTTP {result.get('code')}")
+        return linked
+
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    chunks = [updates[start:start + batch_size] for start in range(0, len(updates), batch_size)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return sum(pool.map(send, chunks))
+
+PATH_FIELDS = ("System.AreaPath", "System.IterationPath")
+
+def default_fields(**extra):
+    """Area/iteration fields shared by all demo items"""
+    fields = {name: f"{PROJECT}\\{TEAM}" for name in PATH_FIELDS}
+    fields.update(extra)
+    return fields
+
+PARENT = "System.Links.Hierarchy-Forward"
+RELATED = "System.Links.Related"
+TESTED_BY = "Microsoft.VSTS.Common.TestedBy-Forward"
+
+DEMO_ITEMS = [
+    {
+        "key": "epic1", "type": "Epic",
+        "title": "Mobile Application Development Platform",
+        "description": "Complete mobile application development platform for Azure DevOps integration",
+        "fields": default_fields()
+    },
+    {
+        "key": "epic2", "type": "Epic",
+        "title": "CI/CD Pipeline Implementation",
+        "description": "Implement comprehensive CI/CD pipeline for automated builds and deployments",
+        "fields": default_fields()
+    },
+    {
+        "key": "feature1", "type": "Feature",
+        "title": "User Authentication & Authorization",
+        "description": "Implement secure user authentication with PAT and AD authentication support",
+        "fields": default_fields(),
+        "links": [("epic1", PARENT)]
+    },
+    {
+        "key": "feature2", "type": "Feature",
+        "title": "Work Item Management",
+        "description": "Complete work item management system with CRUD operations",
+        "fields": default_fields(),
+        "links": [("epic1", PARENT)]
+    },
+    {
+        "key": "feature3", "type": "Feature",
+        "title": "Build Automation Pipeline",
+        "description": "Automated build pipeline with Android and iOS support",
+        "fields": default_fields(),
+        "links": [("epic2", PARENT)]
+    },
+    {
+        "key": "pbi1", "type": "Product Backlog Item",
+        "title": "Login Screen Implementation",
+        "description": "Design and implement login screen with PAT and AD authentication options",
+        "fields": default_fields(**{
+            "Microsoft.VSTS.Common.Priority": "1",
+            "Microsoft.VSTS.Common.StoryPoints": "5"
+        }),
+        "links": [("feature1", PARENT)]
+    },
+    {
+        "key": "pbi2", "type": "Product Backlog Item",
+        "title": "Work Item List View",
+        "description": "Implement work item list view with filtering and sorting capabilities",
+        "fields": default_fields(**{
+            "Microsoft.VSTS.Common.Priority": "1",
+            "Microsoft.VSTS.Common.StoryPoints": "8"
+        }),
+        "links": [("feature2", PARENT)]
+    },
+    {
+        "key": "task1", "type": "Task",
+        "title": "Design Login UI",
+        "description": "Create UI mockups and design for login screen",
+        "fields": default_fields(**{"Microsoft.VSTS.Common.Activity": "Design"}),
+        "links": [("pbi1", PARENT)]
+    },
+    {
+        "key": "task2", "type": "Task",
+        "title": "Implement PAT Authentication",
+        "description": "Implement Personal Access Token authentication flow",
+        "fields": default_fields(**{"Microsoft.VSTS.Common.Activity": "Development"}),
+        "links": [("pbi1", PARENT)]
+    },
+    {
+        "key": "test1", "type": "Test Case",
+        "title": "Login Screen Test: Valid PAT",
+        "description": "Test login with valid Personal Access Token",
+        "fields": default_fields(),
+        "links": [("pbi1", TESTED_BY)]
+    },
+    {
+        "key": "bug1", "type": "Bug",
+        "title": "Login screen crashes on invalid token",
+        "description": "Application crashes when user enters invalid token format",
+        "fields": default_fields(**{
+            "Microsoft.VSTS.Common.Severity": "2 - High",
+            "Microsoft.VSTS.Common.Priority": "1"
+        }),
+        "links": [("pbi1", RELATED)]
+    },
+]
+
+def retarget_items(items, project, team):
+    """Yield items with the default area/iteration path moved to another project/team"""
+    default_path, target_path = f"{PROJECT}\\{TEAM}", f"{project}\\{team}"
+    for item in items:
+        fields = item.get("fields") or {}
+        if any(fields.get(name) == default_path for name in PATH_FIELDS):
+            fields = {
+                name: target_path if name in PATH_FIELDS and value == default_path else value
+                for name, value in fields.items()
+            }
+            item = dict(item, fields=fields)
+        yield item
+
+def seed_sequential(items, journal=None, pending=None):
+    """Create items one request at a time, linking each to already created targets"""
+    deferred = [] if pending is None else pending
+    created_items = journal.created if journal else {}
+    for item in (journal.remaining(items) if journal else items):
+        print(f"{TYPE_ICONS.get(item['type'], '•')} Creating {item['type']}: {item['title']}...")
+        relations = [
+            create_relation(created_items[target_key], relation_type)
+            for target_key, relation_type in item.get("links", ())
+            if target_key in created_items
+        ] + list(item.get("relations", ()))
+        work_item = create_work_item(
+            item["type"],
+            item["title"],
+            item.get("description"),
+            item.get("fields"),
+            relations or None
+        )
+        if work_item:
+            if journal:
+                journal.record(item["key"], work_item["id"])
+            else:
+                created_items[item["key"]] = work_item["id"]
+            defer_unresolved(item, created_items, deferred, journal)
+            print(f"   ✅ Created {item['type']}: {work_item['id']}")
+    if pending is None:
+        report_unresolved(deferred)
+    return created_items
+
+def seed_batched(items, batch_size, journal=None, pending=None):
+    """Create items through the $batch endpoint"""
+    print(f"📦 Creating work items in batches of {batch_size}...")
+    created_items = create_work_items_batch(items, batch_size, journal, pending)
+    print(f"   ✅ Created {len(created_items)} work items")
+    return created_items
+
+def seed_parallel(items, workers, window=PARALLEL_WINDOW, journal=None, pending=None):
+    """Create items concurrently; each child starts as soon as its parent exists.
+
+    items may be a stream: it is scheduled in windows of window items, and
+    links into earlier windows resolve from the IDs created so far.
+    """
+    print(f"⚡ Creating work items with {workers} workers...")
+    print_lock = threading.Lock()
+    deferred = [] if pending is None else pending
+
+    def create_item(item, links):
+        relations = [create_relation(target_id, relation_type) for target_id, relation_type in links]
+        relations += item.get("relations", ())
+        work_item = create_work_item(
+            item["type"],
+            item["title"],
+            item.get("description"),
+            item.get("fields"),
+            relations or None
+        )
+        if not work_item:
+            return None
+        if journal:
+            journal.record(item["key"], work_item["id"])
+        # targets finished before this item was submitted, so created_items is final for them
+        defer_unresolved(item, created_items, deferred, journal)
+        with print_lock:
+            print(f"   ✅ Created {item['type']}: {work_item['id']}")
+        return work_item["id"]
+
+    created_items = journal.created if journal else {}
+    items = iter(journal.remaining(items) if journal else items)
+    while True:
+        chunk = list(islice(items, window))
+        if not chunk:
+            break
+        levels = dependency_levels(chunk)
+        print(f"   {len(chunk)} items across {len(levels)} levels")
+        seed_concurrent(chunk, create_item, workers, created=created_items)
+    if pending is None:
+        report_unresolved(deferred)
+    return created_items
+
+def seed_async(items, concurrency=None, rate=None, burst=None, journal=None, pending=None):
+    """Create items on an asyncio event loop through the aiohttp client"""
+    from azure_devops_async import DEFAULT_CONCURRENCY, AsyncAzureDevOpsClient, seed_items
+
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    limit = f", {rate:g} requests/s" if rate else ""
+    print(f"⚡ Creating work items asynchronously, {concurrency} in flight{limit}...")
+
+    shared = get_client()
+
+    async def run():
+        async with AsyncAzureDevOpsClient(
+            shared.org_url, shared.project, shared.token, API_VERSION, concurrency=concurrency,
+            rate=rate, burst=burst, max_retries=shared.max_retries, hooks=shared.hooks
+        ) as client:
+            return await seed_items(client, items, journal, pending=pending)
+
+    created_items = asyncio.run(run())
+    print(f"   ✅ Created {len(created_items)} work items")
+    return created_items
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Azure DevOps Demo Project Creator")
+    parser.add_argument(
+        "--batch-size", type=int, default=0,
+        help=f"create items via $batch with this many items per call (max {MAX_BATCH_SIZE}, 0 = one request per item)"
     )
-    if epic1:
-        epic1_id = epic1["id"]
-        created_items["epic1"] = epic1_id
-        print(f"   ✅ Created Epic: {epic1_id}")
-    
-    # 2. Create Epic 2: CI/CD Pipeline
-    print("📦 Creating Epic 2: CI/CD Pipeline...")
-    epic2 = create_work_item(
-        "Epic",
-        "CI/CD Pipeline Implementation",
-        "Implement comprehensive CI/CD pipeline for automated builds and deployments",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        }
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="create items concurrently with this many workers (0 = sequential)"
     )
-    if epic2:
-        epic2_id = epic2["id"]
-        created_items["epic2"] = epic2_id
-        print(f"   ✅ Created Epic: {epic2_id}")
-    
-    # 3. Create Feature 1: User Authentication
-    print("🔧 Creating Feature 1: User Authentication...")
-    feature1 = create_work_item(
-        "Feature",
-        "User Authentication & Authorization",
-        "Implement secure user authentication with PAT and AD authentication support",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        },
-        [create_parent_relation(epic1_id)] if epic1 else None
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="create items with the asyncio/aiohttp client (--workers sets requests in flight)"
     )
-    if feature1:
-        feature1_id = feature1["id"]
-        created_items["feature1"] = feature1_id
-        print(f"   ✅ Created Feature: {feature1_id}")
-    
-    # 4. Create Feature 2: Work Item Management
-    print("🔧 Creating Feature 2: Work Item Management...")
-    feature2 = create_work_item(
-        "Feature",
-        "Work Item Management",
-        "Complete work item management system with CRUD operations",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        },
-        [create_parent_relation(epic1_id)] if epic1 else None
+    parser.add_argument(
+        "--rate", type=float, default=0,
+        help="token-bucket limit in requests/second per target (0 = unlimited)"
     )
-    if feature2:
-        feature2_id = feature2["id"]
-        created_items["feature2"] = feature2_id
-        print(f"   ✅ Created Feature: {feature2_id}")
-    
-    # 5. Create Feature 3: Build Automation
-    print("🔧 Creating Feature 3: Build Automation...")
-    feature3 = create_work_item(
-        "Feature",
-        "Build Automation Pipeline",
-        "Automated build pipeline with Android and iOS support",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        },
-        [create_parent_relation(epic2_id)] if epic2 else None
+    parser.add_argument(
+        "--burst", type=int, default=0,
+        help="token-bucket burst size (default: one second of --rate)"
     )
-    if feature3:
-        feature3_id = feature3["id"]
-        created_items["feature3"] = feature3_id
-        print(f"   ✅ Created Feature: {feature3_id}")
-    
-    # 6. Create PBI 1: Login Screen
-    print("📋 Creating PBI 1: Login Screen...")
-    pbi1 = create_work_item(
-        "Product Backlog Item",
-        "Login Screen Implementation",
-        "Design and implement login screen with PAT and AD authentication options",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}",
-            "Microsoft.VSTS.Common.Priority": "1",
-            "Microsoft.VSTS.Common.StoryPoints": "5"
-        },
-        [create_parent_relation(feature1_id)] if feature1 else None
+    parser.add_argument(
+        "--deferred-links", action="store_true",
+        help="create all items without links first, then add every relation in a batched second pass"
     )
-    if pbi1:
-        pbi1_id = pbi1["id"]
-        created_items["pbi1"] = pbi1_id
-        print(f"   ✅ Created PBI: {pbi1_id}")
-    
-    # 7. Create PBI 2: Work Item List
-    print("📋 Creating PBI 2: Work Item List...")
-    pbi2 = create_work_item(
-        "Product Backlog Item",
-        "Work Item List View",
-        "Implement work item list view with filtering and sorting capabilities",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}",
-            "Microsoft.VSTS.Common.Priority": "1",
-            "Microsoft.VSTS.Common.StoryPoints": "8"
-        },
-        [create_parent_relation(feature2_id)] if feature2 else None
+    parser.add_argument(
+        "--pool-size", type=int, default=0,
+        help=f"HTTP connection pool size (default: max({DEFAULT_POOL_SIZE}, workers))"
     )
-    if pbi2:
-        pbi2_id = pbi2["id"]
-        created_items["pbi2"] = pbi2_id
-        print(f"   ✅ Created PBI: {pbi2_id}")
-    
-    # 8. Create Tasks for PBI 1
-    print("📝 Creating Tasks for Login Screen...")
-    task1 = create_work_item(
-        "Task",
-        "Design Login UI",
-        "Create UI mockups and design for login screen",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}",
-            "Microsoft.VSTS.Common.Activity": "Design"
-        },
-        [create_parent_relation(pbi1_id)] if pbi1 else None
+    parser.add_argument(
+        "--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+        help="retries per request on 429/5xx and connection errors, honoring Retry-After"
     )
-    if task1:
-        created_items["task1"] = task1["id"]
-        print(f"   ✅ Created Task: {task1['id']}")
-    
-    task2 = create_work_item(
-        "Task",
-        "Implement PAT Authentication",
-        "Implement Personal Access Token authentication flow",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}",
-            "Microsoft.VSTS.Common.Activity": "Development"
-        },
-        [create_parent_relation(pbi1_id)] if pbi1 else None
+    parser.add_argument(
+        "--spec",
+        help="YAML/JSON seed spec to generate items from instead of the built-in demo items"
     )
-    if task2:
-        created_items["task2"] = task2["id"]
-        print(f"   ✅ Created Task: {task2['id']}")
-    
-    # 9. Create Test Case 1
-    print("🧪 Creating Test Case 1...")
-    test1 = create_work_item(
-        "Test Case",
-        "Login Screen Test: Valid PAT",
-        "Test login with valid Personal Access Token",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}"
-        },
-        [create_relation(pbi1_id, "Microsoft.VSTS.Common.TestedBy-Forward")] if pbi1 else None
+    parser.add_argument(
+        "--upload-workers", type=int, default=DEFAULT_UPLOAD_WORKERS,
+        help="concurrent attachment uploads for spec items with a payload"
     )
-    if test1:
-        created_items["test1"] = test1["id"]
-        print(f"   ✅ Created Test Case: {test1['id']}")
-    
-    # 10. Create Bug 1
-    print("🐛 Creating Bug 1...")
-    bug1 = create_work_item(
-        "Bug",
-        "Login screen crashes on invalid token",
-        "Application crashes when user enters invalid token format",
-        {
-            "System.AreaPath": f"{PROJECT}\\{TEAM}",
-            "System.IterationPath": f"{PROJECT}\\{TEAM}",
-            "Microsoft.VSTS.Common.Severity": "2 - High",
-            "Microsoft.VSTS.Common.Priority": "1"
-        },
-        [create_relation(pbi1_id)] if pbi1 else None
+    parser.add_argument(
+        "--journal",
+        help="JSON-lines checkpoint journal; items already recorded in it are skipped on rerun"
+    )
+    parser.add_argument(
+        "--idempotent", action="store_true",
+        help="tag items with a content hash and skip items whose hash already exists in the project"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true",
+        help="instrument every request and print a latency/time breakdown summary at the end"
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        help="write one JSON line per request (endpoint, status, bytes, phases, retries) to this file; implies --metrics"
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        help="write Prometheus text-format request metrics to this file at the end; implies --metrics"
+    )
+    parser.add_argument(
+        "--targets",
+        help="YAML/JSON list of org/project targets to seed concurrently (see seed_fanout.py)"
+    )
+    parser.add_argument(
+        "--target", action="append", default=[], metavar="ORG_URL/PROJECT",
+        help="additional target to seed concurrently; repeatable"
+    )
+    parser.add_argument(
+        "--parallel-targets", type=int, default=0,
+        help="targets seeded at the same time, one process each (default: all)"
+    )
+    parser.add_argument(
+        "--log-dir", default="seed_logs",
+        help="directory for per-target output logs when seeding several targets"
+    )
+    return parser.parse_args(argv)
+
+def spec_has_payloads(nodes):
+    """Whether any item node of a spec declares a payload"""
+    return any(node.get("payload") or spec_has_payloads(node.get("children", [])) for node in nodes)
+
+def run_seed(args, journal=None, project=PROJECT, team=TEAM):
+    """Seed the shared client's project according to parsed options; returns created items"""
+    context = {"project": project, "team": team}
+    spec = None
+    classification = {"areas": [{"name": team}], "iterations": [{"name": team}]}  # paths of default_fields()
+    if args.spec:
+        spec = load_spec(args.spec)
+        print(f"📄 Seed spec: {args.spec} (~{estimate_count(spec)} items)")
+        classification = spec.get("classification")
+
+    if classification:
+        print("🌳 Provisioning area/iteration paths...")
+        context["classification"] = provision_classification(
+            get_client(), classification, context, args.workers or 8
+        )
+
+    if spec:
+        items = generate_items(spec, context)
+    else:
+        items = DEMO_ITEMS
+        if (project, team) != (PROJECT, TEAM):
+            items = retarget_items(items, project, team)
+
+    if args.idempotent:
+        journal = journal or SeedJournal(None)
+        print("🔎 Indexing seeded items already in the project...")
+        existing = fetch_existing_hashes(get_client())
+        print(f"   {len(existing)} seeded items found, creating only missing ones")
+        items = skip_existing(items, existing, journal)
+
+    revisions = []
+    if spec and spec_has_payloads(spec.get("items", [])):
+        print(f"📎 Building large payloads, {args.upload_workers} uploads in flight...")
+        if journal:
+            items = journal.remaining(items)  # no uploads for items that already exist
+        items = build_payloads(items, get_client(), args.upload_workers, revisions, journal)
+
+    pending_links = []
+    if args.deferred_links:
+        items = split_links(items, pending_links)
+
+    if args.use_async:
+        created_items = seed_async(
+            items, args.workers or None, args.rate or None, args.burst or None, journal, pending_links
+        )
+    elif args.batch_size > 0:
+        created_items = seed_batched(items, args.batch_size, journal, pending_links)
+    elif args.workers > 0:
+        created_items = seed_parallel(items, args.workers, journal=journal, pending=pending_links)
+    else:
+        created_items = seed_sequential(items, journal, pending_links)
+
+    if journal and journal.pending:  # links left pending by an earlier run
+        queued = {key for key, _ in pending_links}
+        pending_links += [(key, links) for key, links in journal.pending.items() if key not in queued]
+    if pending_links:
+        print(f"🔗 Linking {len(pending_links)} work items...")
+        linked = apply_deferred_links(
+            pending_links, created_items, args.batch_size or MAX_BATCH_SIZE, args.workers or 8, journal
+        )
+        print(f"   ✅ Linked {linked} work items")
+        unresolved = sum(
+            1 for key, links in pending_links if key in created_items
+            for target_key, _ in links if target_key not in created_items
+        )
+        if unresolved:
+            resume = f"; rerun with --journal {journal.path} to add them" if journal and journal.path else ""
+            print(f"⚠️ {unresolved} links point at items that were not created{resume}")
+
+    if revisions or (journal and any(done < total for total, done in journal.revisions.values())):
+        print(f"📝 Adding revision history to {len(revisions or journal.revisions)} work items...")
+        added = add_revisions(
+            get_client(), revisions, created_items, args.batch_size or MAX_BATCH_SIZE, args.workers or 8, journal
+        )
+        print(f"   ✅ Added {added} revisions")
+    return created_items
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.spec:
+        try:
+            load_spec(args.spec)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"❌ Cannot read seed spec: {e}")
+            return 1
+    if args.targets or args.target:
+        from seed_fanout import seed_targets
+        return seed_targets(args)
+
+    metrics = None
+    if args.metrics or args.metrics_jsonl or args.metrics_prom:
+        metrics = RequestMetrics(args.metrics_jsonl, args.metrics_prom)
+    configure_client(
+        args.pool_size or max(DEFAULT_POOL_SIZE, args.workers), args.max_retries, [metrics] if metrics else None,
+        rate=args.rate or None, burst=args.burst or None
     )
-    if bug1:
-        created_items["bug1"] = bug1["id"]
-        print(f"   ✅ Created Bug: {bug1['id']}")
-    
+
+    print("🚀 Azure DevOps Demo Project Creator")
+    print(f"Organization: {ORGANIZATION}")
+    print(f"Project: {PROJECT}")
+    print(f"Team: {TEAM}")
+    print()
+
+    journal = None
+    if args.journal:
+        journal = SeedJournal(args.journal)
+        if journal.created:
+            print(f"⏭️  Resuming: {len(journal.created)} items already recorded in {args.journal}")
+
+    try:
+        created_items = run_seed(args, journal)
+    finally:
+        if journal:
+            journal.close()
+        if metrics:
+            metrics.close()
+
     print()
     print("✅ Demo project creation completed!")
     print(f"Created {len(created_items)} work items")
     print()
     print("📊 Created Work Items Summary:")
-    for key, item_id in created_items.items():
+    for key, item_id in islice(created_items.items(), SUMMARY_LIMIT):
         print(f"   {key}: {item_id}")
-    
+    if len(created_items) > SUMMARY_LIMIT:
+        print(f"   ... and {len(created_items) - SUMMARY_LIMIT} more")
+
+    if metrics:
+        metrics.print_summary()
+        if args.metrics_jsonl:
+            print(f"   Request log: {args.metrics_jsonl}")
+        if args.metrics_prom:
+            print(f"   Prometheus metrics: {args.metrics_prom}")
+
     print()
     print(f"🔗 View in Azure DevOps: {BASE_URL}/_workitems")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -5,35 +5,25 @@ Creates a comprehensive demo project with Epics, Features, PBIs, Tasks, Tests, a
 with proper relationships between work items.
 """
 
-import requests
-import base64
+import os
 import json
 from datetime import datetime, timedelta
 import sys
 
+from azure_devops_client import AzureDevOpsClient
+
 # Configuration
 ORGANIZATION = "hygieia-devops"
 PROJECT = "DevOps-Turkiye"
-BASE_URL = f"https://dev.azure.com/{ORGANIZATION}/{PROJECT}"
+ORG_URL = os.environ.get("AZURE_DEVOPS_ORG_URL", f"https://dev.azure.com/{ORGANIZATION}")
+BASE_URL = f"{ORG_URL}/{PROJECT}"
 API_VERSION = "7.0"
 TOKEN = "AI9TJm5RCCifo7r0YeyoMAHZuXxuUS6vAQxQyVpRsklnr5C9wSx0JQQJ99BLACAAAAAAAAAAAAASAZDO1YxI"
 
-def get_auth_header():
-    """Create Basic Auth header with PAT token"""
-    credentials = f":{TOKEN}"
-    encoded = base64.b64encode(credentials.encode()).decode()
-    return {"Authorization": f"Basic {encoded}"}
-
-def get_headers():
-    """Get request headers"""
-    headers = get_auth_header()
-    headers["Content-Type"] = "application/json-patch+json"
-    return headers
+client = AzureDevOpsClient(ORG_URL, PROJECT, TOKEN, API_VERSION)
 
 def create_work_item(wi_type, title, description, fields=None, relations=None):
     """Create a work item"""
-    url = f"{BASE_URL}/_apis/wit/workitems/${wi_type}?api-version={API_VERSION}"
-    
     patch_document = []
     
     # Title
@@ -70,9 +60,7 @@ def create_work_item(wi_type, title, description, fields=None, relations=None):
             })
     
     try:
-        response = requests.patch(url, headers=get_headers(), json=patch_document)
-        response.raise_for_status()
-        return response.json()
+        return client.create_work_item(wi_type, patch_document)
     except Exception as e:
         print(f"   ❌ Error: {e}")
         if hasattr(e, 'response') and hasattr(e.response, 'text'):
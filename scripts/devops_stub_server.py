@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Local Azure DevOps REST stand-in
+Serves the work item endpoints used by the seeding scripts from memory, so
+seeding can be benchmarked offline without touching a real organization.
+
+Covers work item create/update (PATCH .../workitems/$Type and /{id}), $batch,
+workitemsbatch, WIQL, attachment uploads (single or chunked with
+Content-Range; bodies are streamed and discarded) and area/iteration classification nodes (GET the tree, POST a
+child node). JSON-patch documents are validated like the real
+service does, IDs are assigned and relations stored in memory. Latency,
+429 throttling with Retry-After and random 5xx errors can be injected to
+exercise the seeders' concurrency, batching and retry paths offline. With
+--validate-paths, new work items must use provisioned area/iteration paths.
+GET /_stub/stats returns request, throttle and error counters.
+
+Usage:
+    python3 scripts/devops_stub_server.py --port 8080 --latency-ms 20
+    python3 scripts/devops_stub_server.py --throttle-rps 50 --retry-after 2 --error-rate 0.01
+    AZURE_DEVOPS_ORG_URL=http://127.0.0.1:8080/hygieia-devops python3 scripts/create_demo_project.py
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+WORK_ITEM_PATH = re.compile(r"^/(?P<project>[^/]+)/_apis/wit/workitems/\$(?P<type>[^/?]+)$")
+WORK_ITEM_ID_PATH = re.compile(r"^(?:/[^/]+)?/_apis/wit/workitems/(?P<id>\d+)$")
+WORK_ITEM_URL_ID = re.compile(r"/workitems/(-?\d+)$")
+PROJECT_PATH = re.compile(r"^/(?P<project>[^/]+)/_apis/wit/(?P<endpoint>wiql|workitemsbatch)$")
+CLASSIFICATION_PATH = re.compile(
+    r"^/(?P<project>[^/]+)/_apis/wit/classificationnodes/(?P<group>areas|iterations)(?:/(?P<path>.*))?$",
+    re.IGNORECASE
+)
+PATH_FIELDS = {"System.AreaPath": "areas", "System.IterationPath": "iterations"}
+ATTACHMENTS_PATH = re.compile(r"^(?:/[^/]+)?/_apis/wit/attachments$", re.IGNORECASE)
+ATTACHMENT_CHUNK_PATH = re.compile(r"^(?:/[^/]+)?/_apis/wit/attachments/(?P<id>[0-9a-f-]+)$", re.IGNORECASE)
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+READ_CHUNK = 64 * 1024
+WIQL_WHERE = re.compile(r"\bWHERE\b(?P<where>.*?)(?:\bORDER\s+BY\b.*)?$", re.IGNORECASE | re.DOTALL)
+WIQL_DESCENDING = re.compile(r"\bORDER\s+BY\s+\[System\.Id\]\s+DESC\b", re.IGNORECASE)
+WIQL_CONDITION = re.compile(
+    r"\[(?P<field>[\w.]+)\]\s*(?P<op>>=|<=|<>|=|>|<|\bCONTAINS\b)\s*(?P<value>'(?:[^']|'')*'|@\w+|-?\d+)",
+    re.IGNORECASE
+)
+
+MAX_BATCH_REQUESTS = 200
+WIQL_RESULT_CAP = 20000
+PATCH_OPERATIONS = {"add", "replace", "remove", "test", "copy", "move"}
+
+def validate_patch(patch_document, creating):
+    """Return an error message for an invalid work item JSON-patch document, else None"""
+    if not isinstance(patch_document, list) or not patch_document:
+        return "You must pass a valid patch document in the body of the request."
+    has_title = False
+    for operation in patch_document:
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPERATIONS:
+            return f"Invalid patch operation: {operation}"
+        path = operation.get("path")
+        if not isinstance(path, str) or not path.startswith("/"):
+            return f"Invalid patch path: {path}"
+        if operation["op"] in ("add", "replace", "test") and "value" not in operation:
+            return f"Patch operation on {path} is missing a value"
+        if path.startswith("/relations/"):
+            relation = operation.get("value") or {}
+            if operation["op"] == "add" and not (relation.get("rel") and relation.get("url")):
+                return "Relation must have rel and url"
+        if path == "/fields/System.Title" and str(operation.get("value") or "").strip():
+            has_title = True
+    if creating and not has_title:
+        return "TF401320: Rule Error for field Title. Error code: Required, InvalidEmpty."
+    return None
+
+class FaultInjector:
+    """Server-side token bucket throttling and random error injection"""
+
+    def __init__(self, throttle_rps=0, burst=None, retry_after=1, error_rate=0.0, seed=None):
+        self.rate = float(throttle_rps)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+
+    def check(self):
+        """Return (status, headers, payload) for an injected failure, or None to serve the request"""
+        with self.lock:
+            self.stats["requests"] += 1
+            if self.rate:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens < 1:
+                    self.stats["throttled"] += 1
+                    headers = {"Retry-After": str(self.retry_after), "X-RateLimit-Remaining": "0"}
+                    return 429, headers, {"message": "TF400733: The request has been throttled."}
+                self.tokens -= 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return 503, {}, {"message": "Injected service unavailable"}
+        return None
+
+class WorkItemStore:
+    """Thread-safe in-memory work item storage"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = {}
+        self.next_id = 1
+        self.nodes = {}  # (project, group) -> classification root node
+        self.next_node_id = 1
+        self.attachments = {}  # id -> {"fileName", "size"}
+
+    def create(self, project, wi_type, patch_document, temp_ids=None):
+        """Apply a JSON-patch document as a new work item and return it"""
+        now = datetime.now(timezone.utc).isoformat()
+        fields = {
+            "System.TeamProject": project,
+            "System.WorkItemType": wi_type,
+            "System.CreatedDate": now,
+            "System.ChangedDate": now,
+        }
+        relations = []
+        temp_id = None
+        for operation in patch_document:
+            path = operation.get("path", "")
+            if path == "/id":
+                temp_id = operation["value"]
+            elif path.startswith("/fields/"):
+                fields[path[len("/fields/"):]] = operation.get("value")
+            elif path == "/relations/-":
+                relations.append(dict(operation["value"]))
+
+        with self.lock:
+            item_id = self.next_id
+            self.next_id += 1
+            if temp_id is not None and temp_ids is not None:
+                temp_ids[temp_id] = item_id
+            for relation in relations:
+                match = WORK_ITEM_URL_ID.search(relation.get("url", ""))
+                if match and int(match.group(1)) < 0 and temp_ids:
+                    real_id = temp_ids.get(int(match.group(1)))
+                    if real_id:
+                        relation["url"] = relation["url"][:match.start(1)] + str(real_id)
+            fields["System.Id"] = item_id
+            item = {"id": item_id, "rev": 1, "fields": fields, "relations": relations}
+            self.items[item_id] = item
+        return item
+
+    def update(self, item_id, patch_document):
+        """Apply a JSON-patch document to an existing work item; None when it does not exist"""
+        with self.lock:
+            item = self.items.get(item_id)
+            if item is None:
+                return None
+            for operation in patch_document:
+                path = operation.get("path", "")
+                if path.startswith("/fields/"):
+                    if operation.get("op") == "remove":
+                        item["fields"].pop(path[len("/fields/"):], None)
+                    else:
+                        item["fields"][path[len("/fields/"):]] = operation.get("value")
+                elif path == "/relations/-":
+                    item["relations"].append(dict(operation["value"]))
+            item["rev"] += 1
+            item["fields"]["System.ChangedDate"] = datetime.now(timezone.utc).isoformat()
+            return item
+
+    def query(self, project, wiql):
+        """Evaluate the AND-joined conditions of a WIQL query; returns matching IDs ordered by ID"""
+        match = WIQL_WHERE.search(wiql)
+        conditions = WIQL_CONDITION.findall(match.group("where")) if match else []
+        with self.lock:
+            items = sorted(self.items.values(), key=lambda item: item["id"], reverse=bool(WIQL_DESCENDING.search(wiql)))
+        ids = [
+            item["id"] for item in items
+            if all(self.matches(item["fields"], field, op.upper(), value, project) for field, op, value in conditions)
+        ]
+        return ids
+
+    @staticmethod
+    def matches(fields, field, op, literal, project):
+        """Evaluate one WIQL condition against an item's fields"""
+        if literal == "@project":
+            expected = project
+        elif literal.startswith("'"):
+            expected = literal[1:-1].replace("''", "'")
+        else:
+            expected = int(literal)
+        actual = fields.get(field)
+        if op == "CONTAINS":
+            if field == "System.Tags":
+                return expected.lower() in [tag.strip().lower() for tag in (actual or "").split(";")]
+            return expected.lower() in str(actual or "").lower()
+        if actual is None:
+            return op == "<>"
+        if isinstance(expected, int):
+            actual = int(actual)
+        return {
+            "=": actual == expected, "<>": actual != expected,
+            ">": actual > expected, "<": actual < expected,
+            ">=": actual >= expected, "<=": actual <= expected,
+        }[op]
+
+    def get(self, ids, fields=None, expand=None):
+        """Return stored items for ids, limited to fields when given; relations only when expanded"""
+        with self.lock:
+            found = [self.items[item_id] for item_id in ids if item_id in self.items]
+        if not fields:
+            if (expand or "").lower() in ("relations", "all"):
+                return found
+            return [{name: value for name, value in item.items() if name != "relations"} for item in found]
+        return [
+            {"id": item["id"], "rev": item["rev"], "fields": {name: item["fields"][name] for name in fields if name in item["fields"]}}
+            for item in found
+        ]
+
+    def classification_root(self, project, group):
+        """Root area/iteration node of a project; callers hold the lock"""
+        key = (project.lower(), group)
+        if key not in self.nodes:
+            self.nodes[key] = {
+                "id": self.next_node_id,
+                "name": project,
+                "structureType": "area" if group == "areas" else "iteration",
+                "path": f"\\{project}\\{'Area' if group == 'areas' else 'Iteration'}",
+                "children": [],
+            }
+            self.next_node_id += 1
+        return self.nodes[key]
+
+    def find_node(self, project, group, path):
+        """Node at a backslash-separated path below the root; callers hold the lock"""
+        node = self.classification_root(project, group)
+        for name in filter(None, path.split("\\")):
+            node = next((child for child in node["children"] if child["name"].lower() == name.lower()), None)
+            if node is None:
+                return None
+        return node
+
+    @classmethod
+    def node_json(cls, node, depth):
+        """API representation of a node with depth levels of children"""
+        result = {name: value for name, value in node.items() if name != "children"}
+        result["hasChildren"] = bool(node["children"])
+        if depth > 0 and node["children"]:
+            result["children"] = [cls.node_json(child, depth - 1) for child in node["children"]]
+        return result
+
+    def classification_tree(self, project, group, path, depth):
+        """Node at path with depth levels of children; None when it does not exist"""
+        with self.lock:
+            node = self.find_node(project, group, path)
+            return None if node is None else self.node_json(node, depth)
+
+    def add_classification_node(self, project, group, parent_path, name, attributes=None):
+        """Create a child node; returns (status, payload)"""
+        if not name or "\\" in name:
+            return 400, {"message": "VS402366: The classification node name is invalid."}
+        with self.lock:
+            parent = self.find_node(project, group, parent_path)
+            if parent is None:
+                return 404, {"message": f"VS402485: The node {parent_path} does not exist."}
+            if any(child["name"].lower() == name.lower() for child in parent["children"]):
+                return 409, {"message": f"VS402371: Classification node name {name} is already in use."}
+            node = {
+                "id": self.next_node_id,
+                "name": name,
+                "structureType": parent["structureType"],
+                "path": f"{parent['path']}\\{name}",
+                "children": [],
+            }
+            if attributes:
+                node["attributes"] = attributes
+            self.next_node_id += 1
+            parent["children"].append(node)
+            return 201, self.node_json(node, 0)
+
+    def add_attachment(self, file_name, size, chunked=False):
+        """Record an uploaded attachment, or start a chunked one, and return its ID"""
+        attachment_id = str(uuid.uuid4())
+        with self.lock:
+            self.attachments[attachment_id] = {"fileName": file_name, "size": size, "chunked": chunked, "total": None}
+        return attachment_id
+
+    def add_attachment_chunk(self, attachment_id, start, end, total, size):
+        """Append a received chunk; returns an error message or None"""
+        with self.lock:
+            attachment = self.attachments.get(attachment_id)
+            if attachment is None or not attachment["chunked"]:
+                return f"Chunked attachment upload {attachment_id} does not exist"
+            if start != attachment["size"] or end - start + 1 != size:
+                return f"Chunk bytes {start}-{end} does not continue the upload at byte {attachment['size']}"
+            if attachment["total"] not in (None, total):
+                return "Content-Range total does not match earlier chunks"
+            attachment["size"] += size
+            attachment["total"] = total
+        return None
+
+    def invalid_path(self, project, patch_document):
+        """Error message for an area/iteration path that is not provisioned, else None"""
+        for operation in patch_document:
+            field = operation.get("path", "")[len("/fields/"):]
+            if field not in PATH_FIELDS:
+                continue
+            value = str(operation.get("value") or "")
+            root, _, path = value.partition("\\")
+            with self.lock:
+                exists = root.lower() == project.lower() and self.find_node(project, PATH_FIELDS[field], path)
+            if not exists:
+                return f"TF401347: Invalid tree name given for work item -1, field '{field}'."
+        return None
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes the Azure DevOps work item endpoints to the store"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # keep-alive responses would otherwise stall on delayed ACKs
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def split_path(self):
+        """Return (organization, path inside the organization)"""
+        path = urlsplit(self.path).path
+        organization, _, rest = path.lstrip("/").partition("/")
+        return organization, "/" + rest
+
+    def drain_body(self):
+        """Read and discard a (possibly chunked) request body; returns its size"""
+        size = 0
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                length = int(self.rfile.readline().split(b";")[0], 16)
+                if not length:
+                    self.rfile.readline()
+                    return size
+                size += len(self.rfile.read(length))
+                self.rfile.readline()
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK, remaining))
+            if not chunk:
+                break
+            size += len(chunk)
+            remaining -= len(chunk)
+        return size
+
+    def begin(self, read_body=True):
+        """Read the JSON body and apply latency/fault injection; returns (body, True) to continue"""
+        body = None
+        try:
+            if read_body:
+                body = self.read_json()
+        except ValueError:
+            self.send_json(400, {"message": "Request body is not valid JSON"})
+            return None, False
+        latency = self.server.latency
+        if self.server.jitter:
+            latency += random.uniform(0, self.server.jitter)
+        time.sleep(latency)
+        fault = self.server.faults.check()
+        if fault:
+            status, headers, payload = fault
+            self.send_json(status, payload, headers)
+            return None, False
+        return body, True
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/_stub/stats":
+            with self.server.faults.lock:
+                stats = dict(self.server.faults.stats)
+            stats["work_items"] = len(self.server.store.items)
+            stats["attachments"] = len(self.server.store.attachments)
+            stats["attachment_bytes"] = sum(entry["size"] for entry in list(self.server.store.attachments.values()))
+            self.send_json(200, stats)
+            return
+        _, path = self.split_path()
+        match = CLASSIFICATION_PATH.match(path)
+        if not match:
+            self.send_json(404, {"message": f"Unknown endpoint: {self.path}"})
+            return
+        _, ok = self.begin()
+        if not ok:
+            return
+        depth = int(parse_qs(urlsplit(self.path).query).get("$depth", ["0"])[0])
+        node = self.server.store.classification_tree(
+            unquote(match.group("project")), match.group("group").lower(),
+            unquote(match.group("path") or "").replace("/", "\\"), depth
+        )
+        if node is None:
+            self.send_json(404, {"message": f"VS402485: The node {match.group('path')} does not exist."})
+        else:
+            self.send_json(200, node)
+
+    def do_PATCH(self):
+        body, ok = self.begin()
+        if not ok:
+            return
+        _, path = self.split_path()
+        status, payload = self.apply_patch(path, body)
+        self.send_json(status, payload)
+
+    def apply_patch(self, path, patch_document, temp_ids=None):
+        """Create (PATCH .../workitems/$Type) or update (PATCH .../workitems/{id}) a work item"""
+        create = WORK_ITEM_PATH.match(path)
+        update = WORK_ITEM_ID_PATH.match(path)
+        if not create and not update:
+            return 404, {"message": f"Unknown endpoint: {path}"}
+        error = validate_patch(patch_document, creating=bool(create))
+        if error:
+            return 400, {"message": error, "typeKey": "RuleValidationException"}
+        if create and self.server.validate_paths:
+            error = self.server.store.invalid_path(unquote(create.group("project")), patch_document)
+            if error:
+                return 400, {"message": error, "typeKey": "WorkItemFieldInvalidTreeNameException"}
+        if create:
+            item = self.server.store.create(
+                unquote(create.group("project")), unquote(create.group("type")), patch_document, temp_ids
+            )
+            return 200, item
+        item = self.server.store.update(int(update.group("id")), patch_document)
+        if item is None:
+            return 404, {"message": f"TF401232: Work item {update.group('id')} does not exist"}
+        return 200, item
+
+    def do_POST(self):
+        organization, path = self.split_path()
+        if ATTACHMENTS_PATH.match(path):
+            self.handle_attachment(organization)
+            return
+        body, ok = self.begin()
+        if not ok:
+            return
+        match = PROJECT_PATH.match(path)
+        classification = CLASSIFICATION_PATH.match(path)
+        if path == "/_apis/wit/$batch":
+            self.handle_batch(body)
+        elif classification:
+            status, payload = self.server.store.add_classification_node(
+                unquote(classification.group("project")), classification.group("group").lower(),
+                unquote(classification.group("path") or "").replace("/", "\\"),
+                (body or {}).get("name"), (body or {}).get("attributes")
+            )
+            self.send_json(status, payload)
+        elif match and match.group("endpoint") == "wiql":
+            self.handle_wiql(unquote(match.group("project")), body)
+        elif match:
+            self.handle_work_items_batch(body)
+        else:
+            self.send_json(404, {"message": f"Unknown endpoint: {path}"})
+
+    def attachment_reference(self, organization, attachment_id):
+        url = f"http://{self.headers.get('Host')}/{organization}/_apis/wit/attachments/{attachment_id}"
+        return {"id": attachment_id, "url": url}
+
+    def handle_attachment(self, organization):
+        size = self.drain_body()
+        _, ok = self.begin(read_body=False)
+        if not ok:
+            return
+        query = parse_qs(urlsplit(self.path).query)
+        chunked = query.get("uploadType", [""])[0].lower() == "chunked"
+        attachment_id = self.server.store.add_attachment(
+            query.get("fileName", ["attachment"])[0], size, chunked
+        )
+        self.send_json(201, self.attachment_reference(organization, attachment_id))
+
+    def do_PUT(self):
+        organization, path = self.split_path()
+        match = ATTACHMENT_CHUNK_PATH.match(path)
+        if not match:
+            self.drain_body()
+            self.send_json(404, {"message": f"Unknown endpoint: {path}"})
+            return
+        size = self.drain_body()
+        _, ok = self.begin(read_body=False)
+        if not ok:
+            return
+        content_range = CONTENT_RANGE.match(self.headers.get("Content-Range", ""))
+        if not content_range:
+            self.send_json(400, {"message": "A chunk needs a Content-Range header: bytes start-end/total"})
+            return
+        start, end, total = map(int, content_range.groups())
+        error = self.server.store.add_attachment_chunk(match.group("id"), start, end, total, size)
+        if error:
+            self.send_json(400, {"message": error})
+            return
+        self.send_json(201, self.attachment_reference(organization, match.group("id")))
+
+    def handle_batch(self, body):
+        if not isinstance(body, list) or len(body) > MAX_BATCH_REQUESTS:
+            self.send_json(400, {"message": f"A batch must be a list of at most {MAX_BATCH_REQUESTS} requests"})
+            return
+        temp_ids = {}
+        results = []
+        for request in body:
+            time.sleep(self.server.item_latency)
+            if request.get("method") != "PATCH":
+                results.append({"code": 400, "headers": {}, "body": json.dumps({"message": "Unsupported batch request"})})
+                continue
+            status, payload = self.apply_patch(urlsplit(request.get("uri", "")).path, request.get("body"), temp_ids)
+            results.append({"code": status, "headers": {"Content-Type": "application/json"}, "body": json.dumps(payload)})
+        self.send_json(200, {"count": len(results), "value": results})
+
+    def handle_wiql(self, project, body):
+        top = parse_qs(urlsplit(self.path).query).get("$top")
+        limit = min(int(top[0]), WIQL_RESULT_CAP) if top else WIQL_RESULT_CAP
+        ids = self.server.store.query(project, (body or {}).get("query", ""))
+        if len(ids) > limit and not top:
+            self.send_json(400, {"message": f"VS402337: The number of work items returned exceeds the size limit of {WIQL_RESULT_CAP}."})
+            return
+        self.send_json(200, {"queryType": "flat", "workItems": [{"id": item_id} for item_id in ids[:limit]]})
+
+    def handle_work_items_batch(self, body):
+        body = body or {}
+        if len(body.get("ids", [])) > MAX_BATCH_REQUESTS:
+            self.send_json(400, {"message": f"At most {MAX_BATCH_REQUESTS} IDs can be requested at once"})
+            return
+        if body.get("fields") and body.get("$expand"):
+            self.send_json(400, {"message": "The expand parameter can not be used with the fields parameter."})
+            return
+        items = self.server.store.get(body.get("ids", []), body.get("fields"), body.get("$expand"))
+        self.send_json(200, {"count": len(items), "value": items})
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients dropping keep-alive connections"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def start_server(host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, item_latency_ms=0,
+                 throttle_rps=0, burst=None, retry_after=1, error_rate=0.0, seed=None, validate_paths=False):
+    """Start the stand-in on a background thread and return the server"""
+    server = StubServer((host, port), StubHandler)
+    server.store = WorkItemStore()
+    server.latency = latency_ms / 1000.0
+    server.jitter = jitter_ms / 1000.0
+    server.item_latency = item_latency_ms / 1000.0
+    server.validate_paths = validate_paths
+    server.faults = FaultInjector(throttle_rps, burst, retry_after, error_rate, seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Azure DevOps REST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra delay up to this value")
+    parser.add_argument("--item-latency-ms", type=float, default=0, help="delay per sub-request inside $batch")
+    parser.add_argument("--throttle-rps", type=float, default=0, help="answer 429 above this request rate (0 = off)")
+    parser.add_argument("--burst", type=int, default=0, help="requests allowed in a burst before throttling")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible error injection")
+    parser.add_argument("--validate-paths", action="store_true",
+                        help="reject new work items whose area/iteration path was not provisioned")
+    args = parser.parse_args()
+
+    server = start_server(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.item_latency_ms,
+        args.throttle_rps, args.burst or None, args.retry_after, args.error_rate, args.seed, args.validate_paths
+    )
+    print(f"🧪 Azure DevOps stand-in listening on http://{args.host}:{server.server_port}/<organization>")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
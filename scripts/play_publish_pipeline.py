@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Çoklu uygulama / flavor için paralel Google Play yayın hattı
+Manifest'teki her (paket, AAB, track'ler, release notları) kaydını
+upload_to_play_store.publish_to_tracks ile yayınlar. Aynı paketin kayıtları
+sırayla işlenir (edit insert → upload → tracks.update → commit birbirine
+karışmaz), farklı paketler --parallel kadar eş zamanlı yüklenir. Tüm
+yüklemeler --bandwidth-mbps ile verilen ortak bant genişliği sınırını
+paylaşır. Çıktı satırlarının başına paket adı eklenir; sonunda tek bir
+sonuç tablosu yazdırılır.
+
+Kullanım:
+    python3 scripts/play_publish_pipeline.py --manifest flavors.yaml --parallel 4 --bandwidth-mbps 200
+
+Manifest (YAML veya JSON):
+    defaults:
+      tracks: [alpha, closed]
+      release_notes: {tr-TR: "Hata düzeltmeleri", en-US: "Bug fixes"}
+    apps:
+      - package: com.higgscloud.azuredevops
+        artifact: build/app/outputs/bundle/prodRelease/app-prod-release.aab
+      - package: com.higgscloud.azuredevops.acme
+        artifact: build/app/outputs/bundle/acmeRelease/app-acme-release.aab
+        tracks: [internal]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import upload_to_play_store
+from rate_limit import TokenBucket
+from seed_spec import load_spec
+
+DEFAULT_PARALLEL = 4
+
+def prefixed_printer(prefix, lock):
+    """Yayın işi başına print yerine geçen fonksiyon; satırların başına paket adını ekler"""
+    def log(*values, sep=" ", end="\n"):
+        lines = sep.join(str(value) for value in values).split("\n")
+        with lock:
+            for line in lines:
+                print(f"[{prefix}] {line}", end=end, flush=True)
+    return log
+
+def load_manifest(path):
+    """Manifest'i okur; defaults her kayda uygulanır"""
+    manifest = load_spec(path)
+    if isinstance(manifest, list):
+        manifest = {"apps": manifest}
+    defaults = manifest.get("defaults") or {}
+    entries = []
+    for number, app in enumerate(manifest.get("apps") or [], 1):
+        entry = dict(defaults, **app)
+        if not entry.get("package") or not entry.get("artifact"):
+            raise ValueError(f"{number}. kayıtta package veya artifact eksik")
+        entry["tracks"] = list(entry.get("tracks") or upload_to_play_store.TRACKS)
+        entries.append(entry)
+    return entries
+
+def group_by_package(entries):
+    """Kayıtları pakete göre gruplar; büyük gruplar önce (en uzun iş erken başlar)"""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry["package"], []).append(entry)
+
+    def size(group):
+        return sum(os.path.getsize(entry["artifact"]) for entry in group if os.path.exists(entry["artifact"]))
+    return sorted(groups.items(), key=lambda item: -size(item[1]))
+
+def publish_package(package, entries, service_factory, chunk_size, restart=False, bandwidth=None, log=print):
+    """Bir paketin kayıtlarını kendi servis nesnesiyle sırayla yayınlar; kayıt başına sonuç döner"""
+    try:
+        # httplib2 thread-safe değildir; her paket kendi servisini kullanır
+        service = service_factory()
+    except Exception as e:
+        log(f"❌ Service oluşturulamadı: {e}")
+        return [dict(entry, error=f"service oluşturulamadı: {e}", seconds=0.0, size=0) for entry in entries]
+    results = []
+    for entry in entries:
+        details = {}
+        started = time.monotonic()
+        track_errors = upload_to_play_store.publish_to_tracks(
+            service, package, entry["artifact"], entry["tracks"], chunk_size, restart,
+            entry.get("release_notes"), bandwidth, details, log=log
+        )
+        failed = {track: error for track, error in track_errors.items() if error}
+        results.append(dict(
+            entry,
+            version_code=details.get("version_code"),
+            size=os.path.getsize(entry["artifact"]) if os.path.exists(entry["artifact"]) else 0,
+            seconds=time.monotonic() - started,
+            error="; ".join(f"{track}: {error}" for track, error in failed.items()) or None,
+        ))
+    return results
+
+def publish_all(entries, service_factory, parallel=DEFAULT_PARALLEL, chunk_size=upload_to_play_store.UPLOAD_CHUNK_SIZE,
+                restart=False, bandwidth_mbps=0):
+    """Tüm kayıtları yayınlar; paketler paralel, paket içi sıralı. Manifest sırasıyla sonuç listesi döner"""
+    bandwidth = TokenBucket(bandwidth_mbps * 1e6 / 8, chunk_size) if bandwidth_mbps else None
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        futures = [
+            (group, pool.submit(publish_package, package, group, service_factory, chunk_size, restart,
+                                bandwidth, prefixed_printer(package, lock)))
+            for package, group in group_by_package(entries)
+        ]
+        results = {id(entry): result for group, future in futures for entry, result in zip(group, future.result())}
+    return [results[id(entry)] for entry in entries]
+
+def print_summary(results, elapsed):
+    """Tüm kayıtların sonuç tablosu"""
+    print()
+    print("📊 Yayın özeti")
+    print(f"   {'Paket':<40} {'Track':<16} {'Version':>8} {'MB':>8} {'Süre':>8} {'MB/s':>7}")
+    total = 0
+    for result in results:
+        tracks = ",".join(result["tracks"])
+        if result["error"]:
+            print(f"   ❌ {result['package']:<37} {tracks:<16} {result['error']}")
+            continue
+        total += result["size"]
+        print(f"   ✅ {result['package']:<37} {tracks:<16} {result['version_code'] or '-':>8} "
+              f"{result['size'] / 1e6:8.1f} {result['seconds']:7.1f}s {result['size'] / 1e6 / max(result['seconds'], 1e-9):7.1f}")
+    succeeded = sum(1 for result in results if not result["error"])
+    print(f"   Toplam: {succeeded}/{len(results)} artifact yayınlandı, {total / 1e6:.1f} MB "
+          f"{elapsed:.1f}s içinde ({total / 1e6 / max(elapsed, 1e-9):.1f} MB/s)")
+
+def parse_args(argv=None):
+    """Komut satırı seçenekleri"""
+    parser = argparse.ArgumentParser(description="Manifest'teki AAB'leri Google Play'e paralel yayınlar")
+    parser.add_argument("--manifest", required=True, help="paket/artifact/track/release notu listesi (YAML veya JSON)")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL, help="aynı anda yayınlanan paket sayısı")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0,
+                        help="tüm yüklemeler için toplam bant genişliği sınırı (Mbit/s, 0 = sınırsız)")
+    parser.add_argument(
+        "--chunk-size-mb", type=float, default=upload_to_play_store.UPLOAD_CHUNK_SIZE / (1024 * 1024),
+        help="yükleme parça boyutu (MB, 256 KB'ın katına yuvarlanır)"
+    )
+    parser.add_argument("--restart", action="store_true", help="yarım kalan yüklemeleri yok sayıp baştan başla")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    args = parse_args(argv)
+    chunk_size = max(1, round(args.chunk_size_mb * 4)) * 256 * 1024
+    try:
+        entries = load_manifest(args.manifest)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ Manifest okunamadı: {e}")
+        return 1
+    if not os.path.exists(upload_to_play_store.SERVICE_ACCOUNT_FILE) and not upload_to_play_store.DISCOVERY_URL:
+        print(f"❌ Service account key dosyası bulunamadı: {upload_to_play_store.SERVICE_ACCOUNT_FILE}")
+        return 1
+
+    packages = len({entry["package"] for entry in entries})
+    limit = f", toplam {args.bandwidth_mbps:g} Mbit/s" if args.bandwidth_mbps else ""
+    print(f"🚀 {len(entries)} artifact ({packages} paket) yayınlanıyor, {args.parallel} paralel{limit}...")
+    print("=" * 60)
+    started = time.monotonic()
+    results = publish_all(
+        entries, upload_to_play_store.get_service, args.parallel, chunk_size, args.restart, args.bandwidth_mbps
+    )
+    print_summary(results, time.monotonic() - started)
+    return 0 if all(not result["error"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
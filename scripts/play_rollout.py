@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Google Play kademeli yayılım (staged rollout) kontrolcüsü
+Bir release'i yapılandırılabilir yüzdelerle (varsayılan %1 → %5 → %20 →
+%100) belirli aralıklarla ilerletir. Her adımdan önce bir sağlık sinyali
+kontrol edilir; sinyal kötüyse yayılım otomatik olarak durdurulur (halt) veya
+geri alınır (rollback: release durdurulur ve önceki tamamlanmış release
+track'te korunur). Rollback yeni sürümü cihazlardan kaldırmaz: yeni Version
+Code'u almış kullanıcılar onu kullanmaya devam eder; yalnızca henüz
+güncellemeyenlere önceki release sunulur. Gerçek geri dönüş için daha yüksek
+Version Code ile düzeltilmiş bir release yayınlanmalıdır. Durum bir JSON dosyasında tutulur; script her çalıştırmada
+(cron/CI) veya --watch ile sürekli çalışarak kaldığı yerden devam eder, AAB
+tekrar yüklenmez.
+
+Sağlık sinyali kaynakları (--health):
+    crash.json                   {"crash_rate": 0.4, "anr_rate": 0.1} veya {"healthy": true}
+    https://ci.example/health    aynı formatta JSON dönen webhook
+    python:modul:fonksiyon       fonksiyon(state) aynı formatta sözlük döner
+Oranlar yüzde olarak --max-crash-rate / --max-anr-rate ile karşılaştırılır.
+Sinyal okunamazsa yayılım ilerlemez, bir sonraki kontrolde tekrar denenir.
+
+Kullanım:
+    python3 scripts/play_rollout.py start --aab app-release.aab --stages 1,5,20,100 --interval 24h --health crash.json
+    python3 scripts/play_rollout.py step            # cron/CI: gerekiyorsa bir sonraki yüzdeye geçer
+    python3 scripts/play_rollout.py watch --poll 15m
+    python3 scripts/play_rollout.py status | halt | resume
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+import urllib.request
+
+import upload_to_play_store
+from googleapiclient.errors import HttpError
+
+DEFAULT_TRACK = "production"
+DEFAULT_STAGES = [1, 5, 20, 100]
+DEFAULT_INTERVAL = "24h"
+DEFAULT_POLL = "15m"
+MAX_CRASH_RATE = 1.0   # yüzde
+MAX_ANR_RATE = 0.47    # yüzde (Play "bad behavior" eşiği)
+HEALTH_TIMEOUT = 10    # saniye
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_duration(text):
+    """'90s', '30m', '24h', '2d' veya saniye → saniye"""
+    text = str(text).strip().lower()
+    if text and text[-1] in DURATION_UNITS:
+        return float(text[:-1]) * DURATION_UNITS[text[-1]]
+    return float(text)
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+def state_path(package_name, track):
+    return f"rollout-{package_name}-{track}.json"
+
+def load_state(path):
+    try:
+        with open(path) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return None
+
+def read_health(source, state):
+    """Sağlık kaynağından sözlük okur; okunamazsa None"""
+    try:
+        if source.startswith("python:"):
+            module_name, _, function = source[len("python:"):].rpartition(":")
+            return getattr(importlib.import_module(module_name), function)(state)
+        if source.startswith(("http://", "https://")):
+            with urllib.request.urlopen(source, timeout=HEALTH_TIMEOUT) as response:
+                return json.load(response)
+        with open(source) as health_file:
+            return json.load(health_file)
+    except Exception as e:
+        print(f"⚠️ Sağlık sinyali okunamadı ({source}): {e}")
+        return None
+
+def check_health(state):
+    """('healthy' | 'unhealthy' | 'unknown', açıklama) döner"""
+    source = state.get("health")
+    if not source:
+        return "healthy", "sağlık kontrolü yok"
+    signal = read_health(source, state)
+    if not isinstance(signal, dict):
+        return "unknown", "sinyal yok"
+    if "healthy" in signal:
+        return ("healthy" if signal["healthy"] else "unhealthy"), signal.get("reason", f"healthy={signal['healthy']}")
+    problems, checked = [], []
+    for key, limit in (("crash_rate", state["max_crash_rate"]), ("anr_rate", state["max_anr_rate"])):
+        if signal.get(key) is None:
+            continue
+        checked.append(f"{key} %{signal[key]}")
+        if float(signal[key]) > limit:
+            problems.append(f"{key} %{signal[key]} > %{limit}")
+    if not checked:
+        return "unknown", "sinyalde crash_rate/anr_rate yok"
+    return ("unhealthy", ", ".join(problems)) if problems else ("healthy", ", ".join(checked))
+
+def stage_fields(percent):
+    """Yüzdeye göre release status/userFraction alanları"""
+    if percent >= 100:
+        return {"status": "completed"}
+    return {"status": "inProgress", "userFraction": round(percent / 100.0, 4)}
+
+def read_track_releases(service, package_name, track):
+    """Track'teki release'leri geçici bir edit ile okur (edit commit edilmez)"""
+    edit_id = service.edits().insert(body={}, packageName=package_name).execute()["id"]
+    try:
+        response = service.edits().tracks().get(editId=edit_id, track=track, packageName=package_name).execute()
+        return response.get("releases", [])
+    except HttpError as error:
+        if error.resp.status == 404:
+            return []
+        raise
+    finally:
+        service.edits().delete(editId=edit_id, packageName=package_name).execute()
+
+def update_release(service, state, fields, restore_previous=False):
+    """Release'in status/userFraction'ını tek edit içinde günceller ve commit eder"""
+    package_name, track = state["package"], state["track"]
+    version = str(state["version_code"])
+    edit_id = service.edits().insert(body={}, packageName=package_name).execute()["id"]
+    current = service.edits().tracks().get(editId=edit_id, track=track, packageName=package_name).execute()
+    release = next((release for release in current.get("releases", []) if version in release.get("versionCodes", [])),
+                   {"versionCodes": [version]})
+    release = {key: value for key, value in release.items() if key != "userFraction"}
+    release.update(fields)
+    releases = [release]
+    if restore_previous and state.get("previous"):
+        releases.append(state["previous"])
+    service.edits().tracks().update(
+        editId=edit_id, track=track, packageName=package_name, body={"releases": releases}
+    ).execute()
+    service.edits().commit(editId=edit_id, packageName=package_name).execute()
+
+def record(state, path, event, **details):
+    """Geçmişe kayıt ekler ve durumu atomik olarak yazar"""
+    state.setdefault("history", []).append(dict(details, event=event, at=time.time()))
+    upload_to_play_store.save_upload_state(path, state)
+
+def start(service, args, path):
+    """Release'i ilk yüzdeyle oluşturur; AAB sunucuda varsa tekrar yüklenmez"""
+    state = load_state(path)
+    if state and state.get("version_code"):
+        print(f"⏭️  Yayılım zaten başlatılmış (Version Code {state['version_code']}, durum: {state['status']})")
+        return state
+    stages = [float(stage) for stage in args.stages.split(",")]
+    previous = [release for release in read_track_releases(service, args.package, args.track)
+                if release.get("status") == "completed"]
+    state = {
+        "package": args.package, "track": args.track, "aab": args.aab, "stages": stages, "stage": 0,
+        "interval": parse_duration(args.interval), "health": args.health, "on_failure": args.on_failure,
+        "max_crash_rate": args.max_crash_rate, "max_anr_rate": args.max_anr_rate,
+        "previous": previous[0] if previous else None, "status": "starting", "history": [],
+    }
+    upload_to_play_store.save_upload_state(path, state)
+
+    details = {}
+    results = upload_to_play_store.publish_to_tracks(
+        service, args.package, args.aab, [args.track], release_fields=stage_fields(stages[0]), details=details
+    )
+    if results[args.track] is not None or "version_code" not in details:
+        print(f"❌ Yayılım başlatılamadı: {results[args.track]}")
+        return None
+    state.update(version_code=details["version_code"], status="completed" if stages[0] >= 100 else "rolling",
+                 next_at=time.time() + state["interval"])
+    record(state, path, "stage", percent=stages[0])
+    print(f"🚀 Version Code {state['version_code']} %{stages[0]:g} ile yayında; "
+          f"sonraki adım en erken {format_time(state['next_at'])}")
+    return state
+
+def fail(service, state, path, reason, action=None):
+    """Yayılımı durdurur (halt) veya geri alır (rollback)"""
+    action = action or state["on_failure"]
+    percent = state["stages"][state["stage"]]
+    fields = dict(stage_fields(percent), status="halted")
+    update_release(service, state, fields, restore_previous=action == "rollback")
+    state["status"] = "halted" if action == "halt" else "rolled_back"
+    record(state, path, action, percent=percent, reason=reason)
+    print(f"🛑 Yayılım %{percent:g} seviyesinde {'durduruldu' if action == 'halt' else 'geri alındı'}: {reason}")
+
+def step(service, state, path):
+    """Sağlığı kontrol eder; kötüyse durdurur, süre dolduysa sonraki yüzdeye geçer"""
+    if state["status"] != "rolling":
+        print(f"ℹ️  Yayılım durumu: {state['status']}")
+        return
+    health, message = check_health(state)
+    if health == "unhealthy":
+        fail(service, state, path, message)
+        return
+    if health == "unknown":
+        print(f"⏸️  Sağlık sinyali yok ({message}); yayılım ilerletilmedi")
+        return
+    now = time.time()
+    if now < state["next_at"]:
+        print(f"✅ Sağlıklı ({message}); %{state['stages'][state['stage']]:g} seviyesinde, "
+              f"sonraki adım {format_time(state['next_at'])}")
+        return
+
+    state["stage"] += 1
+    percent = state["stages"][state["stage"]]
+    update_release(service, state, stage_fields(percent))
+    if percent >= 100 or state["stage"] == len(state["stages"]) - 1:
+        state["status"] = "completed"
+    state["next_at"] = now + state["interval"]
+    record(state, path, "stage", percent=percent, health=message)
+    if state["status"] == "completed":
+        print(f"🎉 Version Code {state['version_code']} %{percent:g} — yayılım tamamlandı ({message})")
+    else:
+        print(f"📈 Version Code {state['version_code']} %{percent:g} ({message}); "
+              f"sonraki adım en erken {format_time(state['next_at'])}")
+
+def watch(service, state, path, poll):
+    """Yayılım bitene veya durana kadar step() çalıştırır"""
+    while True:
+        try:
+            step(service, state, path)
+        except HttpError as error:
+            upload_to_play_store.print_http_error(error)
+        if state["status"] != "rolling":
+            return
+        time.sleep(max(1.0, min(poll, state["next_at"] - time.time())))
+
+def print_status(state):
+    percent = state["stages"][state["stage"]]
+    print(f"📦 {state['package']} / {state['track']} — Version Code {state.get('version_code')}")
+    print(f"   Durum: {state['status']}, %{percent:g} (adım {state['stage'] + 1}/{len(state['stages'])}: "
+          f"{' → '.join(f'%{stage:g}' for stage in state['stages'])})")
+    if state["status"] == "rolling":
+        print(f"   Sonraki adım en erken: {format_time(state['next_at'])}")
+    for entry in state.get("history", []):
+        extra = entry.get("reason") or entry.get("health") or ""
+        print(f"   {format_time(entry['at'])}  {entry['event']:<8} %{entry.get('percent', 0):g}  {extra}")
+
+def parse_args(argv=None):
+    """Komut satırı seçenekleri"""
+    parser = argparse.ArgumentParser(description="Google Play kademeli yayılım kontrolcüsü")
+    parser.add_argument("command", choices=["start", "step", "watch", "status", "halt", "resume"])
+    parser.add_argument("--package", default=upload_to_play_store.PACKAGE_NAME)
+    parser.add_argument("--track", default=DEFAULT_TRACK)
+    parser.add_argument("--state", help="durum dosyası (varsayılan: rollout-<paket>-<track>.json)")
+    parser.add_argument("--aab", default=upload_to_play_store.AAB_FILE, help="start: yayınlanacak AAB")
+    parser.add_argument("--stages", default=",".join(str(stage) for stage in DEFAULT_STAGES),
+                        help="start: virgülle ayrılmış yüzdeler")
+    parser.add_argument("--interval", default=DEFAULT_INTERVAL, help="start: adımlar arası en az süre (ör. 24h, 30m)")
+    parser.add_argument("--health", help="start: sağlık sinyali (JSON dosyası, URL veya python:modul:fonksiyon)")
+    parser.add_argument("--max-crash-rate", type=float, default=MAX_CRASH_RATE, help="start: crash oranı eşiği (%%)")
+    parser.add_argument("--max-anr-rate", type=float, default=MAX_ANR_RATE, help="start: ANR oranı eşiği (%%)")
+    parser.add_argument("--on-failure", choices=["halt", "rollback"], default="halt",
+                        help="start: sinyal kötüyse yapılacak işlem (rollback yeni sürümü almış "
+                             "kullanıcıları eski sürüme döndürmez; sadece yeni dağıtımı durdurup önceki "
+                             "release'i sunar)")
+    parser.add_argument("--poll", default=DEFAULT_POLL, help="watch: sağlık kontrolü aralığı")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    args = parse_args(argv)
+    path = args.state or state_path(args.package, args.track)
+    state = load_state(path)
+    if args.command != "start" and not (state and state.get("version_code")):
+        print(f"❌ Başlatılmış yayılım bulunamadı: {path}")
+        return 1
+    if args.command == "status":
+        print_status(state)
+        return 0
+
+    service = upload_to_play_store.get_service()
+    try:
+        if args.command == "start":
+            state = start(service, args, path)
+            if state is None:
+                return 1
+        elif args.command == "step":
+            step(service, state, path)
+        elif args.command == "watch":
+            watch(service, state, path, parse_duration(args.poll))
+        elif args.command == "halt":
+            fail(service, state, path, "elle durduruldu", "halt")
+            return 0
+        elif args.command == "resume":
+            if state["status"] not in ("halted", "rolled_back"):
+                print(f"ℹ️  Yayılım durumu: {state['status']}")
+                return 0
+            percent = state["stages"][state["stage"]]
+            update_release(service, state, stage_fields(percent))
+            state.update(status="rolling", next_at=time.time() + state["interval"])
+            record(state, path, "resume", percent=percent)
+            print(f"▶️  Yayılım %{percent:g} seviyesinden devam ediyor")
+    except HttpError as error:
+        upload_to_play_store.print_http_error(error)
+        return 1
+    return 0 if state["status"] in ("rolling", "completed") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
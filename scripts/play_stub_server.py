@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Local Google Play Developer API stand-in
+Serves the androidpublisher v3 edits endpoints used by upload_to_play_store.py
+(edits insert/get/delete/commit, bundles upload/list, tracks get/list/update)
+from memory, including the resumable media upload protocol. A minimal
+discovery document is served at /discovery, so googleapiclient can build a
+real service object against it. Bundles are hashed while they stream in and
+never kept in memory. Latency, an upload bandwidth cap and random chunk
+errors can be injected to benchmark and exercise the upload paths offline.
+
+Usage:
+    python3 scripts/play_stub_server.py --port 8090 --bandwidth-mbps 50
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+API_PREFIX = "/androidpublisher/v3/applications"
+EDIT_PATH = re.compile(
+    r"^/androidpublisher/v3/applications/(?P<package>[^/]+)/edits"
+    r"(?:/(?P<edit>[^/:]+)(?P<commit>:commit)?(?:/(?P<collection>bundles|tracks)(?:/(?P<track>[^/]+))?)?)?$"
+)
+UPLOAD_PATH = re.compile(r"^/upload/androidpublisher/v3/applications/(?P<package>[^/]+)/edits/(?P<edit>[^/]+)/bundles$")
+SESSION_PATH = re.compile(r"^/upload/session/(?P<session>\d+)$")
+CONTENT_RANGE = re.compile(r"bytes (?:(?P<start>\d+)-(?P<end>\d+)|\*)/(?P<total>\d+|\*)")
+READ_BLOCK = 1024 * 1024
+
+def discovery_document(root_url):
+    """Minimal androidpublisher v3 discovery document pointing at root_url"""
+    def method(http_method, path, params, request=None, media=False, response="Object"):
+        description = {
+            "id": f"androidpublisher.{path}",
+            "httpMethod": http_method,
+            "path": path,
+            "parameters": {name: {"type": "string", "required": True, "location": "path"} for name in params},
+            "parameterOrder": list(params),
+            "response": {"$ref": response},
+        }
+        if request:
+            description["request"] = {"$ref": request}
+        if media:
+            upload_path = "/upload/androidpublisher/v3/" + path
+            description["supportsMediaUpload"] = True
+            description["mediaUpload"] = {
+                "accept": ["application/octet-stream"],
+                "maxSize": "10737418240",
+                "protocols": {
+                    "simple": {"multipart": True, "path": upload_path},
+                    "resumable": {"multipart": True, "path": upload_path},
+                },
+            }
+        return description
+
+    edit = "androidpublisher/v3/applications/{packageName}/edits"
+    return {
+        "kind": "discovery#restDescription",
+        "discoveryVersion": "v1",
+        "id": "androidpublisher:v3",
+        "name": "androidpublisher",
+        "version": "v3",
+        "rootUrl": root_url + "/",
+        "servicePath": "",
+        "baseUrl": root_url + "/",
+        "batchPath": "batch",
+        "protocol": "rest",
+        "parameters": {"alt": {"type": "string", "default": "json", "location": "query"}},
+        "schemas": {"Object": {"id": "Object", "type": "object", "properties": {}}},
+        "resources": {"edits": {
+            "methods": {
+                "insert": method("POST", edit, ["packageName"], request="Object"),
+                "get": method("GET", edit + "/{editId}", ["packageName", "editId"]),
+                "delete": method("DELETE", edit + "/{editId}", ["packageName", "editId"]),
+                "commit": method("POST", edit + "/{editId}:commit", ["packageName", "editId"]),
+            },
+            "resources": {
+                "bundles": {"methods": {
+                    "upload": method("POST", edit + "/{editId}/bundles", ["packageName", "editId"], media=True),
+                    "list": method("GET", edit + "/{editId}/bundles", ["packageName", "editId"]),
+                }},
+                "tracks": {"methods": {
+                    "get": method("GET", edit + "/{editId}/tracks/{track}", ["packageName", "editId", "track"]),
+                    "list": method("GET", edit + "/{editId}/tracks", ["packageName", "editId"]),
+                    "update": method("PUT", edit + "/{editId}/tracks/{track}", ["packageName", "editId", "track"], request="Object"),
+                }},
+            },
+        }},
+    }
+
+class PlayStore:
+    """Thread-safe in-memory apps, edits and upload sessions"""
+
+    def __init__(self, version_code_start=1):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.version_codes = itertools.count(version_code_start)
+        self.apps = {}      # package -> {"bundles": [...], "tracks": {...}}
+        self.edits = {}     # edit id -> {"package", "bundles", "tracks"}
+        self.sessions = {}  # session id -> {"edit", "package", "total", "received", "sha256"}
+        self.commits = 0
+
+    def app(self, package):
+        return self.apps.setdefault(package, {"bundles": [], "tracks": {}})
+
+    def insert_edit(self, package):
+        with self.lock:
+            edit_id = f"edit-{next(self.ids)}"
+            app = self.app(package)
+            self.edits[edit_id] = {
+                "package": package,
+                "bundles": list(app["bundles"]),
+                "tracks": json.loads(json.dumps(app["tracks"])),
+            }
+            return {"id": edit_id, "expiryTimeSeconds": str(int(time.time()) + 3600)}
+
+    def get_edit(self, package, edit_id):
+        edit = self.edits.get(edit_id)
+        return edit if edit and edit["package"] == package else None
+
+    def add_bundle(self, package, edit_id, sha256):
+        """Register an uploaded bundle; error message when its content was already uploaded"""
+        with self.lock:
+            edit = self.get_edit(package, edit_id)
+            if edit is None:
+                return None, "Edit does not exist"
+            if any(bundle["sha256"] == sha256 for bundle in edit["bundles"]):
+                return None, "APK specifies a version code that has already been used."
+            bundle = {"versionCode": next(self.version_codes), "sha256": sha256, "sha1": sha256[:40]}
+            edit["bundles"].append(bundle)
+            return bundle, None
+
+    def commit(self, package, edit_id):
+        with self.lock:
+            edit = self.edits.pop(edit_id, None)
+            if edit is None or edit["package"] != package:
+                return None
+            app = self.app(package)
+            app["bundles"] = edit["bundles"]
+            app["tracks"] = edit["tracks"]
+            self.commits += 1
+            return {"id": edit_id}
+
+class PlayHandler(BaseHTTPRequestHandler):
+    """Routes androidpublisher edits, media upload and discovery requests"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    timeout = 120  # drop clients that stop sending mid-chunk
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, {"error": {"code": status, "message": message, "status": "FAILED_PRECONDITION"}})
+
+    def read_body(self, sink=None):
+        """Read the request body in blocks; returns bytes unless a sink consumes them"""
+        remaining = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        started = time.monotonic()
+        received = 0
+        while remaining:
+            block = self.rfile.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            received += len(block)
+            if sink:
+                sink(block)
+            else:
+                chunks.append(block)
+            if self.server.bandwidth:
+                lag = received / self.server.bandwidth - (time.monotonic() - started)
+                if lag > 0:
+                    time.sleep(lag)
+        return b"".join(chunks)
+
+    def read_json(self):
+        return json.loads(self.read_body() or b"{}")
+
+    def route(self, method):
+        time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+
+        if path == "/discovery":
+            root = f"http://{self.headers.get('Host')}"
+            self.send_json(200, discovery_document(root))
+            return
+        if path == "/_stub/stats":
+            with self.server.store.lock:
+                self.send_json(200, {
+                    "edits": len(self.server.store.edits),
+                    "commits": self.server.store.commits,
+                    "apps": self.server.store.apps,
+                })
+            return
+
+        session = SESSION_PATH.match(path)
+        if session and method == "PUT":
+            self.upload_chunk(int(session.group("session")))
+            return
+
+        upload = UPLOAD_PATH.match(path)
+        if upload and method == "POST":
+            self.start_upload(upload.group("package"), upload.group("edit"), query.get("uploadType", ["media"])[0])
+            return
+
+        match = EDIT_PATH.match(path)
+        if not match:
+            self.send_error_json(404, f"Unknown endpoint: {path}")
+            return
+        self.handle_edit(method, match)
+
+    def handle_edit(self, method, match):
+        store = self.server.store
+        package, edit_id = match.group("package"), match.group("edit")
+        if edit_id is None:
+            self.read_body()
+            if method == "POST":
+                self.send_json(200, store.insert_edit(package))
+            else:
+                self.send_error_json(405, "Method not allowed")
+            return
+
+        body = self.read_json() if method in ("PUT", "POST") else None
+        edit = store.get_edit(package, edit_id)
+        if edit is None:
+            self.send_error_json(404, f"Edit {edit_id} does not exist or was committed")
+            return
+
+        collection = match.group("collection")
+        if match.group("commit"):
+            self.send_json(200, store.commit(package, edit_id))
+        elif collection is None and method == "GET":
+            self.send_json(200, {"id": edit_id})
+        elif collection is None and method == "DELETE":
+            with store.lock:
+                store.edits.pop(edit_id, None)
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif collection == "bundles" and method == "GET":
+            self.send_json(200, {"kind": "androidpublisher#bundlesListResponse", "bundles": edit["bundles"]})
+        elif collection == "tracks" and match.group("track") is None:
+            tracks = [{"track": name, "releases": releases} for name, releases in edit["tracks"].items()]
+            self.send_json(200, {"kind": "androidpublisher#tracksListResponse", "tracks": tracks})
+        elif collection == "tracks" and method == "GET":
+            track = match.group("track")
+            self.send_json(200, {"track": track, "releases": edit["tracks"].get(track, [])})
+        elif collection == "tracks" and method == "PUT":
+            track = match.group("track")
+            known = {bundle["versionCode"] for bundle in edit["bundles"]}
+            for release in body.get("releases", []):
+                missing = [code for code in release.get("versionCodes", []) if int(code) not in known]
+                if missing:
+                    self.send_error_json(403, f"Version codes {missing} have not been uploaded")
+                    return
+            with store.lock:
+                edit["tracks"][track] = body.get("releases", [])
+            self.send_json(200, {"track": track, "releases": edit["tracks"][track]})
+        else:
+            self.send_error_json(405, "Method not allowed")
+
+    def start_upload(self, package, edit_id, upload_type):
+        store = self.server.store
+        if upload_type != "resumable":
+            digest = hashlib.sha256()
+            self.read_body(digest.update)
+            bundle, error = store.add_bundle(package, edit_id, digest.hexdigest())
+            if error:
+                self.send_error_json(403, error)
+            else:
+                self.send_json(200, bundle)
+            return
+        self.read_body()
+        if store.get_edit(package, edit_id) is None:
+            self.send_error_json(404, f"Edit {edit_id} does not exist")
+            return
+        with store.lock:
+            session_id = next(store.ids)
+            store.sessions[session_id] = {
+                "package": package,
+                "edit": edit_id,
+                "total": int(self.headers.get("X-Upload-Content-Length") or 0),
+                "received": 0,
+                "sha256": hashlib.sha256(),
+            }
+        location = f"http://{self.headers.get('Host')}/upload/session/{session_id}"
+        self.send_json(200, {}, {"Location": location})
+
+    def upload_chunk(self, session_id):
+        session = self.server.store.sessions.get(session_id)
+        if session is None:
+            self.read_body()
+            self.send_error_json(404, "Upload session expired")
+            return
+
+        content_range = CONTENT_RANGE.match(self.headers.get("Content-Range") or "")
+        if content_range and content_range.group("total") != "*":
+            session["total"] = int(content_range.group("total"))
+
+        if content_range and content_range.group("start") is not None:
+            start = int(content_range.group("start"))
+            if start != session["received"]:
+                self.read_body()
+                self.send_range(session)
+                return
+            if self.server.error_rate and self.server.random.random() < self.server.error_rate:
+                self.read_body()
+                self.send_error_json(503, "Injected upload failure")
+                return
+
+            def consume(block):
+                session["sha256"].update(block)
+                session["received"] += len(block)
+            self.read_body(consume)
+        else:
+            self.read_body()
+
+        if session["total"] and session["received"] >= session["total"]:
+            bundle, error = self.server.store.add_bundle(
+                session["package"], session["edit"], session["sha256"].hexdigest()
+            )
+            del self.server.store.sessions[session_id]
+            if error:
+                self.send_error_json(403, error)
+            else:
+                self.send_json(200, bundle)
+        else:
+            self.send_range(session)
+
+    def send_range(self, session):
+        """308 Resume Incomplete with the bytes received so far"""
+        self.send_response(308)
+        if session["received"]:
+            self.send_header("Range", f"bytes=0-{session['received'] - 1}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def do_PUT(self):
+        self.route("PUT")
+
+    def do_DELETE(self):
+        self.route("DELETE")
+
+class PlayStubServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients dropping keep-alive connections"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def start_server(host="127.0.0.1", port=0, latency_ms=0, bandwidth_mbps=0, error_rate=0.0,
+                 version_code_start=1, seed=None):
+    """Start the stand-in on a background thread and return the server"""
+    server = PlayStubServer((host, port), PlayHandler)
+    server.store = PlayStore(version_code_start)
+    server.latency = latency_ms / 1000.0
+    server.bandwidth = bandwidth_mbps * 1e6 / 8
+    server.error_rate = error_rate
+    server.random = random.Random(seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Google Play Developer API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="upload bandwidth cap (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of upload chunks answered with 503")
+    parser.add_argument("--version-code-start", type=int, default=1)
+    parser.add_argument("--seed", type=int, help="random seed for reproducible error injection")
+    args = parser.parse_args()
+
+    server = start_server(
+        args.host, args.port, args.latency_ms, args.bandwidth_mbps, args.error_rate, args.version_code_start, args.seed
+    )
+    print(f"🧪 Google Play API stand-in listening on http://{args.host}:{server.server_port}")
+    print(f"   Discovery document: http://{args.host}:{server.server_port}/discovery")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Azure DevOps project snapshot and restore
+Exports a project's full work item graph (fields, work item links,
+hyperlinks, area/iteration paths) to a gzip-compressed JSON-lines snapshot
+and replays it into another organization/project, e.g. to clone a
+production-sized backlog into a test tenant. The area and iteration trees
+(with iteration dates) are stored in the header and created in the target
+before any item, so nested paths stay valid.
+
+Export pages through WIQL IDs ([System.Id] > last) and fetches workitemsbatch
+chunks of 200 in parallel. Read-only system fields are dropped, identities
+are stored by unique name and each link is stored once (forward direction,
+or lower ID for symmetric links).
+
+Restore streams the snapshot through the $batch creation path of
+create_demo_project.py with all links deferred, then adds the links in a
+second batched pass. Old -> new IDs are kept in a checkpoint journal, so an
+interrupted restore resumes where it stopped.
+
+Usage:
+    python3 scripts/project_snapshot.py --workers 8 export --output snapshot.jsonl.gz
+    python3 scripts/project_snapshot.py --org-url https://dev.azure.com/test-tenant --project Perf-Clone \\
+        --token $AZURE_DEVOPS_PAT restore --input snapshot.jsonl.gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+import create_demo_project
+from azure_devops_client import DEFAULT_POOL_SIZE, AzureDevOpsClient
+from seed_journal import SeedJournal
+from seed_paths import MAX_DEPTH, STRUCTURE_GROUPS, provision_nodes, tree_nodes
+
+SNAPSHOT_FORMAT = "azure-devops-work-items"
+SNAPSHOT_VERSION = 1
+EXPORT_WORKERS = 8
+PROGRESS_EVERY = 10000  # items between progress lines
+
+READ_ONLY_FIELDS = {
+    "System.Id", "System.Rev", "System.WorkItemType", "System.TeamProject", "System.NodeName",
+    "System.AreaId", "System.IterationId", "System.Parent",
+    "System.CreatedDate", "System.CreatedBy", "System.ChangedDate", "System.ChangedBy",
+    "System.AuthorizedDate", "System.AuthorizedAs", "System.RevisedDate", "System.Watermark",
+    "System.PersonId", "System.CommentCount", "System.BoardColumn", "System.BoardColumnDone", "System.BoardLane",
+    "System.ExternalLinkCount", "System.HyperLinkCount", "System.AttachedFileCount",
+    "System.RelatedLinkCount", "System.RemoteLinkCount",
+    "Microsoft.VSTS.Common.StateChangeDate", "Microsoft.VSTS.Common.ActivatedDate",
+    "Microsoft.VSTS.Common.ActivatedBy", "Microsoft.VSTS.Common.ResolvedDate",
+    "Microsoft.VSTS.Common.ResolvedBy", "Microsoft.VSTS.Common.ClosedDate", "Microsoft.VSTS.Common.ClosedBy",
+}
+READ_ONLY_PREFIXES = ("System.AreaLevel", "System.IterationLevel", "WEF_")
+PATH_FIELDS = ("System.AreaPath", "System.IterationPath")
+WORK_ITEM_LINK = re.compile(r"/_apis/wit/workItems/(\d+)$", re.IGNORECASE)
+
+def snapshot_record(work_item):
+    """Compact snapshot record of a work item returned with $expand=relations"""
+    fields = {}
+    for name, value in work_item.get("fields", {}).items():
+        if name in READ_ONLY_FIELDS or name.startswith(READ_ONLY_PREFIXES):
+            continue
+        if isinstance(value, dict) and "uniqueName" in value:
+            value = value["uniqueName"]  # identity reference
+        fields[name] = value
+
+    links, hyperlinks = [], []
+    for relation in work_item.get("relations") or ():
+        rel, url = relation.get("rel", ""), relation.get("url", "")
+        match = WORK_ITEM_LINK.search(url)
+        if match:
+            target = int(match.group(1))
+            if rel.endswith("-Reverse"):
+                continue  # restored from the forward link on the other item
+            if not rel.endswith("-Forward") and target < work_item["id"]:
+                continue  # symmetric link, kept on the lower ID
+            links.append([target, rel])
+        elif rel == "Hyperlink":
+            hyperlinks.append(url)
+
+    record = {"id": work_item["id"], "type": work_item["fields"].get("System.WorkItemType"), "fields": fields}
+    if links:
+        record["links"] = links
+    if hyperlinks:
+        record["hyperlinks"] = hyperlinks
+    return record
+
+def export_snapshot(client, path, workers=EXPORT_WORKERS):
+    """Write every work item of the client's project to a snapshot; returns the item count"""
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "org_url": client.org_url,
+        "project": client.project,
+        "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "classification": {
+            key: tree_nodes(client.get_classification_tree(group, MAX_DEPTH))
+            for key, group in STRUCTURE_GROUPS.items()
+        },
+    }
+    ids = client.query_ids("[System.TeamProject] = @project")
+    count = 0
+    started = time.monotonic()
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        snapshot.write(json.dumps(header) + "\n")
+        for work_item in client.get_work_items(ids, expand="relations", workers=workers):
+            snapshot.write(json.dumps(snapshot_record(work_item), separators=(",", ":")) + "\n")
+            count += 1
+            if count % PROGRESS_EVERY == 0:
+                print(f"   {count} work items exported ({count / (time.monotonic() - started):.0f}/s)")
+    return count
+
+def read_snapshot(path):
+    """Return (header, record iterator) of a snapshot file"""
+    snapshot = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(snapshot.readline())
+    if header.get("format") != SNAPSHOT_FORMAT or header.get("version") != SNAPSHOT_VERSION:
+        snapshot.close()
+        raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} work item snapshot")
+
+    def records():
+        with snapshot:
+            for line in snapshot:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, records()
+
+def rewrite_path(value, source_project, target_project, flatten):
+    """Move an area/iteration path from the source to the target project"""
+    if flatten or not isinstance(value, str):
+        return target_project
+    if value == source_project or value.startswith(source_project + "\\"):
+        return target_project + value[len(source_project):]
+    return value
+
+def restore_items(records, source_project, target_project, flatten_paths=False):
+    """Yield seed items (see create_demo_project.DEMO_ITEMS) for snapshot records"""
+    for record in records:
+        fields = dict(record["fields"])
+        title = fields.pop("System.Title", f"{record['type']} {record['id']}")
+        description = fields.pop("System.Description", None)
+        for name in PATH_FIELDS:
+            if name in fields:
+                fields[name] = rewrite_path(fields[name], source_project, target_project, flatten_paths)
+        yield {
+            "key": str(record["id"]),
+            "type": record["type"],
+            "title": title,
+            "description": description,
+            "fields": fields,
+            "links": [(str(target), rel) for target, rel in record.get("links", ())],
+            "relations": [{"rel": "Hyperlink", "url": url} for url in record.get("hyperlinks", ())],
+        }
+
+def provision_paths(client, classification, workers):
+    """Create the snapshot's area/iteration nodes missing from the target project"""
+    for key, group in STRUCTURE_GROUPS.items():
+        planned = classification.get(key) or []
+        if planned:
+            available, created = provision_nodes(client, group, planned, workers)
+            present = sum(1 for node in planned if node["path"] in available)
+            print(f"   {group}: {present}/{len(planned)} nodes available ({created} created)")
+
+def count_records(records, counter):
+    """Pass records through, counting them in counter[0]"""
+    for record in records:
+        counter[0] += 1
+        yield record
+
+def restore_snapshot(path, journal_path, batch_size, workers, flatten_paths=False):
+    """Replay a snapshot into the client configured in create_demo_project.
+
+    Returns (created, linked, records, unlinked): the old -> new ID map, items
+    linked in this run, records in the snapshot and items whose links could
+    not be added.
+    """
+    header, records = read_snapshot(path)
+    client = create_demo_project.get_client()
+    target_project = client.project
+    print(f"📄 Snapshot of {header['project']} ({header['org_url']}), exported {header['exported']}")
+    if not flatten_paths:
+        if "classification" in header:
+            print("🌳 Provisioning area/iteration paths...")
+            provision_paths(client, header["classification"], workers)
+        else:
+            print("⚠️ Snapshot has no area/iteration trees; nested paths must exist in the target "
+                  "(or use --flatten-paths)")
+
+    pending = []
+    total = [0]
+    items = restore_items(count_records(records, total), header["project"], target_project, flatten_paths)
+    with SeedJournal(journal_path) as journal:
+        if journal.created:
+            print(f"⏭️  Resuming: {len(journal.created)} items already restored")
+        items = create_demo_project.split_links(items, pending)
+        created = create_demo_project.seed_batched(items, batch_size, journal)
+
+        dangling = sum(1 for _, links in pending for target, _ in links if target not in created)
+        if dangling:
+            print(f"⚠️ {dangling} links point outside the snapshot and are skipped")
+
+        print(f"🔗 Linking {len(pending)} work items...")
+        linked = create_demo_project.apply_deferred_links(pending, created, batch_size, workers, journal)
+        unlinked = sum(
+            1 for key, links in pending
+            if key in created and key not in journal.linked
+            and any(target in created for target, _ in journal.pending.get(key, links))
+        )
+    return created, linked, total[0], unlinked
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export and restore Azure DevOps work item snapshots")
+    parser.add_argument("--org-url", default=create_demo_project.ORG_URL, help="organization URL")
+    parser.add_argument("--project", default=create_demo_project.PROJECT)
+    parser.add_argument("--token", default=os.environ.get("AZURE_DEVOPS_PAT"),
+                        help="personal access token (default: $AZURE_DEVOPS_PAT or the seeding script's token)")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="concurrent requests")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write a project's work items to a snapshot")
+    export.add_argument("--output", required=True, help="snapshot file (.jsonl.gz)")
+
+    restore = commands.add_parser("restore", help="create a snapshot's work items in a project")
+    restore.add_argument("--input", required=True, help="snapshot file (.jsonl.gz)")
+    restore.add_argument("--journal", help="old -> new ID journal (default: <input>.restore.jsonl)")
+    restore.add_argument("--batch-size", type=int, default=create_demo_project.MAX_BATCH_SIZE)
+    restore.add_argument("--flatten-paths", action="store_true",
+                         help="put every item on the target project's root area/iteration")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    token = args.token or create_demo_project.TOKEN
+    pool_size = max(DEFAULT_POOL_SIZE, args.workers)
+
+    if args.command == "export":
+        client = AzureDevOpsClient(args.org_url, args.project, token, create_demo_project.API_VERSION,
+                                   pool_size=pool_size)
+        print(f"📤 Exporting {args.project} from {args.org_url}...")
+        started = time.monotonic()
+        count = export_snapshot(client, args.output, args.workers)
+        elapsed = time.monotonic() - started
+        size = os.path.getsize(args.output)
+        print(f"✅ {count} work items exported in {elapsed:.1f}s to {args.output} ({size / 1e6:.1f} MB)")
+        return 0
+
+    create_demo_project.configure_client(pool_size, org_url=args.org_url, project=args.project, token=token)
+    print(f"📥 Restoring into {args.project} at {args.org_url}...")
+    started = time.monotonic()
+    created, linked, total, unlinked = restore_snapshot(
+        args.input, args.journal or f"{args.input}.restore.jsonl", args.batch_size, args.workers, args.flatten_paths
+    )
+    elapsed = time.monotonic() - started
+    if len(created) < total or unlinked:
+        print(f"❌ {len(created)}/{total} work items restored, {unlinked} not linked in {elapsed:.1f}s; "
+              "rerun to resume")
+        return 1
+    print(f"✅ {len(created)} work items restored, {linked} linked in {elapsed:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+WIQL bulk query and export
+Runs a WIQL query against a project and streams the matching work items as
+CSV or JSON-lines, e.g. to verify a seeded dataset or to produce offline
+fixtures for app performance tests.
+
+IDs are collected with keyset paging ([System.Id] > last), so the 20k WIQL
+result cap never truncates a query. With --partition the query is split
+into ID ranges or ChangedDate windows that are paged in parallel. Fields
+are then fetched in workitemsbatch chunks of 200 by --workers threads and
+written out in ID order as they arrive; only the ID list is held in memory.
+
+Usage:
+    python3 scripts/query_work_items.py --where "[System.WorkItemType] = 'Bug'" --output bugs.csv
+    python3 scripts/query_work_items.py --wiql "SELECT [System.Id], [System.Title] FROM WorkItems \\
+        WHERE [System.TeamProject] = @project" --format jsonl --workers 16 --partition id --partitions 8
+    python3 scripts/query_work_items.py --partition changed --since 2026-01-01 --days 7 --count
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+
+import create_demo_project
+from azure_devops_client import DEFAULT_POOL_SIZE
+from request_metrics import RequestMetrics
+
+DEFAULT_WHERE = "[System.TeamProject] = @project"
+DEFAULT_FIELDS = ["System.Id", "System.WorkItemType", "System.Title", "System.State"]
+DEFAULT_WORKERS = 8
+PROGRESS_EVERY = 10000  # items between progress lines
+WIQL_SELECT = re.compile(
+    r"^\s*SELECT\s+(?P<fields>.*?)\s+FROM\s+WorkItems\s*(?:WHERE\s+(?P<where>.*?))?\s*(?:ORDER\s+BY\s+.*)?$",
+    re.IGNORECASE | re.DOTALL
+)
+
+def log(message):
+    """Status output; stdout may carry the exported data"""
+    print(message, file=sys.stderr)
+
+def parse_wiql(wiql):
+    """Split a flat WIQL query into (fields, WHERE clause); ORDER BY is ignored (output is in ID order)"""
+    match = WIQL_SELECT.match(wiql)
+    if not match:
+        raise ValueError("only flat queries of the form SELECT [...] FROM WorkItems [WHERE ...] are supported")
+    fields = re.findall(r"\[([^\]]+)\]", match.group("fields"))
+    return fields, (match.group("where") or DEFAULT_WHERE).strip()
+
+def max_id(client, where):
+    """Highest work item ID matching where; 0 when nothing matches"""
+    url = f"{client.base_url}/_apis/wit/wiql?api-version={client.api_version}&$top=1"
+    query = f"SELECT [System.Id] FROM WorkItems WHERE ({where}) ORDER BY [System.Id] DESC"
+    items = client.request("POST", url, json={"query": query}).json().get("workItems", [])
+    return items[0]["id"] if items else 0
+
+def id_partitions(client, where, count):
+    """WHERE clauses splitting [1, max ID] into count ID ranges"""
+    highest = max_id(client, where)
+    if not highest:
+        return []
+    step = -(-highest // max(1, count))
+    return [
+        f"[System.Id] >= {start} AND [System.Id] < {start + step}"
+        for start in range(1, highest + 1, step)
+    ]
+
+def changed_date_partitions(since, until, days):
+    """WHERE clauses splitting ChangedDate into windows of days, plus everything before since"""
+    clauses = [f"[System.ChangedDate] < '{since.isoformat()}'"]
+    start = since
+    while start <= until:
+        end = start + timedelta(days=days)
+        clauses.append(f"[System.ChangedDate] >= '{start.isoformat()}' AND [System.ChangedDate] < '{end.isoformat()}'")
+        start = end
+    return clauses
+
+def collect_ids(client, where, partitions=None, workers=DEFAULT_WORKERS):
+    """Sorted IDs matching where, paging each partition clause in parallel"""
+    if not partitions:
+        return list(client.query_ids(where))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pages = pool.map(lambda clause: list(client.query_ids(f"({where}) AND {clause}")), partitions)
+        ids = set()
+        for page in pages:
+            ids.update(page)  # an item changed mid-export can show up in two date windows
+    return sorted(ids)
+
+def field_value(value):
+    """Flatten identity references and other objects for CSV"""
+    if isinstance(value, dict):
+        return value.get("uniqueName") or value.get("displayName") or json.dumps(value)
+    return value
+
+class CsvWriter:
+    def __init__(self, output, fields):
+        self.fields = fields
+        self.writer = csv.writer(output)
+        self.writer.writerow(fields)
+
+    def write(self, work_item):
+        item_fields = work_item.get("fields", {})
+        self.writer.writerow([
+            work_item["id"] if name == "System.Id" else field_value(item_fields.get(name, ""))
+            for name in self.fields
+        ])
+
+class JsonLinesWriter:
+    def __init__(self, output, fields):
+        self.output = output
+        self.fields = set(fields) if fields else None
+
+    def write(self, work_item):
+        if self.fields:
+            work_item = dict(work_item, fields={
+                name: value for name, value in work_item.get("fields", {}).items() if name in self.fields
+            })
+        self.output.write(json.dumps(work_item, separators=(",", ":")) + "\n")
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonLinesWriter}
+
+def export(client, ids, fields, output, output_format="csv", expand=None, workers=DEFAULT_WORKERS):
+    """Fetch ids in parallel workitemsbatch chunks and stream them to output; returns the count"""
+    writer = WRITERS[output_format](output, fields)
+    count = 0
+    started = time.monotonic()
+    # $expand cannot be combined with fields; the JSON-lines writer filters fields itself
+    for work_item in client.get_work_items(ids, None if expand else fields, expand, workers):
+        writer.write(work_item)
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            log(f"   {count}/{len(ids)} work items ({count / (time.monotonic() - started):.0f}/s)")
+    return count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export work items matching a WIQL query as CSV or JSON-lines")
+    parser.add_argument("--org-url", default=create_demo_project.ORG_URL, help="organization URL")
+    parser.add_argument("--project", default=create_demo_project.PROJECT)
+    parser.add_argument("--token", default=os.environ.get("AZURE_DEVOPS_PAT"),
+                        help="personal access token (default: $AZURE_DEVOPS_PAT or the seeding script's token)")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--wiql", help="flat WIQL query; its SELECT list is the default field list")
+    query.add_argument("--where", help=f"WIQL WHERE clause (default: {DEFAULT_WHERE})")
+    parser.add_argument("--fields", help="comma separated reference names to export")
+    parser.add_argument("--expand", choices=["relations", "links", "all"], help="include relations (JSON-lines only)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent workitemsbatch requests")
+    parser.add_argument("--partition", choices=["none", "id", "changed"], default="none",
+                        help="split the query into ID ranges or ChangedDate windows paged in parallel")
+    parser.add_argument("--partitions", type=int, default=DEFAULT_WORKERS, help="ID ranges for --partition id")
+    parser.add_argument("--since", type=date.fromisoformat, help="first ChangedDate window (--partition changed)")
+    parser.add_argument("--days", type=int, default=7, help="ChangedDate window length in days")
+    parser.add_argument("--count", action="store_true", help="only print the number of matching work items")
+    parser.add_argument("--metrics", action="store_true", help="print per-request metrics at the end")
+    args = parser.parse_args(argv)
+    if args.expand and args.format != "jsonl":
+        parser.error("--expand needs --format jsonl")
+    if args.partition == "changed" and not args.since:
+        parser.error("--partition changed needs --since")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    fields, where = DEFAULT_FIELDS, args.where or DEFAULT_WHERE
+    if args.wiql:
+        fields, where = parse_wiql(args.wiql)
+    if args.fields:
+        fields = [name.strip() for name in args.fields.split(",") if name.strip()]
+
+    metrics = RequestMetrics() if args.metrics else None
+    client = create_demo_project.configure_client(
+        max(DEFAULT_POOL_SIZE, args.workers), hooks=[metrics] if metrics else None,
+        org_url=args.org_url, project=args.project, token=args.token or create_demo_project.TOKEN
+    )
+    started = time.monotonic()
+    partitions = None
+    if args.partition == "id":
+        partitions = id_partitions(client, where, args.partitions)
+    elif args.partition == "changed":
+        partitions = changed_date_partitions(args.since, date.today(), args.days)
+    if partitions:
+        log(f"🔎 Querying {args.project} in {len(partitions)} {args.partition} partitions...")
+    else:
+        log(f"🔎 Querying {args.project}...")
+    ids = collect_ids(client, where, partitions, args.workers)
+    log(f"   {len(ids)} work items matched in {time.monotonic() - started:.1f}s")
+    if args.count:
+        print(len(ids))
+    else:
+        output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            count = export(client, ids, fields, output, args.format, args.expand, args.workers)
+        except BrokenPipeError:
+            # reader went away (e.g. piped into head); keep the interpreter from failing on flush
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        finally:
+            if args.output:
+                output.close()
+        elapsed = time.monotonic() - started
+        log(f"✅ {count} work items exported in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f}/s)"
+            + (f" to {args.output}" if args.output else ""))
+    if metrics:
+        with redirect_stdout(sys.stderr):
+            metrics.print_summary()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Shared rate limiting
+TokenBucket caps requests/second (Azure DevOps clients) or bytes/second (Play
+bundle uploads) across threads; callers block in acquire() until their share
+of the budget is available.
+"""
+
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket allowing rate requests/second with bursts up to burst"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Stop handing out tokens for seconds (server asked us to back off)"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available; returns the seconds waited.
+
+        Requests larger than the burst go through once the bucket is full and
+        leave it in debt, so later callers wait for them (e.g. byte budgets).
+        """
+        started = time.monotonic()
+        needed = min(tokens, self.capacity)
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    time.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return time.monotonic() - started
+                time.sleep((needed - self.tokens) / self.rate)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Request-level instrumentation for the Azure DevOps clients
+Clients created with hooks=[...] call every hook with one event per logical
+request: endpoint, status, bytes, retry count, throttle/backoff delay and the
+DNS / connect / TLS / server phases of the wall time. RequestMetrics is the
+standard hook: it streams events to a JSON-lines file, aggregates them into
+per-endpoint histograms, writes Prometheus text-format metrics and prints a
+summary, so a slow seed run shows whether time went to the server,
+throttling or the client.
+
+Phase timings for the requests-based client come from TimedHTTPAdapter,
+whose urllib3 connections record into a thread-local dict while a request
+is in flight. Phases that did not happen (e.g. DNS on a reused keep-alive
+connection) are 0. The DNS / connect / TLS split overrides private urllib3
+internals (_new_conn, _dns_host), so it is only used on the urllib3 versions
+in URLLIB3_PHASE_VERSIONS; on others only the server wait and the total are
+timed.
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:  # urllib3 < 2
+    NameResolutionError = None
+
+PHASES = ("dns", "connect", "tls", "server")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+METRIC_PREFIX = "azure_devops_request"
+URLLIB3_PHASE_VERSIONS = ((2, 0), (3, 0))  # [min, max) urllib3 versions whose internals the DNS/connect split hooks
+
+phase_state = threading.local()
+
+def start_phases():
+    """Start collecting phase timings for the current thread's request"""
+    phase_state.current = dict.fromkeys(PHASES, 0.0)
+    return phase_state.current
+
+def add_phase(phase, seconds):
+    current = getattr(phase_state, "current", None)
+    if current is not None:
+        current[phase] += seconds
+
+def connection_phases_supported(version=urllib3.__version__):
+    """True when this urllib3 version has the private internals PhaseTimingMixin overrides"""
+    release = tuple(int(part) for part in re.findall(r"\d+", version)[:2])
+    low, high = URLLIB3_PHASE_VERSIONS
+    return (NameResolutionError is not None and low <= release < high
+            and callable(getattr(HTTPConnection, "_new_conn", None)))
+
+class ServerTimingMixin:
+    """urllib3 connection that records the server wait time"""
+
+    def getresponse(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        add_phase("server", time.perf_counter() - started)
+        return response
+
+class PhaseTimingMixin(ServerTimingMixin):
+    """urllib3 connection that also records DNS, connect and TLS time"""
+
+    socket_seconds = 0.0
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        host = self._dns_host.strip("[]")
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as error:
+            raise NameResolutionError(self.host, self, error) from error
+        resolved = time.perf_counter()
+        add_phase("dns", resolved - started)
+
+        # Connect to the resolved addresses so the name is looked up only once
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError):
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        connected = time.perf_counter()
+        add_phase("connect", connected - resolved)
+        self.socket_seconds = connected - started
+        return sock
+
+class TimedHTTPConnection(PhaseTimingMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(PhaseTimingMixin, HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        self.socket_seconds = 0.0
+        super().connect()
+        add_phase("tls", time.perf_counter() - started - self.socket_seconds)
+
+class ServerTimedHTTPConnection(ServerTimingMixin, HTTPConnection):
+    pass
+
+class ServerTimedHTTPSConnection(ServerTimingMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class ServerTimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = ServerTimedHTTPConnection
+
+class ServerTimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = ServerTimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record phase timings (server wait only on untested urllib3 versions)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if connection_phases_supported():
+            pools = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+        else:
+            pools = {"http": ServerTimedHTTPConnectionPool, "https": ServerTimedHTTPSConnectionPool}
+        self.poolmanager.pool_classes_by_scheme = pools
+
+def endpoint_name(url):
+    """Normalized API endpoint of a URL, e.g. wit/workitems/{id}"""
+    path = urlsplit(url).path
+    path = re.sub(r"^.*?/_apis/", "", path)
+    path = re.sub(r"/workitems/\$[^/]+", "/workitems/{type}", path)
+    path = re.sub(r"/classificationnodes/(\w+)/.+", r"/classificationnodes/\1/{path}", path)
+    path = re.sub(r"/[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}(?=/|$)", "/{id}", path, flags=re.IGNORECASE)
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+def request_event(method, url, status, seconds, bytes_sent=0, bytes_received=0,
+                  retries=0, throttle=0.0, backoff=0.0, phases=None, error=None):
+    """Build the event passed to instrumentation hooks; durations in ms"""
+    event = {
+        "ts": round(time.time(), 3),
+        "method": method,
+        "endpoint": endpoint_name(url),
+        "status": status,
+        "bytes_sent": bytes_sent,
+        "bytes_received": bytes_received,
+        "total_ms": round(seconds * 1000, 3),
+        "retries": retries,
+        "throttle_ms": round(throttle * 1000, 3),
+        "backoff_ms": round(backoff * 1000, 3),
+    }
+    for phase in PHASES:
+        event[f"{phase}_ms"] = round((phases or {}).get(phase, 0.0) * 1000, 3)
+    if error is not None:
+        event["error"] = str(error)
+    return event
+
+class RequestMetrics:
+    """Instrumentation hook aggregating request events; thread-safe"""
+
+    def __init__(self, jsonl_path=None, prometheus_path=None):
+        self.lock = threading.Lock()
+        self.jsonl = open(jsonl_path, "w", encoding="utf-8") if jsonl_path else None
+        self.prometheus_path = prometheus_path
+        self.endpoints = {}  # (method, endpoint) -> aggregate
+        self.statuses = {}   # (method, endpoint, status) -> count
+
+    def __call__(self, event):
+        key = (event["method"], event["endpoint"])
+        seconds = event["total_ms"] / 1000
+        with self.lock:
+            if self.jsonl:
+                self.jsonl.write(json.dumps(event) + "\n")
+            aggregate = self.endpoints.get(key)
+            if aggregate is None:
+                aggregate = self.endpoints[key] = {
+                    "count": 0, "seconds": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+                    "bytes_sent": 0, "bytes_received": 0, "retries": 0, "throttle": 0.0, "backoff": 0.0,
+                    "phases": dict.fromkeys(PHASES, 0.0),
+                }
+            aggregate["count"] += 1
+            aggregate["seconds"] += seconds
+            aggregate["buckets"][bucket_index(seconds)] += 1
+            aggregate["bytes_sent"] += event["bytes_sent"]
+            aggregate["bytes_received"] += event["bytes_received"]
+            aggregate["retries"] += event["retries"]
+            aggregate["throttle"] += event["throttle_ms"] / 1000
+            aggregate["backoff"] += event["backoff_ms"] / 1000
+            for phase in PHASES:
+                aggregate["phases"][phase] += event[f"{phase}_ms"] / 1000
+            status_key = key + (event["status"] or "error",)
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def close(self):
+        """Flush the JSON-lines file and write the Prometheus file"""
+        with self.lock:
+            if self.jsonl:
+                self.jsonl.close()
+                self.jsonl = None
+        if self.prometheus_path:
+            with open(self.prometheus_path, "w", encoding="utf-8") as prometheus_file:
+                prometheus_file.write(self.prometheus_text())
+
+    def prometheus_text(self):
+        """Aggregates in Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC_PREFIX}_duration_seconds Wall time per request including retries",
+            f"# TYPE {METRIC_PREFIX}_duration_seconds histogram",
+        ]
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            statuses = sorted(self.statuses.items(), key=lambda entry: tuple(map(str, entry[0])))
+        for (method, endpoint), aggregate in endpoints:
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), aggregate["buckets"]):
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{METRIC_PREFIX}_duration_seconds_sum{{{labels}}} {aggregate['seconds']:.6f}")
+            lines.append(f"{METRIC_PREFIX}_duration_seconds_count{{{labels}}} {aggregate['count']}")
+
+        counters = [
+            ("requests_total", "Requests by final status", None),
+            ("retries_total", "Retried attempts", "retries"),
+            ("throttle_seconds_total", "Time spent waiting on 429/Retry-After", "throttle"),
+            ("backoff_seconds_total", "Time spent in retry backoff", "backoff"),
+            ("sent_bytes_total", "Request body bytes", "bytes_sent"),
+            ("received_bytes_total", "Response body bytes", "bytes_received"),
+        ]
+        for name, help_text, field in counters:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} counter")
+            if field is None:
+                for (method, endpoint, status), count in statuses:
+                    lines.append(f'{METRIC_PREFIX}_{name}{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+                continue
+            for (method, endpoint), aggregate in endpoints:
+                lines.append(f'{METRIC_PREFIX}_{name}{{method="{method}",endpoint="{endpoint}"}} {aggregate[field]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_phase_seconds_total Time per request phase")
+        lines.append(f"# TYPE {METRIC_PREFIX}_phase_seconds_total counter")
+        for (method, endpoint), aggregate in endpoints:
+            for phase in PHASES:
+                lines.append(
+                    f'{METRIC_PREFIX}_phase_seconds_total{{method="{method}",endpoint="{endpoint}",phase="{phase}"}} '
+                    f"{aggregate['phases'][phase]:.6f}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        """Print per-endpoint totals, the time breakdown and a latency histogram"""
+        with self.lock:
+            endpoints = sorted(self.endpoints.items(), key=lambda entry: -entry[1]["seconds"])
+        if not endpoints:
+            print("📈 No requests recorded")
+            return
+
+        print("\n📈 Request metrics")
+        print(f"   {'endpoint':<40} {'count':>7} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'retries':>8} {'throttle s':>11}")
+        totals = {"count": 0, "seconds": 0.0, "throttle": 0.0, "backoff": 0.0, "phases": dict.fromkeys(PHASES, 0.0)}
+        buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        for (method, endpoint), aggregate in endpoints:
+            mean = aggregate["seconds"] / aggregate["count"] * 1000
+            print(f"   {method + ' ' + endpoint:<40} {aggregate['count']:>7} {mean:>9.1f}"
+                  f" {bucket_quantile(aggregate['buckets'], 0.5):>8} {bucket_quantile(aggregate['buckets'], 0.99):>8}"
+                  f" {aggregate['retries']:>8} {aggregate['throttle']:>11.1f}")
+            totals["count"] += aggregate["count"]
+            totals["seconds"] += aggregate["seconds"]
+            totals["throttle"] += aggregate["throttle"]
+            totals["backoff"] += aggregate["backoff"]
+            for phase in PHASES:
+                totals["phases"][phase] += aggregate["phases"][phase]
+            buckets = [total + count for total, count in zip(buckets, aggregate["buckets"])]
+
+        # Where the summed request time went
+        accounted = sum(totals["phases"].values()) + totals["throttle"] + totals["backoff"]
+        breakdown = dict(totals["phases"], throttle=totals["throttle"], backoff=totals["backoff"],
+                         client=max(0.0, totals["seconds"] - accounted))
+        print(f"\n   Request time {totals['seconds']:.1f}s over {totals['count']} requests:")
+        for name, seconds in breakdown.items():
+            share = seconds / totals["seconds"] if totals["seconds"] else 0
+            print(f"   {name:<10} {seconds:9.1f}s  {share:6.1%}")
+
+        print("\n   Latency histogram:")
+        widest = max(buckets) or 1
+        used = [index for index, count in enumerate(buckets) if count]
+        for bound, count in list(zip(LATENCY_BUCKETS + (None,), buckets))[used[0]:used[-1] + 1]:
+            label = f"≤ {bound * 1000:g} ms" if bound is not None else f"> {LATENCY_BUCKETS[-1] * 1000:g} ms"
+            print(f"   {label:>12} {count:>8}  {'█' * round(40 * count / widest)}")
+
+def bucket_index(seconds):
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return index
+    return len(LATENCY_BUCKETS)
+
+def bucket_quantile(buckets, fraction):
+    """Upper bound (ms) of the bucket holding the given quantile"""
+    target = fraction * sum(buckets)
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, buckets):
+        cumulative += count
+        if cumulative >= target:
+            return f"≤{bound * 1000:g}"
+    return f">{LATENCY_BUCKETS[-1] * 1000:g}"
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Concurrent work item seeding engine
+Turns seed items into a dependency DAG (an item depends on the targets of its
+links) and creates them on a bounded thread pool. An item is submitted as soon
+as every item it links to has finished, so a child gets its parent's ID right
+after the parent is created and independent branches never wait on each other.
+
+Items use the same shape as create_demo_project.DEMO_ITEMS:
+    {"key": ..., "type": ..., "title": ..., "links": [(target_key, relation_type), ...]}
+"""
+
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_WORKERS = 8
+
+def defer_unresolved(item, created, pending, journal=None):
+    """Keep the links of a created item whose target has no ID (e.g. its batch failed).
+
+    They are appended to pending as (key, links) for the linking pass and
+    recorded in the journal, so a resumed run adds them once the target
+    exists instead of leaving the item orphaned.
+    """
+    links = [(target, relation_type) for target, relation_type in item.get("links", ()) if target not in created]
+    if links:
+        pending.append((item["key"], links))
+        if journal:
+            journal.record_pending(item["key"], links)
+
+def report_unresolved(pending):
+    """Warn about deferred links nobody is going to apply (callers without a linking pass)"""
+    count = sum(len(links) for _, links in pending)
+    if count:
+        print(f"⚠️ {count} links skipped: their target items were not created")
+
+def build_dependency_graph(items):
+    """Return (dependents, waiting): who links to each key, and how many targets each key waits on"""
+    keys = {item["key"] for item in items}
+    dependents = defaultdict(list)
+    waiting = {}
+    for item in items:
+        targets = {target for target, _ in item.get("links", ()) if target in keys}
+        waiting[item["key"]] = len(targets)
+        for target in targets:
+            dependents[target].append(item["key"])
+    return dependents, waiting
+
+def dependency_levels(items):
+    """Group item keys by depth in the link DAG; raises ValueError on link cycles"""
+    dependents, waiting = build_dependency_graph(items)
+
+    levels = []
+    current = [key for key, count in waiting.items() if count == 0]
+    seen = 0
+    while current:
+        levels.append(current)
+        seen += len(current)
+        following = []
+        for key in current:
+            for dependent in dependents[key]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    following.append(dependent)
+        current = following
+
+    if seen != len(waiting):
+        stuck = sorted(key for key, count in waiting.items() if count > 0)
+        raise ValueError(f"Link cycle between items: {', '.join(stuck[:10])}")
+    return levels
+
+def seed_concurrent(items, create_item, workers=DEFAULT_WORKERS, progress=None, created=None):
+    """Create items concurrently in dependency order.
+
+    create_item(item, links) is called on a worker thread with links resolved
+    to [(target_id, relation_type), ...] and returns the new ID or None. Links
+    to items that failed are left out (see defer_unresolved).
+    progress(done, total) is called from the scheduling thread after each item.
+    created may already map keys of items seeded earlier (e.g. a previous
+    window of a streamed spec) to IDs, so links to them resolve too.
+    Returns the dict mapping item keys to created IDs.
+    """
+    dependency_levels(items)  # fail fast on cycles instead of stalling
+    by_key = {item["key"]: item for item in items}
+    dependents, waiting = build_dependency_graph(items)
+
+    created = {} if created is None else created
+    done = 0
+
+    def resolve(item):
+        return [
+            (created[target], relation_type)
+            for target, relation_type in item.get("links", ())
+            if target in created
+        ]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running = {}
+
+        def submit(key):
+            item = by_key[key]
+            running[pool.submit(create_item, item, resolve(item))] = key
+
+        for key, count in waiting.items():
+            if count == 0:
+                submit(key)
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                try:
+                    item_id = future.result()
+                except Exception as e:
+                    print(f"Error creating work item '{by_key[key]['title']}': {e}")
+                    item_id = None
+                if item_id is not None:
+                    created[key] = item_id
+                done += 1
+                if progress:
+                    progress(done, len(by_key))
+                for dependent in dependents[key]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        submit(dependent)
+
+    return created
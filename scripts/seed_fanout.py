@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Multi-organization / multi-project fan-out for the demo seeder
+Seeds the same items (the built-in demo items or a --spec) into many
+org/project targets at once. Every target runs in its own process with its
+own AzureDevOpsClient, i.e. its own connection pool, retries and token
+bucket (--rate/--burst apply per target), so a throttled tenant does not
+slow down the others. Child output goes to one log file per target while
+the parent rolls per-target progress up into a single report.
+
+Per-target files (--journal, --metrics-jsonl, --metrics-prom) get the target
+name inserted before the extension: seed.jsonl -> seed.<org>-<project>.jsonl.
+
+Targets file (YAML or JSON; a plain list of targets works too):
+    defaults:                      # optional, applied to every target
+      token_env: SCALE_TEST_PAT    # environment variable holding the PAT, or token: ...
+    targets:
+      - org_url: https://dev.azure.com/scale-01
+        project: Scale-01
+        team: Scale-01 Team        # default: "<project> Team"
+      - org_url: https://dev.azure.com/scale-02
+        project: Scale-02
+
+Usage:
+    python3 scripts/create_demo_project.py --targets tenants.yaml --batch-size 200 --rate 20
+    python3 scripts/create_demo_project.py --target https://dev.azure.com/scale-01/Scale-01 \\
+        --target https://dev.azure.com/scale-02/Scale-02 --workers 16 --parallel-targets 8
+"""
+
+import multiprocessing
+import os
+import queue
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+
+import create_demo_project
+from azure_devops_client import DEFAULT_POOL_SIZE
+from request_metrics import RequestMetrics
+from seed_journal import SeedJournal
+from seed_spec import estimate_count, load_spec
+
+REPORT_EVERY = 10.0     # seconds between rolled-up progress lines
+PROGRESS_EVERY = 0.5    # seconds between progress events sent by a target
+
+def resolve_target(entry, defaults=None):
+    """Complete a target entry with defaults: org_url, project, team and token"""
+    target = dict(defaults or {}, **entry)
+    if not target.get("project"):
+        raise ValueError(f"target without a project: {entry}")
+    target["org_url"] = target.get("org_url", create_demo_project.ORG_URL).rstrip("/")
+    target.setdefault("team", f"{target['project']} Team")
+    token_env = target.pop("token_env", None)
+    if not target.get("token"):
+        target["token"] = os.environ.get(token_env, "") if token_env else create_demo_project.TOKEN
+    if not target["token"]:
+        raise ValueError(f"no token for {target['org_url']}/{target['project']} (${token_env} is empty)")
+    return target
+
+def load_targets(path):
+    """Read targets from a YAML/JSON file (a list, or {"defaults": ..., "targets": [...]})"""
+    data = load_spec(path)
+    if isinstance(data, list):
+        data = {"targets": data}
+    return [resolve_target(entry, data.get("defaults")) for entry in data.get("targets", [])]
+
+def parse_target(value):
+    """Target from an "ORG_URL/PROJECT" command line value"""
+    org_url, _, project = value.rstrip("/").rpartition("/")
+    return resolve_target({"org_url": org_url, "project": project})
+
+def target_name(target):
+    """Short file-name safe name: <org>-<project>"""
+    organization = target["org_url"].rsplit("/", 1)[-1]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", f"{organization}-{target['project']}")
+
+def target_path(path, name):
+    """Insert the target name before a file's extension; None stays None"""
+    if not path:
+        return None
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{name}{ext}"
+
+class ProgressJournal(SeedJournal):
+    """Seed journal that also reports its created count to the parent process"""
+
+    def __init__(self, path, events, index):
+        super().__init__(path)
+        self.events = events
+        self.index = index
+        self.next_report = 0.0
+
+    def record(self, key, item_id):
+        super().record(key, item_id)
+        now = time.monotonic()
+        if now >= self.next_report:
+            self.next_report = now + PROGRESS_EVERY
+            self.report()
+
+    def report(self):
+        self.events.put((self.index, len(self.created)))
+
+    def close(self):
+        self.report()
+        super().close()
+
+def seed_target(index, target, args, events):
+    """Child process: seed one target, logging to its own file; returns a result dict"""
+    name = target_name(target)
+    log_path = os.path.join(args.log_dir, f"{name}.log")
+    started = time.monotonic()
+    with open(log_path, "w", encoding="utf-8", buffering=1) as log, redirect_stdout(log), redirect_stderr(log):
+        metrics = None
+        if args.metrics or args.metrics_jsonl or args.metrics_prom:
+            metrics = RequestMetrics(target_path(args.metrics_jsonl, name), target_path(args.metrics_prom, name))
+        create_demo_project.configure_client(
+            args.pool_size or max(DEFAULT_POOL_SIZE, args.workers), args.max_retries,
+            [metrics] if metrics else None, target["org_url"], target["project"], target["token"],
+            args.rate or None, args.burst or None
+        )
+        print(f"🚀 Seeding {target['project']} ({target['team']}) at {target['org_url']}")
+        journal = ProgressJournal(target_path(args.journal, name), events, index)
+        if journal.created:
+            print(f"⏭️  Resuming: {len(journal.created)} items already recorded in {journal.path}")
+        try:
+            created_items = create_demo_project.run_seed(args, journal, target["project"], target["team"])
+        finally:
+            journal.close()
+            if metrics:
+                metrics.close()
+                metrics.print_summary()
+        print(f"✅ Created {len(created_items)} work items")
+    if not created_items:
+        raise RuntimeError(f"no work items created, see {log_path}")
+    return {"created": len(created_items), "seconds": time.monotonic() - started}
+
+def print_summary(targets, results, elapsed):
+    print()
+    print("📊 Fan-out summary")
+    print(f"   {'Target':<40} {'Created':>7} {'Time':>8} {'Items/s':>9}")
+    total = 0
+    for index, target in enumerate(targets):
+        result = results.get(index, {})
+        created = result.get("created", 0)
+        total += created
+        label = f"{target['org_url'].rsplit('/', 1)[-1]}/{target['project']}"
+        if "error" in result:
+            print(f"   ❌ {label:<37} {result['error']}")
+        else:
+            print(f"   ✅ {label:<37} {created:>7} {result['seconds']:7.1f}s "
+                  f"{created / max(result['seconds'], 1e-9):9.1f}")
+    succeeded = sum(1 for result in results.values() if "error" not in result)
+    print(f"   Total: {total} work items in {succeeded}/{len(targets)} targets, "
+          f"{elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} items/s)")
+
+def seed_targets(args):
+    """Seed every target from --targets/--target concurrently; returns the exit code"""
+    try:
+        targets = load_targets(args.targets) if args.targets else []
+        targets += [parse_target(value) for value in args.target]
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ Cannot read targets: {e}")
+        return 1
+    names = [target_name(target) for target in targets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"❌ Duplicate targets: {', '.join(duplicates)}")
+        return 1
+
+    if args.spec:
+        expected = f"~{estimate_count(load_spec(args.spec)) * len(targets)}"
+    else:
+        expected = str(len(create_demo_project.DEMO_ITEMS) * len(targets))
+    parallel = max(1, min(args.parallel_targets or len(targets), len(targets)))
+    os.makedirs(args.log_dir, exist_ok=True)
+
+    print("🚀 Azure DevOps Demo Project Creator (fan-out)")
+    print(f"🎯 {len(targets)} targets, {expected} items in total, {parallel} at a time")
+    print(f"   Per-target logs: {args.log_dir}/")
+    print()
+
+    context = multiprocessing.get_context("spawn")
+    progress = [0] * len(targets)
+    results = {}
+    started = time.monotonic()
+    with context.Manager() as manager, ProcessPoolExecutor(parallel, mp_context=context) as pool:
+        events = manager.Queue()
+        futures = {
+            pool.submit(seed_target, index, target, args, events): index
+            for index, target in enumerate(targets)
+        }
+        pending = set(futures)
+        next_report = started + REPORT_EVERY
+
+        def drain():
+            while True:
+                try:
+                    index, created = events.get_nowait()
+                except queue.Empty:
+                    return
+                progress[index] = created
+
+        while pending:
+            done, pending = wait(pending, timeout=PROGRESS_EVERY, return_when=FIRST_COMPLETED)
+            drain()
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                    print(f"   ✅ {names[index]}: {results[index]['created']} items "
+                          f"in {results[index]['seconds']:.1f}s")
+                except Exception as e:
+                    results[index] = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"   ❌ {names[index]}: {e}")
+
+            now = time.monotonic()
+            if now >= next_report:
+                created = sum(progress)
+                running = min(parallel, len(pending))
+                print(f"   ⏳ {now - started:6.0f}s  {len(results)}/{len(targets)} targets done, {running} running"
+                      f"  {created}/{expected} items ({created / (now - started):.0f}/s)")
+                next_report += REPORT_EVERY
+        drain()
+
+    print_summary(targets, results, time.monotonic() - started)
+    return 1 if any("error" in result for result in results.values()) else 0
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for resumable seeding
+An append-only JSON-lines file mapping seed item keys to created work item
+IDs. Every record is flushed to the OS immediately and fsynced every
+sync_every records, so a crashed or interrupted run loses at most the tail
+of the last unsynced group on power loss and nothing on a process crash.
+Rerunning with the same journal skips every item already recorded.
+Items whose deferred relations have been applied are recorded as well, so
+an interrupted linking pass also resumes. Links that could not be added yet
+because their target was not created (e.g. its batch failed) are recorded
+as pending and added by the linking pass of a later run. Revision history
+plans (see seed_payloads.add_revisions) and every finished revision are
+recorded too, so resumed runs continue each item's history where it
+stopped. A journal created without a path only keeps the mapping in memory.
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_SYNC_EVERY = 100
+
+class SeedJournal:
+    """Append-only key -> work item ID journal"""
+
+    def __init__(self, path, sync_every=DEFAULT_SYNC_EVERY):
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.created, self.linked, self.pending, self.revisions = self.load(path)
+        self.lock = threading.Lock()
+        self.unsynced = 0
+        self.file = open(path, "a", encoding="utf-8") if path else None
+        if self.file and self.file.tell() and not self.ends_with_newline(path):
+            self.file.write("\n")  # terminate a torn last line before appending
+
+    @staticmethod
+    def load(path):
+        """Read recorded entries; a torn last line from a crash is ignored"""
+        created, linked, pending, revisions = {}, set(), {}, {}
+        if not path or not os.path.exists(path):
+            return created, linked, pending, revisions
+        with open(path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "linked" in entry:
+                    linked.add(entry["linked"])
+                    pending.pop(entry["linked"], None)
+                elif "pending" in entry:
+                    pending[entry["pending"]] = [tuple(link) for link in entry["links"]]
+                    linked.discard(entry["pending"])
+                elif "revisions" in entry:
+                    revisions.setdefault(entry["revisions"], [0, 0])[0] = entry["count"]
+                elif "revised" in entry:
+                    for key, revision in entry["revised"].items():
+                        progress = revisions.setdefault(key, [0, 0])
+                        progress[1] = max(progress[1], revision)
+                else:
+                    created[entry["key"]] = entry["id"]
+        return created, linked, pending, revisions
+
+    @staticmethod
+    def ends_with_newline(path):
+        with open(path, "rb") as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def remaining(self, items):
+        """Yield only items that are not recorded yet"""
+        for item in items:
+            if item["key"] not in self.created:
+                yield item
+
+    def record(self, key, item_id):
+        """Append a created item; thread-safe"""
+        with self.lock:
+            self.created[key] = item_id
+            self.append({"key": key, "id": item_id})
+
+    def record_linked(self, key):
+        """Append that an item's deferred relations were applied; thread-safe"""
+        with self.lock:
+            self.linked.add(key)
+            self.pending.pop(key, None)
+            self.append({"linked": key})
+
+    def record_pending(self, key, links):
+        """Append an item's links whose targets do not exist yet; thread-safe"""
+        with self.lock:
+            self.pending[key] = [tuple(link) for link in links]
+            self.linked.discard(key)
+            self.append({"pending": key, "links": [list(link) for link in links]})
+
+    def record_revisions(self, key, count):
+        """Append how many revisions an item's history gets; thread-safe"""
+        with self.lock:
+            self.revisions.setdefault(key, [0, 0])[0] = count
+            self.append({"revisions": key, "count": count})
+
+    def record_revised(self, revised):
+        """Append the last revision added per item ({key: revision}); thread-safe"""
+        with self.lock:
+            for key, revision in revised.items():
+                progress = self.revisions.setdefault(key, [0, 0])
+                progress[1] = max(progress[1], revision)
+            self.append({"revised": revised})
+
+    def append(self, entry):
+        """Write one entry; callers hold the lock"""
+        if not self.file:
+            return
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+
+    def sync(self):
+        """Force recorded entries to disk"""
+        with self.lock:
+            if not self.file:
+                return
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+
+    def close(self):
+        self.sync()
+        if self.file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
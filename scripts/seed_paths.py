@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Area and iteration path provisioning for seed specs
+A spec's "classification" section describes area and iteration trees with
+the same count/template rules as work items. provision_classification()
+reads each existing tree once, creates the missing nodes through the
+classification nodes API level by level (every node of a level in
+parallel, parents before children) and returns the available paths, so
+generated items can be spread across them without per-item existence
+checks.
+
+Example:
+    classification:
+      start_date: 2026-01-05          # first day of the first dated iteration
+      areas:
+        - name: "Team {i}"
+          count: 8
+          children:
+            - name: "Component {i}"
+              count: [2, 5]
+      iterations:
+        - name: "Release {i}"
+          count: 4
+          children:
+            - name: "Sprint {n}"
+              count: 6
+              days: 14                # consecutive dated sprints
+    items:
+      - type: Product Backlog Item
+        fields:
+          System.AreaPath: {area: leaf}
+          System.IterationPath: {iteration: any}
+        children:
+          - type: Task
+            fields:
+              System.IterationPath: {iteration: parent}
+
+Name placeholders: {i} position under the parent, {n} running number per
+node spec, plus the generate_items() context (project, team). Iterations
+with "days" get consecutive start/finish dates in tree order; their
+ancestors span their dated descendants. Field values {area: leaf|any|parent}
+and {iteration: ...} draw a leaf path, any path including the project root,
+or the parent item's value (see seed_spec.py).
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+from seed_spec import draw_count
+
+STRUCTURE_GROUPS = {"areas": "Areas", "iterations": "Iterations"}
+DEFAULT_WORKERS = 8
+MAX_DEPTH = 14  # Azure DevOps limit on area/iteration tree depth
+
+def plan_nodes(node_specs, context=None, start_date=None, seed=0):
+    """Expand node specs into [{"path", "parent", "name", "attributes"}], parents first.
+
+    Paths are relative to the project root and joined with backslashes.
+    """
+    rng = random.Random(seed)
+    numbers = {}
+    planned = []
+    next_start = [date.fromisoformat(str(start_date)) if start_date else None]
+
+    def expand(node_specs, parent_path):
+        spans = []
+        for node_spec in node_specs:
+            spec_id = id(node_spec)
+            for index in range(1, draw_count(node_spec.get("count", 1), rng) + 1):
+                numbers[spec_id] = numbers.get(spec_id, 0) + 1
+                name = node_spec["name"].format_map(dict(context or {}, i=index, n=numbers[spec_id]))
+                path = f"{parent_path}\\{name}" if parent_path else name
+                node = {"path": path, "parent": parent_path, "name": name, "attributes": None}
+                planned.append(node)
+
+                child_spans = expand(node_spec.get("children", []), path)
+                if node_spec.get("days") and next_start[0]:
+                    start = next_start[0]
+                    finish = start + timedelta(days=int(node_spec["days"]) - 1)
+                    next_start[0] = finish + timedelta(days=1)
+                    child_spans.append((start, finish))
+                if child_spans:
+                    start, finish = min(span[0] for span in child_spans), max(span[1] for span in child_spans)
+                    node["attributes"] = {
+                        "startDate": f"{start.isoformat()}T00:00:00Z",
+                        "finishDate": f"{finish.isoformat()}T00:00:00Z",
+                    }
+                    spans.append((start, finish))
+        return spans
+
+    expand(node_specs, "")
+    return planned
+
+def existing_paths(tree):
+    """Relative paths of every node below the root of a classification node tree"""
+    paths = set()
+
+    def walk(node, parent_path):
+        for child in node.get("children") or ():
+            path = f"{parent_path}\\{child['name']}" if parent_path else child["name"]
+            paths.add(path)
+            walk(child, path)
+
+    walk(tree, "")
+    return paths
+
+def tree_nodes(tree):
+    """Nodes below the root of a classification node tree in plan_nodes() form, parents first"""
+    nodes = []
+
+    def walk(node, parent_path):
+        for child in node.get("children") or ():
+            path = f"{parent_path}\\{child['name']}" if parent_path else child["name"]
+            dates = {name: value for name, value in (child.get("attributes") or {}).items()
+                     if name in ("startDate", "finishDate")}
+            nodes.append({"path": path, "parent": parent_path, "name": child["name"], "attributes": dates or None})
+            walk(child, path)
+
+    walk(tree, "")
+    return nodes
+
+def provision_nodes(client, group, planned, workers=DEFAULT_WORKERS):
+    """Create planned nodes missing from the server; returns (available paths, created count).
+
+    Node creates are not retried after a 5xx (the node may exist anyway), so
+    a level with failures is re-read from the server before its children;
+    409 "already exists" counts as available.
+    """
+    depth = max((node["path"].count("\\") + 1 for node in planned), default=1)
+    available = existing_paths(client.get_classification_tree(group, depth))
+
+    def create(node):
+        try:
+            client.create_classification_node(group, node["parent"], node["name"], node["attributes"])
+            return node["path"]
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 409:
+                return node["path"]  # created concurrently by another run
+            print(f"Error creating {group} node '{node['path']}': {e}")
+            return None
+
+    created = 0
+    levels = {}
+    for node in planned:
+        levels.setdefault(node["path"].count("\\"), []).append(node)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for level in sorted(levels):
+            missing = [
+                node for node in levels[level]
+                if node["path"] not in available and (not node["parent"] or node["parent"] in available)
+            ]
+            failed = []
+            for node, path in zip(missing, pool.map(create, missing)):
+                if path:
+                    available.add(path)
+                    created += 1
+                else:
+                    failed.append(node)
+            if failed:
+                present = existing_paths(client.get_classification_tree(group, level + 1))
+                recovered = {node["path"] for node in failed if node["path"] in present}
+                if recovered:
+                    print(f"   {len(recovered)} {group} nodes exist despite the errors above")
+                available |= recovered
+                created += len(recovered)
+    return available, created
+
+def provision_classification(client, classification, context=None, workers=DEFAULT_WORKERS):
+    """Provision a spec's area/iteration trees; returns the path cache for generate_items().
+
+    The cache maps "areas"/"iterations" to {"leaf": [...], "any": [...]}
+    full paths (project\\...) of the planned nodes that exist on the server.
+    """
+    project = client.project
+    cache = {}
+    for key, group in STRUCTURE_GROUPS.items():
+        planned = plan_nodes(
+            classification.get(key, []), context, classification.get("start_date"), classification.get("seed", 0)
+        )
+        paths = []
+        if planned:
+            available, created = provision_nodes(client, group, planned, workers)
+            paths = [node["path"] for node in planned if node["path"] in available]
+            depth = max(node["path"].count("\\") + 1 for node in planned)
+            print(f"   {group}: {len(paths)}/{len(planned)} nodes available ({created} created, {depth} levels)")
+        parents = {path.rpartition("\\")[0] for path in paths}
+        leaves = [path for path in paths if path not in parents]
+        cache[key] = {
+            "leaf": [f"{project}\\{path}" for path in leaves] or [project],
+            "any": [project] + [f"{project}\\{path}" for path in paths],
+        }
+    return cache
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Large-payload generation for seeded work items
+Turns an item's "payload" spec (see seed_spec.py) into heavy content: long
+HTML descriptions with inline images, file attachments and revision
+history. Attachments are generated block by block or streamed from disk
+through attachment_uploader.py (memory-mapped, chunked above 130 MB), so
+memory stays at one block per upload no matter how large the files are;
+uploads for different items run concurrently in a bounded window. Revision history is added after the
+items exist, one System.History comment per revision, packed into $batch
+calls round by round.
+
+Spec (on any item node):
+    payload:
+      html: {sections: [10, 40], images: [0, 3], image_kb: [50, 400]}
+      attachments: {count: [0, 3], size_kb: [100, 50000]}    # generated content
+      files: {count: [0, 1], paths: ["build/outputs/**/*.aab", "logs/*.log"]}
+      revisions: [10, 80]
+
+Counts and sizes are a number or a [min, max] range, drawn from a per-item
+seed so the same spec always yields the same payloads.
+"""
+
+import glob
+import os
+import random
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from attachment_uploader import upload_body, upload_file
+from seed_spec import draw_count
+
+CHUNK_SIZE = 1024 * 1024  # bytes generated per block
+DEFAULT_UPLOAD_WORKERS = 4
+ATTACHMENT_EXTENSIONS = [".log", ".zip", ".txt", ".dmp", ".json"]
+IMAGE_WIDTH = 256  # pixels; image height follows from the requested size
+
+WORDS = (
+    "app build cache client crash device error event feature flag latency layout load login memory network "
+    "offline page payload query release render request response retry screen session sprint sync team test "
+    "thread timeout token update upload user version view widget work item board backlog pipeline deploy"
+).split()
+
+class GeneratedBody:
+    """Re-iterable pseudo-random upload body, generated block by block.
+
+    Block n only depends on (seed, n), so any byte range can be produced on
+    its own for chunked uploads.
+    """
+
+    def __init__(self, size, seed, offset=0, block_size=CHUNK_SIZE):
+        self.size = size
+        self.seed = seed
+        self.offset = offset
+        self.block_size = block_size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        position, end = self.offset, self.offset + self.size
+        while position < end:
+            index, skip = divmod(position, self.block_size)
+            block = random.Random(f"{self.seed}:{index}").randbytes(self.block_size)
+            block = block[skip:skip + end - position]
+            position += len(block)
+            yield block
+
+    def range(self, start, end):
+        """Body for bytes [start, end) of this body"""
+        return GeneratedBody(end - start, self.seed, self.offset + start, self.block_size)
+
+def png_image(rng, size):
+    """Noise PNG of roughly size bytes (noise does not compress)"""
+    row = 1 + IMAGE_WIDTH * 3
+    height = max(1, size // row)
+    raw = b"".join(b"\x00" + rng.randbytes(IMAGE_WIDTH * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", IMAGE_WIDTH, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+def sentence(rng, low=8, high=20):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize() + "."
+
+def html_description(rng, sections, image_urls=(), summary=None):
+    """Rich HTML description: headings, paragraphs, lists, tables, code and inline images"""
+    parts = [f"<p><b>{summary}</b></p>"] if summary else []
+    images = list(image_urls)
+    for number in range(1, sections + 1):
+        parts.append(f"<h2>{number}. {sentence(rng, 3, 6)[:-1]}</h2>")
+        kind = rng.choice(["paragraphs", "list", "table", "code"])
+        if kind == "paragraphs":
+            parts.extend(f"<p>{' '.join(sentence(rng) for _ in range(rng.randint(2, 6)))}</p>"
+                         for _ in range(rng.randint(1, 4)))
+        elif kind == "list":
+            parts.append("<ul>" + "".join(f"<li>{sentence(rng, 4, 12)}</li>" for _ in range(rng.randint(3, 10))) + "</ul>")
+        elif kind == "table":
+            columns = rng.randint(3, 6)
+            header = "".join(f"<th>{rng.choice(WORDS).title()}</th>" for _ in range(columns))
+            rows = "".join(
+                "<tr>" + "".join(f"<td>{rng.choice(WORDS)} {rng.randint(1, 9999)}</td>" for _ in range(columns)) + "</tr>"
+                for _ in range(rng.randint(3, 15))
+            )
+            parts.append(f"<table><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>")
+        else:
+            lines = "\n".join(f"{rng.choice(WORDS)}.{rng.choice(WORDS)}({rng.randint(0, 99)}) // {sentence(rng, 3, 8)}"
+                              for _ in range(rng.randint(4, 20)))
+            parts.append(f"<pre><code>{lines}</code></pre>")
+        if images and rng.random() < len(images) / max(1, sections - number + 1):
+            parts.append(f'<p><img src="{images.pop(0)}" alt="Screenshot {number}"></p>')
+    parts.extend(f'<p><img src="{url}" alt="Screenshot"></p>' for url in images)
+    return "".join(parts)
+
+class PayloadBuilder:
+    """Uploads an item's images/attachments and returns the item with its heavy content"""
+
+    def __init__(self, client):
+        self.client = client
+        self.uploaded = 0
+        self.uploaded_bytes = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+    def upload(self, file_name, size, send):
+        """Upload one attachment with send(); returns its URL or None after printing the error"""
+        try:
+            reference = send()
+        except Exception as e:
+            print(f"Error uploading attachment '{file_name}': {e}")
+            with self.lock:
+                self.failed += 1
+            return None
+        with self.lock:
+            self.uploaded += 1
+            self.uploaded_bytes += size
+        return reference["url"]
+
+    def build(self, item):
+        """Return (item with description/relations filled in, revision count)"""
+        payload = item["payload"]
+        rng = random.Random(payload.get("seed", 0))
+        slug = item["key"]
+        description = item.get("description")
+        relations = list(item.get("relations", ()))
+
+        html = payload.get("html")
+        if html:
+            image_urls = []
+            for number in range(1, draw_count(html.get("images", 0), rng) + 1):
+                image = png_image(rng, draw_count(html.get("image_kb", 100), rng) * 1024)
+                file_name = f"{slug}-screenshot-{number}.png"
+                url = self.upload(file_name, len(image), lambda: self.client.upload_attachment(file_name, image))
+                if url:
+                    image_urls.append(url)
+            description = html_description(rng, draw_count(html.get("sections", 10), rng), image_urls, description)
+
+        attachments = payload.get("attachments") or {}
+        for number in range(1, draw_count(attachments.get("count", 0), rng) + 1):
+            size = draw_count(attachments.get("size_kb", 1024), rng) * 1024
+            file_name = f"{slug}-attachment-{number}{rng.choice(ATTACHMENT_EXTENSIONS)}"
+            body = GeneratedBody(size, rng.getrandbits(32))
+            url = self.upload(file_name, size, lambda: upload_body(self.client, file_name, size, body.range))
+            if url:
+                relations.append({"rel": "AttachedFile", "url": url, "attributes": {"comment": f"{size // 1024} KB"}})
+
+        files = payload.get("files") or {}
+        paths = sorted({path for pattern in files.get("paths", []) for path in glob.glob(pattern, recursive=True)
+                        if os.path.isfile(path)})
+        for path in rng.sample(paths, min(len(paths), draw_count(files.get("count", 1), rng))) if paths else ():
+            url = self.upload(path, os.path.getsize(path), lambda: upload_file(self.client, path)[0])
+            if url:
+                relations.append({"rel": "AttachedFile", "url": url, "attributes": {"comment": path}})
+
+        item = dict(item, description=description, relations=relations)
+        return item, draw_count(payload.get("revisions", 0), rng)
+
+def build_payloads(items, client, workers=DEFAULT_UPLOAD_WORKERS, revisions=None, journal=None):
+    """Yield items with their payloads built, in order; uploads run workers at a time.
+
+    Items without a payload pass through. (key, revision count) pairs are
+    appended to revisions for add_revisions() once the items exist, and
+    recorded in the journal so a resumed run still adds them.
+    """
+    builder = PayloadBuilder(client)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+
+        def finish():
+            entry = pending.popleft()
+            item, count = entry if isinstance(entry, tuple) else entry.result()
+            if count and revisions is not None:
+                revisions.append((item["key"], count))
+            if count and journal:
+                journal.record_revisions(item["key"], count)
+            return item
+
+        for item in items:
+            pending.append(pool.submit(builder.build, item) if item.get("payload") else (item, 0))
+            while pending and (isinstance(pending[0], tuple) or len(pending) > workers * 2):
+                yield finish()
+        while pending:
+            yield finish()
+
+    failed = f", {builder.failed} failed" if builder.failed else ""
+    print(f"   📎 Uploaded {builder.uploaded} attachments ({builder.uploaded_bytes / 1e6:.1f} MB){failed}")
+
+def add_revisions(client, revisions, created, batch_size=200, workers=8, journal=None):
+    """Add revision history: one System.History comment per revision, packed into $batch calls.
+
+    Every round adds the next revision to each item that still needs one, so
+    one item never appears twice in a batch. With a journal, plans recorded
+    by earlier runs are included and each added revision is recorded, so a
+    resumed run continues every item's history where it stopped. Items whose
+    revision fails are left for a later run and reported by ID. Returns the
+    number of revisions added.
+    """
+    plans = {key: [count, 0] for key, count in revisions}
+    if journal:
+        plans.update((key, list(progress)) for key, progress in journal.revisions.items())
+    remaining = {key: progress for key, progress in plans.items() if key in created and progress[1] < progress[0]}
+    added = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while remaining:
+            updates = []
+            for key, (_, done) in remaining.items():
+                item_id, revision = created[key], done + 1
+                updates.append((key, revision, {
+                    "method": "PATCH",
+                    "uri": f"/_apis/wit/workitems/{item_id}?api-version={client.api_version}",
+                    "headers": {"Content-Type": "application/json-patch+json"},
+                    "body": [{"op": "add", "path": "/fields/System.History",
+                              "value": f"<p>Revision {revision}: {sentence(random.Random(item_id * 1000 + revision))}</p>"}],
+                }))
+
+            def send(chunk):
+                try:
+                    results = client.batch([update for _, _, update in chunk])
+                except Exception as e:
+                    print(f"Error adding revisions to {len(chunk)} work items: {e}")
+                    results = []
+                revised = {key: revision for (key, revision, _), result in zip(chunk, results)
+                           if result.get("code") == 200}
+                if revised and journal:
+                    journal.record_revised(revised)
+                return revised
+
+            chunks = [updates[start:start + batch_size] for start in range(0, len(updates), batch_size)]
+            revised = {}
+            for chunk_revised in pool.map(send, chunks):
+                revised.update(chunk_revised)
+            added += len(revised)
+            failed += [created[key] for key in remaining if key not in revised]
+            remaining = {key: [total, revised[key]] for key, (total, _) in remaining.items()
+                         if key in revised and revised[key] < total}
+    if failed:
+        shown = ", ".join(map(str, sorted(failed)[:20]))
+        more = f" and {len(failed) - 20} more" if len(failed) > 20 else ""
+        print(f"⚠️ Revision history incomplete for {len(failed)} work items: {shown}{more}")
+    return added
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Declarative seed specs for create_demo_project.py
+A spec (YAML or JSON) describes a work item tree with fan-out counts,
+templated titles, field value distributions and relation rules. generate_items()
+streams seed items from it depth-first, parents before children, so a spec
+describing millions of items is never held in memory at once.
+
+Example:
+    seed: 42
+    defaults:
+      fields:
+        System.AreaPath: "{project}"
+    items:
+      - type: Epic
+        count: 10
+        title: "Epic {n}"
+        children:
+          - type: Feature
+            count: [2, 6]
+            title: "Feature {n} of {parent_title}"
+            children:
+              - type: Product Backlog Item
+                count: [5, 20]
+                title: "PBI {n}"
+                fields:
+                  Microsoft.VSTS.Common.StoryPoints: {fibonacci: [1, 13]}
+                  Microsoft.VSTS.Common.Priority: {choice: [1, 2, 3, 4], weights: [1, 4, 4, 1]}
+                relations:
+                  - {rel: System.Links.Related, to: previous, probability: 0.2}
+
+Counts are a number or a [min, max] range. Field values are constants
+(strings are templated) or one of {choice, weights}, {range: [min, max]},
+{fibonacci: [min, max]}, {area: leaf|any|parent}, {iteration: ...}; area and
+iteration values draw from the paths provisioned for the spec's
+"classification" section (see seed_paths.py). Children link to their parent with "link"
+(default System.Links.Hierarchy-Forward); extra "relations" target the
+"parent" or the "previous" sibling. A node's "payload" (large HTML,
+attachments, revisions; see seed_payloads.py) is passed on to its items
+with a per-item seed. Title placeholders: {n} running number
+per type, {i} position under the parent, {type}, {parent_title}, plus the
+context passed to generate_items() (project, team).
+"""
+
+import json
+import random
+from pathlib import Path
+
+PARENT_LINK = "System.Links.Hierarchy-Forward"
+
+def load_spec(path):
+    """Load a seed spec from a .yaml/.yml or .json file.
+
+    Raises ImportError without PyYAML and ValueError for malformed files.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(f"PyYAML is required to read {path} (pip install pyyaml, or use JSON)") from None
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: {e}") from None
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+def fibonacci_between(low, high):
+    """Fibonacci numbers in [low, high]"""
+    numbers, a, b = [], 1, 2
+    while a <= high:
+        if a >= low:
+            numbers.append(a)
+        a, b = b, a + b
+    return numbers
+
+def draw_count(count, rng):
+    """Resolve a count spec (number or [min, max]) to a number"""
+    if isinstance(count, (list, tuple)):
+        return rng.randint(int(count[0]), int(count[1]))
+    return int(count)
+
+def draw_value(value, rng, context):
+    """Resolve a field value spec to a concrete value"""
+    if isinstance(value, str):
+        return value.format_map(context)
+    if not isinstance(value, dict):
+        return value
+    if "choice" in value:
+        return rng.choices(value["choice"], weights=value.get("weights"))[0]
+    if "range" in value:
+        low, high = value["range"]
+        return rng.randint(low, high)
+    if "fibonacci" in value:
+        return rng.choice(fibonacci_between(*value["fibonacci"]))
+    if "area" in value or "iteration" in value:
+        field, group = ("System.AreaPath", "areas") if "area" in value else ("System.IterationPath", "iterations")
+        mode = value.get("area", value.get("iteration"))
+        if mode == "parent" and context.get("parent_fields", {}).get(field):
+            return context["parent_fields"][field]
+        paths = context.get("classification", {}).get(group)
+        if not paths:
+            raise ValueError(f"{value} needs a provisioned classification section in the spec")
+        return rng.choice(paths["any" if mode == "any" else "leaf"])
+    raise ValueError(f"Unknown field value spec: {value}")
+
+def estimate_count(spec):
+    """Expected number of items a spec produces (mean of every count range)"""
+    def expected(nodes):
+        total = 0.0
+        for node in nodes:
+            count = node.get("count", 1)
+            mean = sum(count) / 2.0 if isinstance(count, (list, tuple)) else float(count)
+            total += mean * (1 + expected(node.get("children", [])))
+        return total
+    return int(expected(spec.get("items", [])))
+
+def generate_items(spec, context=None):
+    """Stream seed items from a spec, parents before children.
+
+    Yields dicts with key, type, title, description, fields and links, the
+    shape the seeders in create_demo_project.py consume. The same spec and
+    seed always yield the same items.
+    """
+    rng = random.Random(spec.get("seed", 0))
+    base_context = dict(context or {})
+    default_fields = spec.get("defaults", {}).get("fields", {})
+    numbers = {}
+
+    def expand(node, parent):
+        previous = None
+        for index in range(1, draw_count(node.get("count", 1), rng) + 1):
+            wi_type = node["type"]
+            numbers[wi_type] = numbers.get(wi_type, 0) + 1
+            item_context = dict(
+                base_context,
+                n=numbers[wi_type],
+                i=index,
+                type=wi_type,
+                parent_title=parent["title"] if parent else "",
+                parent_fields=parent["fields"] if parent else {},
+            )
+            slug = wi_type.lower().replace(" ", "-")
+            item = {
+                "key": f"{slug}-{numbers[wi_type]}",
+                "type": wi_type,
+                "title": node.get("title", "{type} {n}").format_map(item_context),
+                "description": node["description"].format_map(item_context) if node.get("description") else None,
+                "fields": {
+                    name: draw_value(value, rng, item_context)
+                    for name, value in {**default_fields, **node.get("fields", {})}.items()
+                },
+                "links": [],
+            }
+            if node.get("payload"):
+                item["payload"] = dict(node["payload"], seed=rng.getrandbits(32))
+            if parent:
+                item["links"].append((parent["key"], node.get("link", PARENT_LINK)))
+            for rule in node.get("relations", []):
+                target = parent if rule.get("to", "parent") == "parent" else previous
+                if target and rng.random() < rule.get("probability", 1.0):
+                    item["links"].append((target["key"], rule["rel"]))
+
+            yield item
+            for child in node.get("children", []):
+                yield from expand(child, item)
+            previous = item
+
+    for node in spec.get("items", []):
+        yield from expand(node, None)
@@ -6,18 +6,39 @@ Gereksinimler:
 - Google Cloud Console'da service account oluşturulmalı
 - Service account key JSON dosyası olmalı
 - Google Play Console'da service account'a erişim verilmeli
+
+Yükleme parça parça (chunked) yapılır; ilerleme, hız ve tahmini kalan süre
+yazdırılır. Bağlantı koparsa yükleme oturumu AAB'nin yanındaki
+*.upload-state.json dosyasında saklanır ve script tekrar çalıştırıldığında
+sunucunun kabul ettiği son offset'ten devam eder.
+
+Discovery dokümanı ve OAuth access token'ı ~/.cache/play-upload altında
+(PLAY_API_CACHE_DIR) saklanır; sonraki çalıştırmalar servisi önbellekteki
+dokümandan kurar ve token süresi dolana kadar yeniden token almaz. Google
+istemci modülleri ilk ihtiyaç anında yüklenir. GOOGLE_PLAY_DISCOVERY_URL
+lokal test sunucusunu (play_stub_server.py) gösterirse ve key dosyası
+yoksa kimlik doğrulaması yapılmaz.
+
+Kullanım:
+    python3 scripts/upload_to_play_store.py [--chunk-size-mb 8] [--restart] [--force-upload]
 """
 
+import argparse
+import hashlib
 import os
 import sys
 import json
+import random
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import bundle_preflight
+
 try:
-    from google.oauth2 import service_account
-    from googleapiclient.discovery import build
+    # Yalnızca hata sınıfı baştan yüklenir; discovery/http/auth modülleri gerektiğinde yüklenir
     from googleapiclient.errors import HttpError
-    from googleapiclient.http import MediaFileUpload
 except ImportError:
     print("❌ Google API kütüphaneleri yüklü değil!")
     print("Yüklemek için: pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
@@ -28,93 +49,358 @@ PACKAGE_NAME = "com.higgscloud.azuredevops"
 SERVICE_ACCOUNT_FILE = os.environ.get("GOOGLE_PLAY_SERVICE_ACCOUNT_JSON", "service-account-key.json")
 AAB_FILE = "build/app/outputs/bundle/release/app-release.aab"
 TRACKS = ["alpha", "closed"]  # Alpha ve Closed Testing track'leri
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 256 KB'ın katı olmalı
+CHUNK_RETRIES = 5  # Parça başına tekrar deneme (5xx/429/bağlantı hataları)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+API_NAME, API_VERSION = "androidpublisher", "v3"
+API_SCOPE = "https://www.googleapis.com/auth/androidpublisher"
+# Lokal test sunucusu için (ör. http://127.0.0.1:8090/discovery); key dosyası yoksa kimlik doğrulamasız bağlanır
+DISCOVERY_URL = os.environ.get("GOOGLE_PLAY_DISCOVERY_URL")
+CACHE_DIR = os.environ.get("PLAY_API_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "play-upload"))
+DISCOVERY_CACHE_TTL = 7 * 24 * 3600  # saniye
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)  # süresi bu kadar kala token yenilenir
+
+def write_private(path, payload):
+    """JSON'u yalnızca kullanıcının okuyabileceği şekilde atomik olarak yazar"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as cache_file:
+        json.dump(payload, cache_file)
+    os.replace(temp_path, path)
+
+def discovery_cache_path(url):
+    """API adı/sürümü ve discovery URL'sine göre önbellek dosyası"""
+    key = hashlib.sha1(url.encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{API_NAME}-{API_VERSION}-{key}.json")
+
+def load_discovery_document():
+    """Discovery dokümanını disk önbelleğinden, yoksa ağdan (o da olmazsa paketle gelen kopyadan) okur"""
+    url = DISCOVERY_URL or f"https://{API_NAME}.googleapis.com/$discovery/rest?version={API_VERSION}"
+    cache_path = discovery_cache_path(url)
+    try:
+        with open(cache_path) as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        cached = None
+    if cached and time.time() - cached["fetched"] < DISCOVERY_CACHE_TTL:
+        return cached["document"]
+
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            document = response.read().decode("utf-8")
+        json.loads(document)
+    except (OSError, ValueError) as e:
+        if cached:
+            print(f"⚠️ Discovery dokümanı alınamadı ({e}), önbellekteki kopya kullanılıyor")
+            return cached["document"]
+        if DISCOVERY_URL:
+            raise
+        from googleapiclient.discovery_cache import get_static_doc
+        document = get_static_doc(API_NAME, API_VERSION)
+        if document is None:
+            raise
+        return document
+    write_private(cache_path, {"fetched": time.time(), "url": url, "document": document})
+    return document
+
+def load_credentials():
+    """Service account kimliği; geçerli access token önbellekteyse yeniden alınmaz"""
+    from google.oauth2 import service_account
+
+    credentials = service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=[API_SCOPE])
+    key = hashlib.sha1(f"{credentials.service_account_email} {API_SCOPE}".encode()).hexdigest()[:12]
+    token_path = os.path.join(CACHE_DIR, f"token-{key}.json")
+    try:
+        with open(token_path) as token_file:
+            cached = json.load(token_file)
+        expiry = datetime.fromisoformat(cached["expiry"])
+        # google-auth süreleri saat dilimsiz UTC olarak tutar
+        if expiry - TOKEN_EXPIRY_MARGIN > datetime.now(timezone.utc).replace(tzinfo=None):
+            # Süresi dolunca google-auth token'ı kendisi yeniler
+            credentials.token, credentials.expiry = cached["token"], expiry
+            return credentials
+    except (OSError, ValueError, KeyError):
+        pass
+
+    import google_auth_httplib2
+    import httplib2
+    credentials.refresh(google_auth_httplib2.Request(httplib2.Http()))
+    write_private(token_path, {"token": credentials.token, "expiry": credentials.expiry.isoformat()})
+    return credentials
 
 def get_service():
-    """Google Play Console API servisini oluşturur"""
+    """Google Play Console API servisini önbellekteki discovery dokümanı ve token ile oluşturur"""
+    from googleapiclient.discovery import build_from_document
+
+    if DISCOVERY_URL and not os.path.exists(SERVICE_ACCOUNT_FILE):
+        # Lokal test sunucusu: kimlik doğrulaması yok
+        from googleapiclient.http import build_http
+        return build_from_document(load_discovery_document(), http=build_http())
     if not os.path.exists(SERVICE_ACCOUNT_FILE):
         print(f"❌ Service account key dosyası bulunamadı: {SERVICE_ACCOUNT_FILE}")
         print("Lütfen Google Cloud Console'dan service account key JSON dosyasını indirin")
         sys.exit(1)
     
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE,
-        scopes=['https://www.googleapis.com/auth/androidpublisher']
+    return build_from_document(load_discovery_document(), credentials=load_credentials())
+
+def print_http_error(error, log=print):
+    """HttpError içeriğini okunabilir şekilde yazdırır"""
+    log(f"❌ HTTP Hata: {error.resp.status} - {error.content.decode()}")
+    try:
+        error_details = json.loads(error.content.decode())
+        if 'error' in error_details:
+            log(f"📋 Hata detayları: {error_details['error']}")
+    except:
+        pass
+
+def upload_state_path(aab_file):
+    """Yarım kalan yükleme durumunun saklandığı dosya"""
+    return f"{aab_file}.upload-state.json"
+
+def load_upload_state(state_path, package_name, aab_file):
+    """Önceki yüklemenin durumunu okur; AAB değiştiyse boş durum döner"""
+    stat = os.stat(aab_file)
+    fingerprint = {"package": package_name, "size": stat.st_size, "mtime": int(stat.st_mtime)}
+    try:
+        with open(state_path) as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        state = {}
+    if state.get("fingerprint") != fingerprint:
+        state = {"fingerprint": fingerprint}
+    return state
+
+def save_upload_state(state_path, state):
+    """Durumu atomik olarak yazar"""
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_path, state_path)
+
+def format_progress(sent, total, rate, elapsed):
+    """İlerleme satırı: yüzde, MB, MB/s ve tahmini kalan süre"""
+    eta = (total - sent) / rate if rate else 0
+    return (f"⬆️  %{sent * 100.0 / total:5.1f}  {sent / 1e6:8.1f}/{total / 1e6:.1f} MB"
+            f"  {rate / 1e6:6.2f} MB/s  ETA {eta:5.0f}s  ({elapsed:.0f}s)")
+
+def upload_bundle(service, package_name, edit_id, aab_file, state, state_path, chunk_size=UPLOAD_CHUNK_SIZE,
+                  bandwidth=None, log=print):
+    """AAB'yi parça parça yükler ve versionCode döner.
+
+    Yükleme oturumu (resumable URI) state dosyasına yazılır; sonraki çalıştırma
+    sunucunun kabul ettiği offset'i sorgulayıp oradan devam eder. Yükleme daha
+    önce tamamlandıysa tekrar yüklenmez. bandwidth (byte bazında rate_limit.TokenBucket)
+    verilirse her parça gönderilmeden önce parça boyutu kadar bütçe alınır.
+    """
+    if state.get("version_code"):
+        log(f"⏭️  AAB bu edit'e zaten yüklenmiş. Version Code: {state['version_code']}")
+        return state["version_code"]
+
+    from googleapiclient.http import MediaFileUpload
+
+    total = os.path.getsize(aab_file)
+    media = MediaFileUpload(aab_file, mimetype='application/octet-stream', chunksize=chunk_size, resumable=True)
+    request = service.edits().bundles().upload(
+        editId=edit_id,
+        packageName=package_name,
+        media_body=media
     )
-    
-    service = build('androidpublisher', 'v3', credentials=credentials)
-    return service
+    resumed = bool(state.get("upload_uri"))
+    if resumed:
+        request.resumable_uri = state["upload_uri"]
+        # Hata durumundaki istek önce sunucudan kabul edilen son offset'i sorgular
+        request._in_error_state = True
+        log("🔁 Yarım kalan yükleme sürdürülüyor...")
 
-def upload_aab(service, package_name, aab_file, track='alpha'):
-    """AAB dosyasını belirtilen track'e yükler"""
+    started = time.monotonic()
+    base_offset = None
+    response = None
+    failures = 0
+    while response is None:
+        if bandwidth:
+            bandwidth.acquire(min(chunk_size, total - request.resumable_progress))
+        try:
+            status, response = request.next_chunk()
+        except (HttpError, OSError) as error:
+            # Başarısız parça tekrar gönderilmeden önce sunucunun kabul ettiği offset sorgulanır
+            # (googleapiclient'in kendi tekrar denemesi okunmuş dosya dilimini boş gönderir)
+            if isinstance(error, HttpError) and error.resp.status not in RETRY_STATUSES or failures >= CHUNK_RETRIES:
+                raise
+            failures += 1
+            reason = f"HTTP {error.resp.status}" if isinstance(error, HttpError) else error
+            log(f"⚠️ Parça gönderilemedi ({reason}), tekrar deneniyor ({failures}/{CHUNK_RETRIES})")
+            time.sleep(min(60, 2 ** failures) * random.uniform(0.5, 1.0))
+            continue
+        failures = 0
+        if request.resumable_uri and request.resumable_uri != state.get("upload_uri"):
+            state["upload_uri"] = request.resumable_uri
+            save_upload_state(state_path, state)
+        if status is None:
+            continue
+        offset = status.resumable_progress
+        if base_offset is None:
+            # Devam eden yüklemede ilk parçadan önceki baytlar önceki çalıştırmaya aittir
+            base_offset = max(0, offset - chunk_size) if resumed else 0
+        elapsed = time.monotonic() - started
+        rate = (offset - base_offset) / max(elapsed, 1e-6)
+        log(format_progress(offset, total, rate, elapsed))
+
+    elapsed = time.monotonic() - started
+    sent = total - (base_offset or 0)
+    log(f"📊 {sent / 1e6:.1f} MB {elapsed:.1f}s içinde gönderildi ({sent / 1e6 / max(elapsed, 1e-6):.2f} MB/s)")
+
+    state["version_code"] = response['versionCode']
+    state.pop("upload_uri", None)
+    save_upload_state(state_path, state)
+    return state["version_code"]
+
+def start_or_resume_edit(service, package_name, state, state_path, log=print):
+    """Kayıtlı edit hâlâ geçerliyse onu, değilse yeni bir edit döner"""
+    if state.get("edit_id"):
+        try:
+            service.edits().get(editId=state["edit_id"], packageName=package_name).execute()
+            log(f"🔁 Önceki edit sürdürülüyor: {state['edit_id']}")
+            return state["edit_id"]
+        except HttpError:
+            log("⚠️ Önceki edit artık geçerli değil, yeniden başlanıyor")
+            for key in ("edit_id", "upload_uri", "version_code"):
+                state.pop(key, None)
+
+    edit_response = service.edits().insert(body={}, packageName=package_name).execute()
+    state["edit_id"] = edit_response['id']
+    save_upload_state(state_path, state)
+    log(f"✅ Edit oluşturuldu: {state['edit_id']}")
+    return state["edit_id"]
+
+def release_notes_body(release_notes):
+    """{dil: metin} sözlüğünü API'nin releaseNotes listesine çevirir"""
+    return [{"language": language, "text": text} for language, text in (release_notes or {}).items()]
+
+def publish_to_tracks(service, package_name, aab_file, tracks, chunk_size=UPLOAD_CHUNK_SIZE, restart=False,
+                      release_notes=None, bandwidth=None, details=None, preflight=True, release_fields=None,
+                      log=print):
+    """AAB dosyasını tek bir edit içinde bir kez yükler ve tüm track'lere atar.
+
+    Her track aynı versionCode'u (ve varsa {dil: metin} release notlarını)
+    alır ve edit tek seferde commit edilir. Yarım kalan bir yükleme varsa
+    (restart=False) kaldığı yerden devam eder. preflight açıksa aynı bundle
+    veya versionCode sunucuda varsa yükleme atlanır (bkz. bundle_preflight.py).
+    release_fields release gövdesini değiştirir (ör. {'status': 'inProgress',
+    'userFraction': 0.01}); verilmezse release 'draft' olarak oluşturulur.
+    details sözlüğü verilirse versionCode içine yazılır. Çıktı satırları log
+    ile yazdırılır (paralel yayında iş başına ayrı bir fonksiyon verilir).
+    Track bazında sonuç döner: {track: hata mesajı veya None}
+    """
+    errors = {}
     if not os.path.exists(aab_file):
-        print(f"❌ AAB dosyası bulunamadı: {aab_file}")
-        return False
+        log(f"❌ AAB dosyası bulunamadı: {aab_file}")
+        return {track: "AAB dosyası bulunamadı" for track in tracks}
     
     try:
-        print(f"📦 AAB dosyası yükleniyor: {aab_file}")
-        print(f"📱 Package: {package_name}")
-        print(f"🎯 Track: {track}")
+        log(f"📦 AAB dosyası yükleniyor: {aab_file}")
+        log(f"📱 Package: {package_name}")
+        log(f"🎯 Track'ler: {', '.join(tracks)}")
         
-        # Edit oluştur
-        edit_request = service.edits().insert(body={}, packageName=package_name)
-        edit_response = edit_request.execute()
-        edit_id = edit_response['id']
+        state_path = upload_state_path(aab_file)
+        state = load_upload_state(state_path, package_name, aab_file)
+        if restart:
+            state = {"fingerprint": state["fingerprint"]}
         
-        print(f"✅ Edit oluşturuldu: {edit_id}")
+        # Edit oluştur (veya yarım kalanı sürdür)
+        edit_id = start_or_resume_edit(service, package_name, state, state_path, log)
         
-        # AAB yükle
-        media = MediaFileUpload(aab_file, mimetype='application/octet-stream', resumable=True)
-        bundle_response = service.edits().bundles().upload(
-            editId=edit_id,
-            packageName=package_name,
-            media_body=media
-        ).execute()
+        # Sunucuda zaten varsa yükleme atlanır
+        version_code = None
+        if preflight and not state.get("version_code"):
+            try:
+                version_code = bundle_preflight.find_uploaded_bundle(
+                    service, package_name, edit_id, aab_file, bundle_preflight.get_cache(), log
+                )
+            except HttpError as error:
+                log(f"⚠️ Ön kontrol yapılamadı (HTTP {error.resp.status}), AAB yüklenecek")
         
-        version_code = bundle_response['versionCode']
-        print(f"✅ AAB yüklendi. Version Code: {version_code}")
+        # AAB'yi bir kez, parça parça yükle
+        if version_code is None:
+            version_code = upload_bundle(service, package_name, edit_id, aab_file, state, state_path, chunk_size,
+                                         bandwidth, log)
+            if preflight:
+                cache = bundle_preflight.get_cache()
+                cache.remember(package_name, cache.sha256(aab_file), version_code)
+            log(f"✅ AAB yüklendi. Version Code: {version_code}")
+        if details is not None:
+            details["version_code"] = version_code
         
-        # Track'e assign et
-        track_response = service.edits().tracks().update(
-            editId=edit_id,
-            track=track,
-            packageName=package_name,
-            body={
-                'releases': [{
-                    'versionCodes': [str(version_code)],
-                    'status': 'draft',
-                }]
-            }
-        ).execute()
+        release = {'versionCodes': [str(version_code)], 'status': 'draft'}
+        if release_notes:
+            release['releaseNotes'] = release_notes_body(release_notes)
+        release.update(release_fields or {})
+        
+        # Aynı versionCode'u her track'e assign et
+        assigned = []
+        for track in tracks:
+            try:
+                service.edits().tracks().update(
+                    editId=edit_id,
+                    track=track,
+                    packageName=package_name,
+                    body={'releases': [release]}
+                ).execute()
+                assigned.append(track)
+                log(f"✅ Track'e assign edildi: {track}")
+            except HttpError as error:
+                log(f"❌ {track} track'ine assign edilemedi")
+                print_http_error(error, log)
+                errors[track] = f"track güncellenemedi (HTTP {error.resp.status})"
         
-        print(f"✅ Track'e assign edildi: {track}")
+        if not assigned:
+            return errors
         
-        # Edit'i commit et
+        # Edit'i tek seferde commit et
         commit_request = service.edits().commit(
             editId=edit_id,
             packageName=package_name
         )
         commit_response = commit_request.execute()
         
-        print(f"✅ Release commit edildi!")
-        print(f"📋 Release ID: {commit_response.get('id', 'N/A')}")
+        log(f"✅ Release commit edildi!")
+        log(f"📋 Release ID: {commit_response.get('id', 'N/A')}")
+        os.remove(state_path)
         
-        return True
+        return {track: errors.get(track) for track in tracks}
         
     except HttpError as error:
-        print(f"❌ HTTP Hata: {error.resp.status} - {error.content.decode()}")
-        try:
-            error_details = json.loads(error.content.decode())
-            if 'error' in error_details:
-                print(f"📋 Hata detayları: {error_details['error']}")
-        except:
-            pass
-        return False
+        print_http_error(error, log)
+        return {track: errors.get(track, f"HTTP {error.resp.status}") for track in tracks}
     except Exception as e:
-        print(f"❌ Hata: {str(e)}")
-        return False
+        log(f"❌ Hata: {str(e)}")
+        return {track: errors.get(track, str(e)) for track in tracks}
+
+def upload_aab(service, package_name, aab_file, track='alpha'):
+    """AAB dosyasını belirtilen track'e yükler"""
+    return publish_to_tracks(service, package_name, aab_file, [track])[track] is None
+
+def parse_args(argv=None):
+    """Komut satırı seçenekleri"""
+    parser = argparse.ArgumentParser(description="AAB dosyasını Google Play track'lerine yükler")
+    parser.add_argument(
+        "--chunk-size-mb", type=float, default=UPLOAD_CHUNK_SIZE / (1024 * 1024),
+        help="yükleme parça boyutu (MB, 256 KB'ın katına yuvarlanır)"
+    )
+    parser.add_argument(
+        "--restart", action="store_true",
+        help="yarım kalan yüklemeyi yok sayıp baştan başla"
+    )
+    parser.add_argument(
+        "--force-upload", action="store_true",
+        help="ön kontrolü atla; AAB sunucuda olsa bile yükle"
+    )
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     """Ana fonksiyon"""
+    args = parse_args(argv)
+    chunk_size = max(1, round(args.chunk_size_mb * 4)) * 256 * 1024
+    
     print("🚀 Google Play Console API ile AAB yükleme başlıyor...")
     print("=" * 60)
     
@@ -125,19 +411,21 @@ def main():
         print(f"❌ Service oluşturulamadı: {str(e)}")
         sys.exit(1)
     
-    # Her track için yükle
+    # Tek yükleme, tüm track'ler
+    print(f"\n📤 {', '.join(track.upper() for track in TRACKS)} track'lerine yükleniyor...")
+    print("-" * 60)
+    results = publish_to_tracks(
+        service, PACKAGE_NAME, AAB_FILE, TRACKS, chunk_size, args.restart, preflight=not args.force_upload
+    )
+    print()
+    
     success_count = 0
     for track in TRACKS:
-        print(f"\n📤 {track.upper()} track'ine yükleniyor...")
-        print("-" * 60)
-        
-        if upload_aab(service, PACKAGE_NAME, AAB_FILE, track):
+        if results[track] is None:
             success_count += 1
             print(f"✅ {track} track'i başarılı!")
         else:
-            print(f"❌ {track} track'i başarısız!")
-        
-        print()
+            print(f"❌ {track} track'i başarısız: {results[track]}")
     
     print("=" * 60)
     print(f"📊 Sonuç: {success_count}/{len(TRACKS)} track başarılı")
@@ -151,4 +439,3 @@ def main():
 
 if __name__ == "__main__":
     sys.exit(main())
-
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Work item hierarchy validator
+Loads a project's work items and parent/child links into a compact index
+and reports orphans, multi-parent items, hierarchy cycles and type-rule
+violations (e.g. a Task parented to an Epic), so large seeded tenants can
+be checked before they are used for benchmarks.
+
+Items stream in from the live project (WIQL IDs + workitemsbatch with
+relations, --workers chunks in parallel) or from a project_snapshot.py
+file; only the type and parent of each item are kept. Nodes are __slots__
+objects indexed by ID, children are stored as array-backed CSR adjacency
+and every check is a linear pass, so a 500k item project fits in a few
+hundred MB at most.
+
+Both hierarchy conventions are understood: the seeders' own
+System.Links.Hierarchy-Forward on the child (see create_parent_relation)
+and Azure DevOps' System.LinkTypes.Hierarchy-Reverse on the child /
+-Forward on the parent.
+
+Usage:
+    python3 scripts/work_item_graph.py --workers 16
+    python3 scripts/work_item_graph.py --snapshot snapshot.jsonl.gz --rules rules.yaml --report violations.jsonl
+
+Rules (YAML/JSON), work item type -> allowed parent types and whether a
+parent is required; types without a rule are not checked:
+    Task: {parents: [Product Backlog Item, Bug], required: true}
+    Bug: {parents: [Feature, Product Backlog Item], required: false}
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from array import array
+
+import create_demo_project
+from azure_devops_client import DEFAULT_POOL_SIZE
+from project_snapshot import WORK_ITEM_LINK, read_snapshot
+from seed_spec import load_spec
+
+DEFAULT_WORKERS = 8
+DEFAULT_SHOW = 10  # examples printed per violation kind
+PROGRESS_EVERY = 100000  # items between progress lines
+
+# Relation on an item pointing at its parent / at one of its children
+PARENT_RELS = {"System.Links.Hierarchy-Forward", "System.LinkTypes.Hierarchy-Reverse"}
+CHILD_RELS = {"System.Links.Hierarchy-Reverse", "System.LinkTypes.Hierarchy-Forward"}
+
+REQUIREMENT_TYPES = ["Product Backlog Item", "User Story", "Requirement"]
+TYPE_RULES = {
+    "Epic": {"parents": [], "required": False},
+    "Feature": {"parents": ["Epic"], "required": True},
+    **{name: {"parents": ["Feature", "Epic"], "required": True} for name in REQUIREMENT_TYPES},
+    "Bug": {"parents": ["Feature", "Epic"] + REQUIREMENT_TYPES, "required": False},
+    "Task": {"parents": REQUIREMENT_TYPES + ["Bug"], "required": True},
+    "Test Case": {"parents": REQUIREMENT_TYPES + ["Bug"], "required": False},
+}
+
+NO_PARENT = -1
+MISSING_PARENT = -2  # parent ID not among the loaded items
+
+class Node:
+    """One work item: ID, type code and parent ID (0 = none)"""
+
+    __slots__ = ("id", "type", "parent")
+
+    def __init__(self, item_id, type_code, parent=0):
+        self.id = item_id
+        self.type = type_code
+        self.parent = parent
+
+class WorkItemGraph:
+    """Compact work item hierarchy: nodes by ID plus array-backed parent and child adjacency"""
+
+    def __init__(self):
+        self.nodes = []           # position -> Node
+        self.index = {}           # work item ID -> position
+        self.types = []           # type code -> name
+        self.type_codes = {}
+        self.extra_parents = {}   # child ID -> {parent IDs beyond the first}
+        self.pending = []         # (child ID, parent ID) seen before the child was loaded
+        self.parent_pos = None    # array: position -> parent position / NO_PARENT / MISSING_PARENT
+        self.child_offsets = None
+        self.children = None
+
+    def type_code(self, name):
+        code = self.type_codes.get(name)
+        if code is None:
+            code = self.type_codes[name] = len(self.types)
+            self.types.append(name)
+        return code
+
+    def set_parent(self, node, parent_id):
+        if not node.parent:
+            node.parent = parent_id
+        elif node.parent != parent_id:
+            self.extra_parents.setdefault(node.id, set()).add(parent_id)
+
+    def add(self, item_id, type_name, links=()):
+        """Add one work item with its (target ID, relation) links"""
+        node = Node(item_id, self.type_code(type_name or ""))
+        self.index[item_id] = len(self.nodes)
+        self.nodes.append(node)
+        for target, rel in links:
+            if rel in PARENT_RELS:
+                self.set_parent(node, target)
+            elif rel in CHILD_RELS:
+                position = self.index.get(target)
+                if position is None:
+                    self.pending.append((target, item_id))
+                else:
+                    self.set_parent(self.nodes[position], item_id)
+
+    def finalize(self):
+        """Resolve parent IDs to positions and build the child adjacency (CSR)"""
+        for child_id, parent_id in self.pending:
+            position = self.index.get(child_id)
+            if position is not None:
+                self.set_parent(self.nodes[position], parent_id)
+        self.pending = []
+
+        count = len(self.nodes)
+        self.parent_pos = array("i", [NO_PARENT]) * count
+        offsets = array("i", [0]) * (count + 1)
+        for position, node in enumerate(self.nodes):
+            if node.parent:
+                parent = self.index.get(node.parent, MISSING_PARENT)
+                self.parent_pos[position] = parent
+                if parent >= 0:
+                    offsets[parent + 1] += 1
+        for position in range(count):
+            offsets[position + 1] += offsets[position]
+        children = array("i", [0]) * offsets[count]
+        fill = array("i", offsets[:count])
+        for position in range(count):
+            parent = self.parent_pos[position]
+            if parent >= 0:
+                children[fill[parent]] = position
+                fill[parent] += 1
+        self.child_offsets, self.children = offsets, children
+
+    def child_positions(self, position):
+        return self.children[self.child_offsets[position]:self.child_offsets[position + 1]]
+
+    def descendants(self, position):
+        """Number of items below position (cycles are cut)"""
+        seen = {position}
+        stack = [position]
+        while stack:
+            for child in self.child_positions(stack.pop()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return len(seen) - 1
+
+    def find_cycles(self):
+        """Hierarchy cycles as lists of IDs (iterative three-colour DFS over parent edges)"""
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = bytearray(len(self.nodes))
+        cycles = []
+
+        def parents(position):
+            node = self.nodes[position]
+            targets = [self.parent_pos[position]] + [self.index.get(parent, MISSING_PARENT)
+                                                     for parent in self.extra_parents.get(node.id, ())]
+            return [target for target in targets if target >= 0]
+
+        for start in range(len(self.nodes)):
+            if color[start]:
+                continue
+            color[start] = GRAY
+            path = [start]
+            stack = [iter(parents(start))]
+            while stack:
+                target = next(stack[-1], None)
+                if target is None:
+                    color[path.pop()] = BLACK
+                    stack.pop()
+                elif color[target] == GRAY:
+                    cycle = path[path.index(target):]
+                    cycles.append([self.nodes[position].id for position in cycle])
+                elif color[target] == WHITE:
+                    color[target] = GRAY
+                    path.append(target)
+                    stack.append(iter(parents(target)))
+        return cycles
+
+    def validate(self, rules=TYPE_RULES):
+        """Return {kind: [violation, ...]} for orphans, multi-parent items, cycles and type rules"""
+        violations = {"orphan": [], "multi_parent": [], "cycle": [], "type_rule": []}
+        rule_codes = {self.type_codes[name]: rule for name, rule in rules.items() if name in self.type_codes}
+        allowed = {code: {self.type_codes[name] for name in rule.get("parents", []) if name in self.type_codes}
+                   for code, rule in rule_codes.items()}
+
+        for position, node in enumerate(self.nodes):
+            parent = self.parent_pos[position]
+            rule = rule_codes.get(node.type)
+            type_name = self.types[node.type]
+            if parent == MISSING_PARENT:
+                violations["orphan"].append({
+                    "id": node.id, "type": type_name, "parent": node.parent,
+                    "reason": "parent not in project", "descendants": self.descendants(position),
+                })
+            elif parent == NO_PARENT and rule and rule.get("required"):
+                violations["orphan"].append({
+                    "id": node.id, "type": type_name, "reason": "no parent", "descendants": self.descendants(position),
+                })
+            elif parent >= 0 and rule is not None and self.nodes[parent].type not in allowed[node.type]:
+                violations["type_rule"].append({
+                    "id": node.id, "type": type_name, "parent": node.parent,
+                    "parent_type": self.types[self.nodes[parent].type],
+                })
+            if node.id in self.extra_parents:
+                violations["multi_parent"].append({
+                    "id": node.id, "type": type_name, "parents": [node.parent] + sorted(self.extra_parents[node.id]),
+                })
+        violations["cycle"] = [{"ids": cycle} for cycle in self.find_cycles()]
+        return violations
+
+def relation_links(work_item):
+    """(target ID, relation) pairs of a work item returned with $expand=relations"""
+    for relation in work_item.get("relations") or ():
+        match = WORK_ITEM_LINK.search(relation.get("url", ""))
+        if match:
+            yield int(match.group(1)), relation.get("rel", "")
+
+def load_project(graph, client, workers=DEFAULT_WORKERS):
+    """Stream the client's project into graph"""
+    ids = client.query_ids("[System.TeamProject] = @project")
+    for count, work_item in enumerate(client.get_work_items(ids, expand="relations", workers=workers), 1):
+        graph.add(work_item["id"], work_item.get("fields", {}).get("System.WorkItemType"), relation_links(work_item))
+        if count % PROGRESS_EVERY == 0:
+            print(f"   {count} work items loaded")
+
+def load_snapshot(graph, path):
+    """Stream a project_snapshot.py file into graph; returns its header"""
+    header, records = read_snapshot(path)
+    for count, record in enumerate(records, 1):
+        graph.add(record["id"], record.get("type"), record.get("links", ()))
+        if count % PROGRESS_EVERY == 0:
+            print(f"   {count} work items loaded")
+    return header
+
+def describe(kind, violation):
+    if kind == "orphan":
+        below = f", {violation['descendants']} items below" if violation["descendants"] else ""
+        parent = f" {violation['parent']}" if "parent" in violation else ""
+        return f"{violation['type']} {violation['id']}: {violation['reason']}{parent}{below}"
+    if kind == "multi_parent":
+        return f"{violation['type']} {violation['id']}: parents {', '.join(map(str, violation['parents']))}"
+    if kind == "cycle":
+        return " -> ".join(map(str, violation["ids"] + violation["ids"][:1]))
+    return f"{violation['type']} {violation['id']} under {violation['parent_type']} {violation['parent']}"
+
+def print_summary(graph, violations, show=DEFAULT_SHOW):
+    labels = {"orphan": "Orphans", "multi_parent": "Multi-parent items", "cycle": "Hierarchy cycles",
+              "type_rule": "Type-rule violations"}
+    print(f"📊 {len(graph.nodes)} work items, {sum(1 for node in graph.nodes if node.parent)} with a parent, "
+          f"{len(graph.types)} types")
+    for kind, label in labels.items():
+        found = violations[kind]
+        print(f"   {'❌' if found else '✅'} {label}: {len(found)}")
+        for violation in found[:show]:
+            print(f"      {describe(kind, violation)}")
+        if len(found) > show:
+            print(f"      ... and {len(found) - show} more")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a project's work item hierarchy")
+    parser.add_argument("--org-url", default=create_demo_project.ORG_URL, help="organization URL")
+    parser.add_argument("--project", default=create_demo_project.PROJECT)
+    parser.add_argument("--token", default=os.environ.get("AZURE_DEVOPS_PAT"),
+                        help="personal access token (default: $AZURE_DEVOPS_PAT or the seeding script's token)")
+    parser.add_argument("--snapshot", help="validate a project_snapshot.py file instead of the live project")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent workitemsbatch requests")
+    parser.add_argument("--rules", help="YAML/JSON type rules replacing the built-in ones")
+    parser.add_argument("--report", help="write every violation to this JSON-lines file")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW, help="examples printed per violation kind")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        rules = load_spec(args.rules) if args.rules else TYPE_RULES
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ Cannot read rules: {e}")
+        return 1
+    graph = WorkItemGraph()
+    started = time.monotonic()
+    if args.snapshot:
+        print(f"🔎 Loading {args.snapshot}...")
+        load_snapshot(graph, args.snapshot)
+    else:
+        client = create_demo_project.configure_client(
+            max(DEFAULT_POOL_SIZE, args.workers),
+            org_url=args.org_url, project=args.project, token=args.token
+        )
+        print(f"🔎 Loading {args.project}...")
+        load_project(graph, client, args.workers)
+    loaded = time.monotonic()
+    graph.finalize()
+    violations = graph.validate(rules)
+    elapsed = time.monotonic() - loaded
+
+    print_summary(graph, violations, args.show)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"   Loaded in {loaded - started:.1f}s, validated in {elapsed:.1f}s, peak RSS {peak_mb:.0f} MB")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            for kind, found in violations.items():
+                for violation in found:
+                    report.write(json.dumps(dict(violation, kind=kind)) + "\n")
+    return 1 if any(violations.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from devops_stub_server import start_server  # noqa: E402
+
+PROJECT = "Demo"
+
+def stats(server):
+    """The stand-in's /_stub/stats counters"""
+    return requests.get(server.org_url.rsplit("/", 1)[0] + "/_stub/stats", timeout=5).json()
+
+def title_patch(title):
+    return [{"op": "add", "path": "/fields/System.Title", "value": title}]
+
+@pytest.fixture
+def stub():
+    """Start the Azure DevOps stand-in on an ephemeral port; call with start_server() options"""
+    servers = []
+
+    def start(**options):
+        server = start_server(port=0, **options)
+        server.org_url = "http://%s:%d/org" % server.server_address
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
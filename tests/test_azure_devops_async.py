@@ -0,0 +1,74 @@
+"""AsyncAzureDevOpsClient retries and rate limiting against the stand-in"""
+
+import asyncio
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from azure_devops_async import AsyncAzureDevOpsClient, TokenBucket  # noqa: E402
+from conftest import PROJECT, stats, title_patch  # noqa: E402
+
+def run(server, work, **options):
+    """Run work(client) with an async client for server and return its result"""
+    options.setdefault("backoff", 0.01)
+
+    async def main():
+        async with AsyncAzureDevOpsClient(server.org_url, PROJECT, "token", **options) as client:
+            return await work(client)
+    return asyncio.run(main())
+
+def test_read_retried_on_503(stub):
+    server = stub(error_rate=1.0)
+    url = f"{server.org_url}/{PROJECT}/_apis/wit/classificationnodes/areas?api-version=7.0"
+
+    with pytest.raises(aiohttp.ClientResponseError) as raised:
+        run(server, lambda client: client.request("GET", url), max_retries=2)
+
+    assert raised.value.status == 503
+    assert stats(server)["requests"] == 3
+
+def test_create_not_retried_on_503(stub):
+    server = stub(error_rate=1.0)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        run(server, lambda client: client.create_work_item("Task", title_patch("once")), max_retries=3)
+
+    assert stats(server)["requests"] == 1
+
+def test_throttled_create_waits_for_retry_after(stub):
+    server = stub(throttle_rps=1, burst=1, retry_after=1)
+
+    async def create_two(client):
+        return [await client.create_work_item("Task", title_patch(title)) for title in ("first", "second")]
+
+    started = time.monotonic()
+    created = run(server, create_two)
+
+    assert time.monotonic() - started >= 0.9
+    assert len({item["id"] for item in created}) == 2
+    counters = stats(server)
+    assert counters["throttled"] >= 1
+    assert counters["work_items"] == 2
+
+def test_retry_after_pauses_the_bucket(stub):
+    server = stub(throttle_rps=1, burst=1, retry_after=1)
+
+    async def create_three(client):
+        started = time.monotonic()
+        await asyncio.gather(*(client.create_work_item("Task", title_patch(f"item {n}")) for n in range(3)))
+        return client.bucket.paused_until - started
+
+    assert run(server, create_three, rate=100) >= 0.9
+    assert stats(server)["work_items"] == 3
+
+def test_token_bucket_pause():
+    async def acquire_paused():
+        bucket = TokenBucket(1000)
+        bucket.pause(0.2)
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(acquire_paused()) >= 0.19
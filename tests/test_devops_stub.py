@@ -0,0 +1,85 @@
+"""Seeding and retry behavior against the Azure DevOps stand-in"""
+
+import time
+
+import pytest
+import requests
+
+import create_demo_project
+from azure_devops_client import AzureDevOpsClient
+from conftest import PROJECT, stats, title_patch
+
+PARENT = "System.Links.Hierarchy-Forward"
+
+def make_client(server, **options):
+    options.setdefault("backoff", 0.01)
+    return AzureDevOpsClient(server.org_url, PROJECT, "token", **options)
+
+@pytest.fixture
+def seeding_client(stub):
+    """Point create_demo_project's shared client at a fresh stand-in"""
+    server = stub()
+    create_demo_project.configure_client(org_url=server.org_url, project=PROJECT, token="token")
+    yield server
+    create_demo_project.get_client().close()
+    create_demo_project._client = None
+
+def test_seed_batched_resolves_temp_id_links(seeding_client):
+    items = [{"key": "epic", "type": "Epic", "title": "Epic"}]
+    items += [{"key": f"feature-{n}", "type": "Feature", "title": f"Feature {n}", "links": [("epic", PARENT)]}
+              for n in range(3)]
+    items += [{"key": f"story-{n}", "type": "Product Backlog Item", "title": f"Story {n}",
+               "links": [(f"feature-{n % 3}", PARENT)]} for n in range(6)]
+
+    created = create_demo_project.seed_batched(items, batch_size=4)
+
+    assert sorted(created) == sorted(item["key"] for item in items)
+    client = create_demo_project.get_client()
+    work_items = {item["id"]: item for item in client.get_work_items(list(created.values()), expand="relations")}
+    for item in items:
+        relations = work_items[created[item["key"]]].get("relations") or []
+        targets = [relation["url"].rsplit("/", 1)[1] for relation in relations if relation["rel"] == PARENT]
+        assert targets == [str(created[target]) for target, _ in item.get("links", ())]
+
+def test_stats_after_seed_run(seeding_client):
+    items = [{"key": f"task-{n}", "type": "Task", "title": f"Task {n}"} for n in range(25)]
+
+    create_demo_project.seed_batched(items, batch_size=10)
+
+    counters = stats(seeding_client)
+    assert counters["work_items"] == 25
+    assert counters["requests"] == 3
+    assert counters["throttled"] == counters["errors"] == 0
+
+def test_throttled_create_waits_for_retry_after(stub):
+    server = stub(throttle_rps=1, burst=1, retry_after=1)
+    client = make_client(server)
+
+    started = time.monotonic()
+    client.create_work_item("Task", title_patch("first"))
+    client.create_work_item("Task", title_patch("second"))
+    elapsed = time.monotonic() - started
+
+    counters = stats(server)
+    assert elapsed >= 0.9
+    assert counters["throttled"] >= 1
+    assert counters["work_items"] == 2
+
+def test_create_not_retried_on_503(stub):
+    server = stub(error_rate=1.0)
+    client = make_client(server, max_retries=3)
+
+    with pytest.raises(requests.HTTPError) as raised:
+        client.create_work_item("Task", title_patch("once"))
+
+    assert raised.value.response.status_code == 503
+    assert stats(server)["requests"] == 1
+
+def test_read_retried_on_503(stub):
+    server = stub(error_rate=1.0)
+    client = make_client(server, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_classification_tree("areas")
+
+    assert stats(server)["requests"] == 3